@@ -0,0 +1,161 @@
+"""Benchmarks of fetching issues and building reports.
+
+Every scenario runs in a fresh process, so peak RSS is measured per scenario.
+Results are appended to json lines file, one line per scenario and size:
+
+    python -m benchmarks.run --sizes='[100,1000]' --scenarios='["fetch","render"]'
+"""
+import json
+import math
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+from typing import List, Optional
+
+import fire
+
+from benchmarks.server import (FakeGitHubServer, LocalUrlsHelper, START_DATE,
+                               comment_payload, issue_payload)
+from monitor import Monitor
+from monitor.entities import RepoMeta
+from monitor.report import FullReport, RepoReport
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+SCENARIOS: List[str] = ["fetch", "properties", "render"]
+SIZES: List[int] = [100, 1000, 10000, 100000]
+ACCOUNT: str = "MockQiskit"
+REPO: str = "mock-qiskit-terra"
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of current process in megabytes."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes elsewhere
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def generate_repo(n_issues: int, n_comments: int) -> RepoMeta:
+    """Repository of issues generated as fake server serves them."""
+    # pylint: disable=protected-access
+    issues = [Monitor._parse_issue(issue_payload(number, n_comments),
+                                   [Monitor._parse_comment(comment_payload(number, index))
+                                    for index in range(n_comments)])
+              for number in range(n_issues, 0, -1)]
+    return RepoMeta(account=ACCOUNT, name=REPO, issues=issues)
+
+
+def _evaluate_properties(repo: RepoMeta, as_of: datetime):
+    """Evaluates all sections of repository report."""
+    report = RepoReport(repo, as_of=as_of)
+    for name in ["n_open_issues", "n_issues_by_members", "n_issues_by_users", "top_authors",
+                 "top_author_associations", "old_updated_issues",
+                 "issues_with_community_association", "days_since_last_comment_by_member",
+                 "open_issues_sorted_by_update_date"]:
+        getattr(report, name)
+
+
+def run_scenario(scenario: str, n_issues: int, options: dict) -> dict:
+    """Runs scenario in current process.
+
+    Args:
+        scenario: one of ``SCENARIOS``
+        n_issues: number of issues
+        options: ``n_comments``, ``per_page``, ``max_workers``, ``backoff_factor``
+            and ``url`` of fake server for fetch scenario
+
+    Returns:
+        wall time in seconds and peak RSS in megabytes
+    """
+    if scenario == "fetch":
+        monitor = Monitor(urls=LocalUrlsHelper(options["url"]),
+                          max_workers=options["max_workers"],
+                          backoff_factor=options["backoff_factor"])
+        start = time.perf_counter()
+        monitor.get_open_issues(ACCOUNT, REPO,
+                                max_pages=math.ceil(n_issues / options["per_page"]))
+        wall_time = time.perf_counter() - start
+    elif scenario in ["properties", "render"]:
+        repo = generate_repo(n_issues, options["n_comments"])
+        as_of = START_DATE.replace(year=START_DATE.year + 100)
+        start = time.perf_counter()
+        if scenario == "properties":
+            _evaluate_properties(repo, as_of)
+        else:
+            FullReport([repo], as_of=as_of).render_report()
+        wall_time = time.perf_counter() - start
+    else:
+        raise ValueError("Unknown scenario {}, available: {}".format(scenario, SCENARIOS))
+    return {"wall_time": wall_time, "peak_rss_mb": _peak_rss_mb()}
+
+
+# pylint: disable=too-many-arguments,too-many-locals
+def run_benchmarks(sizes: Optional[List[int]] = None,
+                   scenarios: Optional[List[str]] = None,
+                   n_comments: int = 3,
+                   per_page: int = 100,
+                   latency: float = 0.0,
+                   error_rate: float = 0.0,
+                   rate_limit: Optional[int] = None,
+                   max_workers: int = 8,
+                   backoff_factor: float = 0.1,
+                   results: str = "benchmarks/results.jsonl") -> List[dict]:
+    """Runs scenarios for every size and appends results to file.
+
+    Args:
+        sizes: numbers of issues, 100 to 100k by default
+        scenarios: scenarios to run, all by default
+        n_comments: number of comments of each issue
+        per_page: max page size of fake server
+        latency: seconds every response of fake server is delayed by
+        error_rate: share of fake server responses failing with server error
+        rate_limit: number of requests per second fake server allows
+        max_workers: number of concurrent requests of monitor
+        backoff_factor: base delay of monitor retries
+        results: path of json lines results file
+
+    Returns:
+        results of scenarios
+    """
+    sizes = sizes or SIZES
+    scenarios = scenarios or SCENARIOS
+    config = {"n_comments": n_comments, "per_page": per_page, "latency": latency,
+              "error_rate": error_rate, "rate_limit": rate_limit,
+              "max_workers": max_workers, "backoff_factor": backoff_factor}
+
+    rows = []
+    for scenario in scenarios:
+        for n_issues in sizes:
+            with FakeGitHubServer(n_issues=n_issues, n_comments=n_comments,
+                                  per_page=per_page, latency=latency,
+                                  error_rate=error_rate, rate_limit=rate_limit) as server, \
+                    ProcessPoolExecutor(max_workers=1,
+                                        mp_context=get_context("spawn")) as executor:
+                options = dict(config, url=server.url)
+                measurement = executor.submit(run_scenario, scenario, n_issues,
+                                              options).result()
+                row = {"date": datetime.now().isoformat(timespec="seconds"),
+                       "python": platform.python_version(),
+                       "scenario": scenario,
+                       "n_issues": n_issues,
+                       "n_requests": server.n_requests}
+                row.update(measurement)
+                row.update(config)
+            rows.append(row)
+            print("{scenario} {n_issues}: {wall_time:.3f}s, {n_requests} requests, "
+                  "{peak_rss_mb} MB".format(**row))
+            with open(results, "a", encoding="utf-8") as file:
+                file.write(json.dumps(row) + "\n")
+    return rows
+
+
+if __name__ == "__main__":
+    fire.Fire(run_benchmarks)
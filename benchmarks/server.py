@@ -0,0 +1,248 @@
+"""Local http server imitating GitHub issues and comments api."""
+import json
+import math
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional, Union
+from urllib.parse import parse_qs, urlparse
+
+from monitor.entities import GitHubAuthorAssociations
+from monitor.utils import GitHubUrlsHelper
+
+GITHUB_API_URL: str = "https://api.github.com"
+START_DATE: datetime = datetime(2018, 1, 1)
+
+
+class LocalUrlsHelper(GitHubUrlsHelper):
+    """GitHub api urls pointing to local server."""
+
+    def __init__(self, base_url: str):
+        """Local urls helper.
+
+        Args:
+            base_url: url of local server
+        """
+        self.base_url = base_url
+
+    def _local(self, url: str) -> str:
+        """Replaces GitHub api host with local server."""
+        return url.replace(GITHUB_API_URL, self.base_url, 1)
+
+    def get_comments_url(self, account: str, repo: str,
+                         number: Union[str, int]) -> str:
+        """Return url for comments for specified parameters."""
+        return self._local(super().get_comments_url(account, repo, number))
+
+    def get_issues_url(self, account: str, repo: str,
+                       page: Optional[Union[str, int]] = None) -> str:
+        """Returns url for issue based on specified parameters."""
+        return self._local(super().get_issues_url(account, repo, page))
+
+    def get_updated_issues_url(self, account: str, repo: str, since: str,
+                               page: Optional[Union[str, int]] = None) -> str:
+        """Returns url for issues in any state updated since specified ISO time."""
+        return self._local(super().get_updated_issues_url(account, repo, since, page))
+
+
+def _format_date(time_: datetime) -> str:
+    """Formats date as GitHub api does."""
+    return time_.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def issue_payload(number: int, n_comments: int) -> dict:
+    """Generated GitHub api payload of open issue."""
+    created_at = START_DATE + timedelta(hours=7 * number)
+    associations = GitHubAuthorAssociations.all()
+    issue = {"number": number,
+             "title": "Generated issue {}".format(number),
+             "state": "open",
+             "user": {"login": "user{}".format(number % 97), "type": "User"},
+             "assignee": {"login": "member{}".format(number % 5)} if number % 4 == 0 else None,
+             "labels": [{"name": "label {}".format(number % 7)}],
+             "author_association": associations[number % len(associations)],
+             "comments": n_comments,
+             "created_at": _format_date(created_at),
+             "updated_at": _format_date(created_at + timedelta(hours=number % 500))}
+    if number % 3 == 0:
+        issue["pull_request"] = {"url": "{}/pulls/{}".format(GITHUB_API_URL, number)}
+    return issue
+
+
+def comment_payload(number: int, index: int) -> dict:
+    """Generated GitHub api payload of comment of issue."""
+    created_at = START_DATE + timedelta(hours=7 * number + index + 1)
+    associations = GitHubAuthorAssociations.all()
+    return {"user": {"login": "user{}".format((number + index) % 97),
+                     "type": "Bot" if index % 10 == 9 else "User"},
+            "author_association": associations[(number + index) % len(associations)],
+            "created_at": _format_date(created_at),
+            "updated_at": _format_date(created_at)}
+
+
+class FakeGitHubServer:
+    """Threaded local server serving generated open issues and comments.
+
+    Issues and comments are generated from their numbers on every request,
+    so memory of server does not grow with number of issues. Pages have
+    ``Link`` headers as GitHub api does.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self,
+                 n_issues: int = 100,
+                 n_comments: int = 3,
+                 per_page: int = 100,
+                 latency: float = 0.0,
+                 error_rate: float = 0.0,
+                 rate_limit: Optional[int] = None,
+                 rate_limit_window: float = 1.0,
+                 seed: int = 42):
+        """Fake GitHub server.
+
+        Args:
+            n_issues: number of open issues
+            n_comments: number of comments of each issue
+            per_page: max page size, smaller ``per_page`` query parameter is respected
+            latency: seconds every response is delayed by
+            error_rate: share of requests answered with ``502 Bad Gateway``
+            rate_limit: number of requests allowed per window, answered with
+                ``429`` and ``Retry-After`` when exceeded, unlimited if not specified
+            rate_limit_window: rate limit window in seconds
+            seed: seed of errors
+        """
+        self.n_issues = n_issues
+        self.n_comments = n_comments
+        self.per_page = per_page
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.rate_limit_window = rate_limit_window
+        self.n_requests = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._window_start = time.time()
+        self._window_requests = 0
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """Base url of server."""
+        host, port = self._server.server_address[:2]
+        return "http://{}:{}".format(host, port)
+
+    def start(self) -> 'FakeGitHubServer':
+        """Starts serving in background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops server."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> 'FakeGitHubServer':
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def _issues_page(self, page: int, per_page: int) -> List[dict]:
+        """Page of issues, newest first."""
+        first = self.n_issues - (page - 1) * per_page
+        return [issue_payload(number, self.n_comments)
+                for number in range(first, max(0, first - per_page), -1)]
+
+    def _comments_page(self, number: int, page: int, per_page: int) -> List[dict]:
+        """Page of comments of issue, oldest first."""
+        first = (page - 1) * per_page
+        return [comment_payload(number, index)
+                for index in range(first, min(self.n_comments, first + per_page))]
+
+    def _throttle(self) -> Optional[int]:
+        """Counts request, returns seconds to retry after if rate limit is exceeded."""
+        with self._lock:
+            self.n_requests += 1
+            if self.rate_limit is None:
+                return None
+            now = time.time()
+            if now - self._window_start >= self.rate_limit_window:
+                self._window_start, self._window_requests = now, 0
+            self._window_requests += 1
+            if self._window_requests > self.rate_limit:
+                return max(1, math.ceil(self._window_start + self.rate_limit_window - now))
+            return None
+
+    def _fails(self) -> bool:
+        """Should request fail with server error?"""
+        with self._lock:
+            return self._random.random() < self.error_rate
+
+    def handle(self, path: str) -> tuple:
+        """Status, headers and body of response to request of path."""
+        retry_after = self._throttle()
+        if self.latency > 0:
+            time.sleep(self.latency)
+        if retry_after is not None:
+            return 429, {"Retry-After": str(retry_after),
+                         "X-RateLimit-Remaining": "0"}, {"message": "rate limited"}
+        if self._fails():
+            return 502, {}, {"message": "Server Error"}
+
+        parts = urlparse(path)
+        query = parse_qs(parts.query)
+        page = int(query.get("page", ["1"])[0])
+        per_page = min(self.per_page, int(query.get("per_page", [str(self.per_page)])[0]))
+        segments = parts.path.strip("/").split("/")
+        if len(segments) == 4 and segments[0] == "repos" and segments[3] == "issues":
+            n_items, items = self.n_issues, self._issues_page(page, per_page)
+        elif len(segments) == 6 and segments[0] == "repos" and segments[5] == "comments":
+            n_items = self.n_comments
+            items = self._comments_page(int(segments[4]), page, per_page)
+        else:
+            return 404, {}, {"message": "Not Found"}
+
+        headers = {}
+        last_page = max(1, math.ceil(n_items / per_page))
+        if last_page > 1:
+            page_url = "{}{}?per_page={}&page=".format(self.url, parts.path, per_page)
+            links = ['<{}{}>; rel="last"'.format(page_url, last_page)]
+            if page < last_page:
+                links.insert(0, '<{}{}>; rel="next"'.format(page_url, page + 1))
+            headers["Link"] = ", ".join(links)
+        return 200, headers, items
+
+    def _handler_class(self):
+        """Request handler class bound to server."""
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """Handles GET requests of monitor."""
+
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):  # pylint: disable=invalid-name
+                """Serves GET request."""
+                status, headers, payload = server.handle(self.path)
+                body = json.dumps(payload).encode("utf-8")
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json; charset=utf-8")
+                    self.send_header("Content-Length", str(len(body)))
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    # client timed out and closed connection before response
+                    self.close_connection = True
+
+            def log_message(self, *args):  # pylint: disable=arguments-differ
+                """Disables request logging."""
+
+        return Handler
@@ -1,5 +1,9 @@
+import logging
+
 import fire
 from monitor import Monitor
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO,
+                        format="%(asctime)s %(levelname)s %(name)s: %(message)s")
     fire.Fire(Monitor)
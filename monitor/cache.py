@@ -0,0 +1,131 @@
+"""On-disk http cache for conditional requests."""
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+class HttpCache:
+    """On-disk cache of GitHub api responses keyed by url.
+
+    Stores body of response together with ``ETag`` and ``Last-Modified``
+    values, so requests can be sent conditionally and body can be served
+    from disk on ``304 Not Modified`` response.
+    """
+
+    STORED_HEADERS: tuple = ("ETag", "Last-Modified", "Link")
+
+    def __init__(self, folder: str, max_size: int = 256 * 1024 * 1024):
+        """On-disk http cache.
+
+        Args:
+            folder: folder to store cached responses in
+            max_size: max size of cache in bytes, least recently used entries
+                are evicted when exceeded
+        """
+        self.folder = folder
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+        self._size = sum(os.path.getsize(path) for path in self._entries())
+
+    @property
+    def size(self) -> int:
+        """Size of cached entries in bytes."""
+        return self._size
+
+    def _entries(self):
+        """Paths of all cache entries."""
+        return [os.path.join(self.folder, name) for name in os.listdir(self.folder)
+                if name.endswith(".json")]
+
+    def _path(self, url: str) -> str:
+        """Path of cache entry for url."""
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.folder, "{}.json".format(key))
+
+    def _read(self, url: str) -> Optional[dict]:
+        """Reads cache entry for url."""
+        path = self._path(url)
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                entry = json.load(file)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get("url") == url else None
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Returns ``If-None-Match``/``If-Modified-Since`` headers for cached url."""
+        entry = self._read(url)
+        if entry is None:
+            return {}
+        headers = {}
+        if entry["headers"].get("ETag"):
+            headers["If-None-Match"] = entry["headers"]["ETag"]
+        if entry["headers"].get("Last-Modified"):
+            headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+        return headers
+
+    def cached_response(self, url: str,
+                        not_modified: requests.Response) -> Optional[requests.Response]:
+        """Builds response from cache for ``304 Not Modified`` response.
+
+        Args:
+            url: requested url
+            not_modified: 304 response, its headers override cached ones
+
+        Returns:
+            response with cached body or None if url is not cached anymore
+        """
+        entry = self._read(url)
+        if entry is None:
+            return None
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.encoding = "utf-8"
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.headers.update(not_modified.headers)
+        response._content = entry["body"].encode("utf-8")  # pylint: disable=protected-access
+        return response
+
+    def store(self, url: str, response: requests.Response):
+        """Stores response if it can be validated conditionally."""
+        headers = {name: response.headers[name] for name in self.STORED_HEADERS
+                   if name in response.headers}
+        if "ETag" not in headers and "Last-Modified" not in headers:
+            return
+
+        data = json.dumps({"url": url, "headers": headers, "body": response.text})
+        path = self._path(url)
+        with self._lock:
+            if os.path.exists(path):
+                self._size -= os.path.getsize(path)
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(data)
+            self._size += os.path.getsize(path)
+            if self._size > self.max_size:
+                self._evict()
+
+    def _evict(self):
+        """Removes least recently used entries until cache fits max size."""
+        for path in sorted(self._entries(), key=lambda path: os.stat(path).st_mtime_ns):
+            if self._size <= self.max_size:
+                break
+            self._size -= os.path.getsize(path)
+            os.remove(path)
+
+    def invalidate(self, url: Optional[str] = None):
+        """Removes cached url or whole cache if url is not specified."""
+        with self._lock:
+            paths = [self._path(url)] if url is not None else self._entries()
+            for path in paths:
+                if os.path.exists(path):
+                    self._size -= os.path.getsize(path)
+                    os.remove(path)
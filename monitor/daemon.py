@@ -0,0 +1,320 @@
+"""Long-running monitor keeping reports of repositories warm."""
+import json
+import logging
+import queue
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from monitor.entities import IssueMeta, RepoMeta
+from monitor.report import ENVIRONMENT, RepoReport
+from monitor.state import RepoState
+from monitor.webhooks import EVENTS, apply_event, event_repository, verify_signature
+
+logger = logging.getLogger(__name__)
+
+
+# pylint: disable=too-many-instance-attributes
+class MonitorDaemon:
+    """Keeps open issues of repositories in memory and serves their reports over http.
+
+    Each repository is refreshed on its own schedule by incremental sync,
+    which fetches only issues updated since previous refresh, and only
+    changed issues are replaced in kept repository and its indexes. Markdown and
+    json reports of repository are rendered once per refresh, so requests
+    are served from memory:
+
+    * ``/report.md``, ``/report.json`` - full report of all repositories
+    * ``/repos/<name>.md``, ``/repos/<name>.json`` - report of repository
+    * ``/health`` - times of last refresh of repositories
+
+    If webhook secret is specified, ``issues`` and ``issue_comment`` events
+    posted to ``/webhook`` are verified, queued and applied to state of
+    repository between refreshes, so scheduled refreshes only reconcile
+    state with missed events and can be rare.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, monitor: 'Monitor',
+                 repos_urls: List[str],
+                 interval: float = 900.0,
+                 intervals: Optional[Dict[str, float]] = None,
+                 host: str = "127.0.0.1",
+                 port: int = 8000,
+                 state_dir: Optional[str] = None,
+                 columnar: bool = False,
+                 secret: Optional[str] = None,
+                 clock: Callable[[], float] = time.time):
+        """Monitor daemon.
+
+        Args:
+            monitor: monitor fetching issues
+            repos_urls: urls of repositories
+            interval: seconds between refreshes of repository
+            intervals: seconds between refreshes per repository name,
+                overrides ``interval``
+            host: host to serve reports on
+            port: port to serve reports on, any free port if 0
+            state_dir: folder of stored states of incremental sync
+            columnar: compute reports on columnar issues tables, requires numpy
+            secret: secret of GitHub webhook, events are not accepted if not specified
+            clock: current unix time
+        """
+        self.monitor = monitor
+        self.repos_names: List[Tuple[str, str]] = [tuple(url.split("/")[-2:])
+                                                   for url in repos_urls]
+        self.interval = interval
+        self.intervals = intervals or {}
+        self.state_dir = state_dir
+        self.columnar = columnar
+        self.secret = secret
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._wake = threading.Event()
+        self._events: queue.Queue = queue.Queue()
+        self.states: Dict[str, RepoState] = {}
+        self._next_refresh: Dict[str, float] = {name: 0.0 for _, name in self.repos_names}
+        self.repos: Dict[str, RepoMeta] = {}
+        # issues of kept repositories by number, to remove them when they change
+        self._issues: Dict[str, Dict[str, IssueMeta]] = {}
+        self.refreshed_at: Dict[str, datetime] = {}
+        self._markdown: Dict[str, str] = {}
+        self._json: Dict[str, dict] = {}
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """Base url of report endpoint."""
+        host, port = self._server.server_address[:2]
+        return "http://{}:{}".format(host, port)
+
+    def _state(self, account: str, name: str) -> RepoState:
+        """State of repository kept in memory, loaded from state folder once."""
+        if name not in self.states:
+            self.states[name] = RepoState.load(account, name, self.state_dir)
+        return self.states[name]
+
+    def refresh(self, account: str, name: str):
+        """Syncs open issues of repository and renders its reports."""
+        state = self._state(account, name)
+        previous = dict(state.issues)
+        self.monitor.sync_state(account, name, folder=self.state_dir, state=state)
+        # merged issues replace entries of state, so changed ones are found by identity
+        self._update(account, name, {number for number in set(previous) | set(state.issues)
+                                     if previous.get(number) is not state.issues.get(number)})
+
+    def _update(self, account: str, name: str, numbers: Set[str]):
+        """Updates kept repository with changed issues of state and renders its reports.
+
+        Args:
+            account: GitHub account
+            name: name of repository
+            numbers: numbers of changed issues, all issues are added to new repository
+        """
+        state = self.states[name]
+        repo = self.repos.get(name)
+        if repo is None:
+            repo, numbers = RepoMeta(account=account, name=name, issues=[]), set(state.issues)
+        issues = self._issues.setdefault(name, {})
+        changed = self.monitor.parse_state(state, numbers)
+        with self._lock:
+            for number in numbers:
+                if number in issues:
+                    repo.remove_issue(issues.pop(number))
+            for issue in changed:
+                issues[str(issue.number)] = issue
+                repo.add_issue(issue)
+            self.repos[name] = repo
+        self._render(account, name, repo)
+
+    def _render(self, account: str, name: str, repo: RepoMeta):
+        """Renders reports of repository to serve."""
+        report = RepoReport(repo, as_of=datetime.now(), columnar=self.columnar,
+                            metrics=self.monitor.metrics)
+        markdown, data = report.render_report(), report.to_dict()
+        with self._lock:
+            self._markdown[name] = markdown
+            self._json[name] = data
+            self.refreshed_at[name] = datetime.now()
+        logger.info("Rendered %d open issues of %s/%s", len(repo.issues), account, name)
+
+    def refresh_due(self) -> List[str]:
+        """Refreshes repositories which refresh is due.
+
+        Failed refresh is logged and retried on next schedule,
+        previous reports of repository are served meanwhile.
+
+        Returns:
+            names of refreshed repositories
+        """
+        refreshed = []
+        for account, name in self.repos_names:
+            if self._next_refresh[name] > self._clock():
+                continue
+            try:
+                self.refresh(account, name)
+                refreshed.append(name)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Refresh of %s/%s failed", account, name)
+            self._next_refresh[name] = self._clock() + self.intervals.get(name, self.interval)
+        return refreshed
+
+    def receive(self, event: Optional[str], signature: Optional[str],
+                body: bytes) -> Tuple[int, dict]:
+        """Verifies and queues webhook delivery.
+
+        Args:
+            event: value of ``X-GitHub-Event`` header
+            signature: value of ``X-Hub-Signature-256`` header
+            body: body of delivery
+
+        Returns:
+            status and payload of response
+        """
+        if self.secret is None:
+            return 404, {"message": "Not Found"}
+        if not verify_signature(self.secret, body, signature):
+            return 401, {"message": "Invalid signature"}
+        if event not in EVENTS:
+            return 200, {"message": "Ignored"}
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return 400, {"message": "Invalid payload"}
+        self._events.put((event, payload))
+        self._wake.set()
+        return 202, {"message": "Accepted"}
+
+    def apply_events(self) -> List[str]:
+        """Applies queued webhook events and renders reports of changed repositories.
+
+        Returns:
+            names of changed repositories
+        """
+        accounts = {name: account for account, name in self.repos_names}
+        changed: Dict[str, Set[str]] = {}
+        while not self._events.empty():
+            event, payload = self._events.get()
+            repository = event_repository(payload)
+            if repository is None or accounts.get(repository[1]) != repository[0]:
+                continue
+            account, name = repository
+            if apply_event(self._state(account, name), event, payload):
+                changed.setdefault(name, set()).add(str(payload["issue"].get("number")))
+        for name, numbers in changed.items():
+            self.states[name].save(self.state_dir)
+            self._update(accounts[name], name, numbers)
+        return list(changed)
+
+    def seconds_to_next_refresh(self) -> float:
+        """Seconds till earliest scheduled refresh."""
+        return max(0.0, min(self._next_refresh.values()) - self._clock())
+
+    def full_report_markdown(self) -> str:
+        """Full report of refreshed repositories in order of urls."""
+        with self._lock:
+            repos = [(self.repos[name], [self._markdown[name]])
+                     for _, name in self.repos_names if name in self._markdown]
+        return ENVIRONMENT.get_template("full_report.md").render(
+            repos=repos, date=datetime.now().strftime("%m-%d-%Y"))
+
+    def full_report_dict(self) -> dict:
+        """Reports of refreshed repositories in order of urls."""
+        with self._lock:
+            return {"date": datetime.now().isoformat(timespec="seconds"),
+                    "repos": [self._json[name]
+                              for _, name in self.repos_names if name in self._json]}
+
+    def handle(self, path: str) -> Tuple[int, str, str]:
+        """Status, content type and body of response to request of path."""
+        path = path.split("?")[0].rstrip("/")
+        markdown, json_type = "text/markdown; charset=utf-8", "application/json; charset=utf-8"
+        if path == "/report.md":
+            return 200, markdown, self.full_report_markdown()
+        if path == "/report.json":
+            return 200, json_type, json.dumps(self.full_report_dict())
+        if path == "/health":
+            with self._lock:
+                refreshed_at = {name: time_.isoformat(timespec="seconds")
+                                for name, time_ in self.refreshed_at.items()}
+            return 200, json_type, json.dumps({"refreshed_at": refreshed_at})
+        if path.startswith("/repos/"):
+            name, _, extension = path[len("/repos/"):].rpartition(".")
+            with self._lock:
+                if extension == "md" and name in self._markdown:
+                    return 200, markdown, self._markdown[name]
+                if extension == "json" and name in self._json:
+                    return 200, json_type, json.dumps(self._json[name])
+        return 404, json_type, json.dumps({"message": "Not Found"})
+
+    def _handler_class(self):
+        """Request handler class bound to daemon."""
+        daemon = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """Handles GET requests of reports."""
+
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):  # pylint: disable=invalid-name
+                """Serves GET request."""
+                status, content_type, text = daemon.handle(self.path)
+                body = text.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):  # pylint: disable=invalid-name
+                """Receives webhook delivery."""
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                status, payload = (404, {"message": "Not Found"}) \
+                    if self.path.split("?")[0].rstrip("/") != "/webhook" \
+                    else daemon.receive(self.headers.get("X-GitHub-Event"),
+                                        self.headers.get("X-Hub-Signature-256"), body)
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):  # pylint: disable=arguments-differ
+                """Logs requests at debug level."""
+                logger.debug(*args)
+
+        return Handler
+
+    def start(self) -> 'MonitorDaemon':
+        """Starts serving reports in background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops refreshing and serving reports."""
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._server.shutdown()
+        self._server.server_close()
+
+    def run(self):
+        """Serves reports and refreshes repositories on schedule until stopped."""
+        self.start()
+        logger.info("Serving reports on %s", self.url)
+        try:
+            while not self._stopped.is_set():
+                self.refresh_due()
+                self._wake.wait(self.seconds_to_next_refresh())
+                self._wake.clear()
+                self.apply_events()
+        finally:
+            if not self._stopped.is_set():
+                self.stop()
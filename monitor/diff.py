@@ -0,0 +1,133 @@
+"""Diff of open issues snapshots."""
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from monitor.entities import GitHubAuthorAssociations
+
+# fields of issues records diff compares and reports
+SUMMARY_FIELDS: Tuple[str, ...] = ("number", "title", "n_comments", "last_commented_by",
+                                   "last_commenter_type", "days_since_last_update")
+SUMMARY_KEYS: Tuple[str, ...] = SUMMARY_FIELDS + ("last_comment_at",)
+
+
+class SnapshotDiff:
+    """Changes of open issues between two snapshots of repository.
+
+    Both snapshots are indexed by issue number once,
+    so all change sets are computed in linear time. Only summaries
+    of records, without their comments, are kept, and ones of previous
+    snapshot are kept as tuples of ``SUMMARY_KEYS`` values.
+    """
+
+    def __init__(self,
+                 previous: Iterable[dict],
+                 current: Iterable[dict] = (),
+                 stale_days: int = 14,
+                 previous_date: Optional[str] = None):
+        """Snapshot diff.
+
+        Args:
+            previous: issues records of previous snapshot, or their summaries
+            current: issues records of current snapshot, could be also
+                added one by one with ``add``
+            stale_days: number of days without update issue is considered stale after
+            previous_date: date of previous snapshot
+        """
+        self.stale_days = stale_days
+        self.previous_date = previous_date
+        self._previous_by_number: Dict[str, tuple] = {}
+        for record in previous:
+            summary = self.summarize(record)
+            self._previous_by_number[str(record["number"])] = tuple(summary.get(key)
+                                                                    for key in SUMMARY_KEYS)
+        self._current_numbers: Set[str] = set()
+        self._members = GitHubAuthorAssociations.members_associations()
+
+        self.opened: List[dict] = []
+        self.newly_commented_by_community: List[dict] = []
+        self.newly_stale: List[dict] = []
+        self.comment_deltas: List[Tuple[dict, int]] = []
+        self.commenter_type_changes: List[Tuple[dict, str, str]] = []
+
+        for record in current:
+            self.add(record)
+
+    def add(self, record: dict):
+        """Adds issue record of current snapshot, so snapshot could be compared while streamed."""
+        record = self.summarize(record)
+        self._current_numbers.add(str(record["number"]))
+        old = self._previous_by_number.get(str(record["number"]))
+        if old is None:
+            self.opened.append(record)
+            return
+        old = dict(zip(SUMMARY_KEYS, old))
+
+        if record.get("n_comments") is not None and old.get("n_comments") is not None \
+                and record["n_comments"] != old["n_comments"]:
+            self.comment_deltas.append((record, record["n_comments"] - old["n_comments"]))
+
+        commenter_changed = record.get("last_commented_by") != old.get("last_commented_by") \
+            or record.get("last_commenter_type") != old.get("last_commenter_type")
+        if record.get("last_commenter_type") != old.get("last_commenter_type"):
+            self.commenter_type_changes.append((record,
+                                                old.get("last_commenter_type"),
+                                                record.get("last_commenter_type")))
+        if (commenter_changed or self._has_new_comment(old, record)) \
+                and record.get("last_commented_by") \
+                and record.get("last_commenter_type") not in self._members:
+            self.newly_commented_by_community.append(record)
+
+        days = record.get("days_since_last_update")
+        old_days = old.get("days_since_last_update")
+        if days is not None and days > self.stale_days \
+                and (old_days is None or old_days <= self.stale_days):
+            self.newly_stale.append(record)
+
+    @staticmethod
+    def summarize(record: dict) -> dict:
+        """Summary of issue record with ``SUMMARY_FIELDS`` and ``last_comment_at``.
+
+        ``last_comment_at`` is ISO 8601 creation time of last comment, if issue has comments.
+        """
+        summary = {key: record[key] for key in SUMMARY_FIELDS if key in record}
+        summary["last_comment_at"] = record["last_comment_at"] if "last_comment_at" in record \
+            else max((comment.get("created_at") or "" for comment in record.get("comments") or []),
+                     default=None)
+        return summary
+
+    @staticmethod
+    def _has_new_comment(old: dict, record: dict) -> bool:
+        """Was issue commented since previous snapshot, even by its last commenter?
+
+        Comment is new if there are more comments than before or last comment
+        is later than before, as one comment could be added and another deleted.
+        """
+        if record.get("n_comments") is not None and old.get("n_comments") is not None \
+                and record["n_comments"] > old["n_comments"]:
+            return True
+        return record["last_comment_at"] is not None and old["last_comment_at"] is not None \
+            and record["last_comment_at"] > old["last_comment_at"]
+
+    @property
+    def closed(self) -> List[dict]:
+        """Issues of previous snapshot missing in current one."""
+        return [dict(zip(SUMMARY_KEYS, values))
+                for number, values in self._previous_by_number.items()
+                if number not in self._current_numbers]
+
+    @property
+    def has_changes(self) -> bool:
+        """Are there any changes between snapshots?"""
+        return any([self.opened, self.closed, self.newly_commented_by_community,
+                    self.newly_stale, self.comment_deltas, self.commenter_type_changes])
+
+    def to_dict(self) -> dict:
+        """Converts to dict."""
+        return {"previous_date": self.previous_date,
+                "opened": self.opened,
+                "closed": self.closed,
+                "newly_commented_by_community": self.newly_commented_by_community,
+                "newly_stale": self.newly_stale,
+                "comment_deltas": [{"issue": record, "delta": delta}
+                                   for record, delta in self.comment_deltas],
+                "commenter_type_changes": [{"issue": record, "from": old, "to": new}
+                                           for record, old, new in self.commenter_type_changes]}
@@ -1,7 +1,16 @@
 """Issue meta class."""
-import inspect
 from datetime import datetime
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Set, Union
+
+
+def to_iso(time: Optional[datetime]) -> Optional[str]:
+    """Converts datetime to ISO 8601 string."""
+    return time.isoformat() if time is not None else None
+
+
+def from_iso(value: Optional[str]) -> Optional[datetime]:
+    """Parses ISO 8601 string written by ``to_iso``."""
+    return datetime.fromisoformat(value) if value is not None else None
 
 
 class GitHubAuthorAssociations:
@@ -30,6 +39,8 @@ class GitHubAuthorAssociations:
 class IssueCommentMeta:
     """Github issue comment meta."""
 
+    __slots__ = ("user", "author_association", "user_type", "created_at", "updated_at")
+
     def __init__(self,
                  user: str,
                  author_association: str,
@@ -51,6 +62,23 @@ class IssueCommentMeta:
         self.created_at = created_at if created_at is not None else datetime.now()
         self.updated_at = updated_at if updated_at is not None else datetime.now()
 
+    def to_dict(self) -> dict:
+        """Converts to dict."""
+        return {"user": self.user,
+                "author_association": self.author_association,
+                "user_type": self.user_type,
+                "created_at": to_iso(self.created_at),
+                "updated_at": to_iso(self.updated_at)}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'IssueCommentMeta':
+        """Restores comment from dict written by ``to_dict``."""
+        return cls(user=data["user"],
+                   author_association=data["author_association"],
+                   user_type=data["user_type"],
+                   created_at=from_iso(data["created_at"]),
+                   updated_at=from_iso(data["updated_at"]))
+
     def __repr__(self):
         return "Comment(by {author} | {time})".format(author=self.user, time=self.created_at)
 
@@ -58,9 +86,22 @@ class IssueCommentMeta:
         return repr(self)
 
 
+# pylint: disable=too-many-instance-attributes
 class IssueMeta:
     """Issue metaclass."""
 
+    # values computed from stored fields, written for snapshot consumers
+    # (trends, diffs) and ignored on load, except of ``n_comments``
+    DERIVED_FIELDS = ("days_since_create_date", "days_since_last_member_comment",
+                      "days_since_last_update", "days_since_last_user_comment",
+                      "is_authored_by_or_last_commented_by_community",
+                      "last_commented_by", "last_commenter_type", "n_comments")
+
+    __slots__ = ("title", "number", "state", "assignee", "author_association", "_comments",
+                 "created_at", "updated_at", "user", "pull_request", "labels", "as_of",
+                 "_n_comments", "_last_comment", "_last_member_comment", "_last_user_comment")
+
+    # pylint: disable=too-many-arguments
     def __init__(self,
                  title: str,
                  number: Union[str, int],
@@ -72,7 +113,9 @@ class IssueMeta:
                  created_at: Optional[datetime] = None,
                  updated_at: Optional[datetime] = None,
                  pull_request: Optional[str] = None,
-                 labels: Optional[List[str]] = None):
+                 labels: Optional[List[str]] = None,
+                 as_of: Optional[datetime] = None,
+                 n_comments: Optional[int] = None):
         """Issue metaclass to store only necessary for reporting information.
 
         Args:
@@ -87,6 +130,9 @@ class IssueMeta:
             user: author
             pull_request: pull request associated with issue
             labels: labels
+            as_of: reference time for ``days_since_*`` values, creation time by default
+            n_comments: number of all comments of issue, if only latest
+                comments are fetched. Number of comments by default.
         """
         self.title = title
         self.number = number
@@ -99,42 +145,92 @@ class IssueMeta:
         self.user = user
         self.pull_request = pull_request
         self.labels = labels if labels else []
+        self.as_of = as_of if as_of is not None else datetime.now()
+        self._n_comments = n_comments
+
+    @property
+    def comments(self) -> List[IssueCommentMeta]:
+        """Comments of issue."""
+        return self._comments
+
+    @comments.setter
+    def comments(self, comments: List[IssueCommentMeta]):
+        """Sets comments and resets summary of them."""
+        self._comments = comments
+        self._last_comment = None
+        self._last_member_comment = None
+        self._last_user_comment = None
+        if len(comments) > 0:
+            self._summarize_comments()
+
+    def _summarize_comments(self):
+        """Finds last, last member and last non bot comments in single pass.
+
+        Last member and non bot comments are last ones in order of comments,
+        last comment is most recently created one.
+        """
+        members_associations = GitHubAuthorAssociations.members_associations()
+        for comment in self._comments:
+            if self._last_comment is None or comment.created_at > self._last_comment.created_at:
+                self._last_comment = comment
+            if comment.author_association in members_associations:
+                self._last_member_comment = comment
+            if comment.user_type != 'Bot':
+                self._last_user_comment = comment
+
+    @property
+    def n_comments(self) -> int:
+        """Number of comments."""
+        return self._n_comments if self._n_comments is not None else len(self._comments)
+
+    @property
+    def last_comment_at(self) -> Optional[datetime]:
+        """Creation time of last comment."""
+        return self._last_comment.created_at if self._last_comment is not None else None
+
+    @property
+    def last_member_comment_at(self) -> Optional[datetime]:
+        """Creation time of last member comment."""
+        return self._last_member_comment.created_at \
+            if self._last_member_comment is not None else None
+
+    @property
+    def last_user_comment_at(self) -> Optional[datetime]:
+        """Creation time of last non bot comment."""
+        return self._last_user_comment.created_at \
+            if self._last_user_comment is not None else None
+
+    def _days_since(self, time: Optional[datetime]) -> Optional[int]:
+        """Number of days since specified time till reference time."""
+        return (self.as_of - time).days if time is not None else None
 
     @property
     def days_since_last_update(self) -> int:
         """Number of days since last update."""
-        return (datetime.now() - self.updated_at).days
+        return self._days_since(self.updated_at)
 
     @property
     def days_since_create_date(self):
         """Number of days since creation."""
-        return (datetime.now() - self.created_at).days
+        return self._days_since(self.created_at)
 
     @property
     def days_since_last_user_comment(self) -> int:
         """Number of days since last user comment."""
-        latest_comments = [comment for comment in self.comments if comment.user_type != 'Bot']
-        return (datetime.now() - latest_comments[-1].created_at).days \
-            if len(latest_comments) > 0 else None
+        return self._days_since(self.last_user_comment_at)
 
     @property
     def days_since_last_member_comment(self) -> int:
         """Number of days since last member comment."""
-        latest_member_comments = [comment for comment in self.comments if
-                                  comment.author_association
-                                  in GitHubAuthorAssociations.members_associations()]
-
-        return (datetime.now() - latest_member_comments[-1].created_at).days \
-            if len(latest_member_comments) > 0 else None
+        return self._days_since(self.last_member_comment_at)
 
     @property
     def is_authored_by_or_last_commented_by_community(self):
         """Is issue authored by community or last comment was from community?"""
         last_commented_by_community = False
-        if len(self.comments) > 0:
-            last_comment = sorted(self.comments, key=lambda c: -c.created_at.timestamp())[0]
+        if self._last_comment is not None:
             last_commented_by_community = \
-                last_comment.author_association not in \
+                self._last_comment.author_association not in \
                 GitHubAuthorAssociations.members_associations()
 
         created_by_community = \
@@ -145,32 +241,68 @@ class IssueMeta:
     @property
     def last_commented_by(self) -> str:
         """Return username of last commented user."""
-        if len(self.comments) > 0:
-            return sorted(self.comments, key=lambda c: -c.created_at.timestamp())[0].user
+        if self._last_comment is not None:
+            return self._last_comment.user
         return ""
 
     @property
     def last_commenter_type(self):
         """Last commenter type."""
-        if len(self.comments) > 0:
-            return sorted(self.comments,
-                          key=lambda c: -c.created_at.timestamp())[0].author_association
+        if self._last_comment is not None:
+            return self._last_comment.author_association
         return GitHubAuthorAssociations.NONE
 
-    def to_dict(self):
-        """Converts to dict."""
-        skip_fields = ["comments", "created_at", "updated_at"]
-
-        result = dict()
-        for name, value in inspect.getmembers(self):
-            if name in skip_fields:
-                continue
-            if not name.startswith('_') and \
-                    not inspect.ismethod(value) and not inspect.isfunction(value) and \
-                    hasattr(self, name):
-                result[name] = value
+    def to_dict(self) -> dict:
+        """Converts to dict.
+
+        Stored fields, with ISO 8601 datetimes and comments, are followed
+        by derived values measured against ``as_of``.
+        """
+        result = {"title": self.title,
+                  "number": self.number,
+                  "state": self.state,
+                  "assignee": self.assignee,
+                  "author_association": self.author_association,
+                  "user": self.user,
+                  "pull_request": self.pull_request,
+                  "labels": self.labels,
+                  "created_at": to_iso(self.created_at),
+                  "updated_at": to_iso(self.updated_at),
+                  "comments": [comment.to_dict() for comment in self._comments]}
+        for name in self.DERIVED_FIELDS:
+            result[name] = getattr(self, name)
         return result
 
+    @classmethod
+    def from_dict(cls, data: dict, as_of: Optional[datetime] = None) -> 'IssueMeta':
+        """Restores issue from dict written by ``to_dict``.
+
+        Args:
+            data: issue record
+            as_of: reference time for ``days_since_*`` values, now by default
+
+        Raises:
+            ValueError: if record has no dates and comments, as records of
+                snapshots written before schema version 2
+        """
+        if "created_at" not in data or "comments" not in data:
+            raise ValueError("Issue record {} has no dates and comments, "
+                             "it was written by schema version 1".format(data.get("number")))
+        return cls(title=data["title"],
+                   number=data["number"],
+                   state=data["state"],
+                   assignee=data["assignee"],
+                   author_association=data["author_association"],
+                   comments=[IssueCommentMeta.from_dict(comment)
+                             for comment in data["comments"]],
+                   user=data["user"],
+                   created_at=from_iso(data["created_at"]),
+                   updated_at=from_iso(data["updated_at"]),
+                   pull_request=data.get("pull_request"),
+                   labels=data.get("labels"),
+                   as_of=as_of,
+                   n_comments=data.get("n_comments"))
+
     def __eq__(self, other: 'IssueMeta'):
         return self.title == self.title and self.user == self.user
 
@@ -183,7 +315,18 @@ class IssueMeta:
 
 
 class RepoMeta:
-    """Github repository meta class."""
+    """Github repository meta class.
+
+    Issues are indexed by label, assignee, author and author association.
+    Indexes are updated as issues are added or removed, so issues matching
+    several values are selected by intersection of index entries.
+    """
+
+    # index name to issue field, label index has entry for every label of issue
+    INDEXES: Dict[str, str] = {"label": "labels",
+                               "assignee": "assignee",
+                               "author": "user",
+                               "author_association": "author_association"}
 
     def __init__(self,
                  account: str,
@@ -198,7 +341,108 @@ class RepoMeta:
         """
         self.account = account
         self.name = name
-        self.issues = issues
+        # issues by position in order they were added, removed ones are left
+        # as ``None`` until they are half of positions, index entries are
+        # sets of positions and positions are found by identity of issue
+        self._issues: List[Optional[IssueMeta]] = []
+        self._positions: Dict[int, int] = {}
+        self._issues_list: Optional[List[IssueMeta]] = None
+        self.indexes: Dict[str, Dict[Optional[str], Set[int]]] = \
+            {index: {} for index in self.INDEXES}
+        for issue in issues:
+            self.add_issue(issue)
+
+    def _index_values(self, index: str, issue: IssueMeta) -> List[Optional[str]]:
+        """Values of issue indexed by index."""
+        value = getattr(issue, self.INDEXES[index])
+        return list(value) if index == "label" else [value]
+
+    @property
+    def issues(self) -> List[IssueMeta]:
+        """Issues in order they were added."""
+        if self._issues_list is None:
+            self._issues_list = [issue for issue in self._issues if issue is not None]
+        return self._issues_list
+
+    def add_issue(self, issue: IssueMeta):
+        """Adds issue and its index entries.
+
+        Indexed fields of issue must not be changed while it is added,
+        it should be removed and added again instead.
+        """
+        if id(issue) in self._positions:
+            return
+        position = len(self._issues)
+        self._issues.append(issue)
+        self._positions[id(issue)] = position
+        self._issues_list = None
+        for index, entries in self.indexes.items():
+            for value in self._index_values(index, issue):
+                entries.setdefault(value, set()).add(position)
+
+    def remove_issue(self, issue: IssueMeta):
+        """Removes issue and its index entries."""
+        position = self._positions.pop(id(issue), None)
+        if position is None:
+            return
+        self._issues[position] = None
+        self._issues_list = None
+        for index, entries in self.indexes.items():
+            for value in self._index_values(index, issue):
+                entries[value].discard(position)
+                if len(entries[value]) == 0:
+                    del entries[value]
+        if len(self._positions) <= len(self._issues) // 2:
+            self._compact()
+
+    def _compact(self):
+        """Drops removed issues, renumbering positions of index entries."""
+        renumbered = {}
+        for position, issue in enumerate(self._issues):
+            if issue is not None:
+                renumbered[position] = len(renumbered)
+        self._issues = [issue for issue in self._issues if issue is not None]
+        self._positions = {id(issue): position for position, issue in enumerate(self._issues)}
+        for entries in self.indexes.values():
+            for value, positions in entries.items():
+                entries[value] = {renumbered[position] for position in positions}
+
+    def counts(self, index: str) -> Dict[Optional[str], int]:
+        """Number of issues per value of index, in order values were first added."""
+        return {value: len(positions) for value, positions in self.indexes[index].items()}
+
+    def select(self, **criteria: Union[Optional[str], List[Optional[str]]]) -> List[IssueMeta]:
+        """Selects issues matching all criteria by intersection of index entries.
+
+        Examples:
+            repo.select(label="bug", assignee=None,
+                        author_association=["NONE", "CONTRIBUTOR"])
+
+        Args:
+            criteria: index name to value or list of any of values,
+                ``None`` selects issues without value, like unassigned ones
+
+        Returns:
+            matching issues in order they were added
+        """
+        matches: List[Set[int]] = []
+        for index, values in criteria.items():
+            entries = self.indexes[index]
+            values = values if isinstance(values, list) else [values]
+            matches.append(set().union(*(entries.get(value, set()) for value in values)))
+        if len(matches) == 0:
+            return list(self.issues)
+
+        matches.sort(key=len)
+        selected = matches[0].intersection(*matches[1:])
+        return [issue for position, issue in enumerate(self._issues) if position in selected] \
+            if len(selected) > len(self._positions) // 2 \
+            else [self._issues[position] for position in sorted(selected)]
+
+    def __reduce__(self):
+        # index entries are positions found by identity of issues,
+        # so indexes are rebuilt without removed issues on unpickling
+        return RepoMeta, (self.account, self.name, self.issues)
 
     def __str__(self):
         return "Repo({account}/{name} | {n_issues} issues)".format(account=self.account,
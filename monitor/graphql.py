@@ -0,0 +1,128 @@
+"""GitHub GraphQL api fetch backend.
+
+Fetches open issues and pull requests together with their latest comments
+in pages of 100 and converts them to payloads of the same shape
+as GitHub REST api returns.
+"""
+import json
+from typing import Callable, List, Optional, Tuple
+
+import requests
+
+OPEN_ITEMS_QUERY: str = """
+query($owner: String!, $name: String!, $cursor: String) {
+  repository(owner: $owner, name: $name) {
+    items: %(connection)s(states: OPEN, first: 100, after: $cursor,
+                          orderBy: {field: CREATED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        number
+        title
+        state
+        createdAt
+        updatedAt
+        authorAssociation
+        author { login __typename }
+        assignees(first: 1) { nodes { login } }
+        labels(first: 20) { nodes { name } }
+        comments(last: 100) {
+          totalCount
+          nodes { authorAssociation createdAt updatedAt author { login __typename } }
+        }
+      }
+    }
+  }
+}
+"""
+
+CONNECTIONS: List[str] = ["issues", "pullRequests"]
+
+
+def _to_rest_user(author: Optional[dict]) -> dict:
+    """Converts GraphQL actor to REST api user payload."""
+    if author is None:
+        return {"login": "ghost", "type": "User"}
+    if author.get("__typename") == "Bot":
+        return {"login": "{}[bot]".format(author.get("login")), "type": "Bot"}
+    return {"login": author.get("login"), "type": author.get("__typename")}
+
+
+def to_rest_comment(node: dict) -> dict:
+    """Converts GraphQL comment node to REST api comment payload."""
+    return {"user": _to_rest_user(node.get("author")),
+            "author_association": node.get("authorAssociation"),
+            "created_at": node.get("createdAt"),
+            "updated_at": node.get("updatedAt")}
+
+
+def to_rest_issue(node: dict, account: str, repo: str, is_pull_request: bool) -> dict:
+    """Converts GraphQL issue or pull request node to REST api issue payload."""
+    assignees = node.get("assignees", {}).get("nodes", [])
+    issue = {"number": node.get("number"),
+             "title": node.get("title"),
+             "state": node.get("state", "").lower(),
+             "created_at": node.get("createdAt"),
+             "updated_at": node.get("updatedAt"),
+             "author_association": node.get("authorAssociation"),
+             "user": _to_rest_user(node.get("author")),
+             "assignee": {"login": assignees[0].get("login")} if assignees else None,
+             "labels": [{"name": label.get("name")}
+                        for label in node.get("labels", {}).get("nodes", [])],
+             "comments": node.get("comments", {}).get("totalCount", 0)}
+    if is_pull_request:
+        issue["pull_request"] = {
+            "url": "https://api.github.com/repos/{account}/{repo}/pulls/{number}".format(
+                account=account, repo=repo, number=node.get("number"))
+        }
+    return issue
+
+
+def crawl_open_issues(post: Callable[[str, dict], requests.Response],
+                      url: str,
+                      account: str,
+                      repo: str,
+                      max_pages: Optional[int] = None) -> List[Tuple[dict, List[dict]]]:
+    """Fetches open issues and pull requests with their last 100 comments.
+
+    Args:
+        post: function sending json payload to url
+        url: GraphQL api url
+        account: GitHub account
+        repo: name of repo
+        max_pages: max number of pages to fetch for issues and for pull requests
+
+    Returns:
+        pairs of REST-like issue and comments payloads, most recently created first
+
+    Raises:
+        requests.HTTPError: if page can not be fetched or query returned errors
+    """
+    fetched = []
+    for connection in CONNECTIONS:
+        cursor = None
+        max_counter = max_pages if max_pages is not None else 100
+        while max_counter > 0:
+            max_counter -= 1
+
+            response = post(url, {"query": OPEN_ITEMS_QUERY % {"connection": connection},
+                                  "variables": {"owner": account, "name": repo,
+                                                "cursor": cursor}})
+            response.raise_for_status()
+            data = json.loads(response.text)
+            if data.get("errors"):
+                raise requests.HTTPError("GraphQL query failed: {}".format(data["errors"]),
+                                         response=response)
+
+            items = data["data"]["repository"]["items"]
+            for node in items["nodes"]:
+                comments = [to_rest_comment(comment)
+                            for comment in node.get("comments", {}).get("nodes", [])]
+                fetched.append((to_rest_issue(node, account, repo,
+                                              is_pull_request=connection == "pullRequests"),
+                                comments))
+
+            if not items["pageInfo"]["hasNextPage"]:
+                break
+            cursor = items["pageInfo"]["endCursor"]
+
+    return sorted(fetched, key=lambda item: item[0]["created_at"], reverse=True)
@@ -0,0 +1,216 @@
+"""Instrumentation of monitor runs."""
+import heapq
+import json
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+
+def endpoint_of(url: str) -> str:
+    """Path of url with numbers replaced by placeholder, so requests group by endpoint."""
+    return re.sub(r"/\d+(?=/|$)", "/{number}", urlparse(url).path)
+
+
+def _escape_label(value: str) -> str:
+    """Escapes Prometheus label value."""
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+class Metrics:
+    """Thread-safe collector of timings, requests and rate limit of run.
+
+    Every recorded event is also logged to ``monitor.metrics`` logger at debug
+    level with ``event`` and ``fields`` attributes of log record, and passed
+    to ``hook`` if specified, so it can be forwarded to structured logging.
+    """
+
+    def __init__(self, hook: Optional[Callable[[str, dict], None]] = None,
+                 n_slowest: int = 10):
+        """Metrics collector.
+
+        Args:
+            hook: called with name and fields of every recorded event
+            n_slowest: number of slowest issues to keep
+        """
+        self.hook = hook
+        self.n_slowest = n_slowest
+        self.started_at = time.time()
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self.endpoints: Dict[str, Dict[str, float]] = {}
+        self.rate_limit_remaining: Optional[int] = None
+        self.rate_limit_reset: Optional[int] = None
+        self._slowest_issues: List[Tuple[float, str]] = []
+        self._lock = threading.Lock()
+
+    def _emit(self, event: str, **fields):
+        """Logs event and passes it to hook."""
+        logger.debug("%s %s", event, fields, extra={"event": event, "fields": fields})
+        if self.hook is not None:
+            self.hook(event, fields)
+
+    def _endpoint(self, url: str) -> Dict[str, float]:
+        """Counters of endpoint of url, must be called under lock."""
+        return self.endpoints.setdefault(endpoint_of(url), {
+            "requests": 0, "bytes": 0, "seconds": 0.0,
+            "retries": 0, "not_modified": 0, "failures": 0})
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Measures time spent in block, accumulated per phase name over all threads."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_phase(name, time.perf_counter() - start)
+
+    def record_phase(self, name: str, seconds: float):
+        """Adds time measured outside of ``phase`` block to phase."""
+        with self._lock:
+            phase = self.phases.setdefault(name, {"calls": 0, "seconds": 0.0})
+            phase["calls"] += 1
+            phase["seconds"] += seconds
+        self._emit("phase", phase=name, seconds=seconds)
+
+    def merge_phases(self, phases: Dict[str, Dict[str, float]]):
+        """Adds phases measured by other collector, such as one of worker process."""
+        with self._lock:
+            for name, other in phases.items():
+                phase = self.phases.setdefault(name, {"calls": 0, "seconds": 0.0})
+                phase["calls"] += other["calls"]
+                phase["seconds"] += other["seconds"]
+
+    def record_request(self, method: str, url: str,
+                       response: requests.Response, seconds: float):
+        """Records sent request and rate limit reported by response."""
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        reset = response.headers.get("X-RateLimit-Reset")
+        with self._lock:
+            counters = self._endpoint(url)
+            counters["requests"] += 1
+            counters["bytes"] += len(response.content)
+            counters["seconds"] += seconds
+            if remaining is not None and remaining.isdigit():
+                self.rate_limit_remaining = int(remaining)
+            if reset is not None and reset.isdigit():
+                self.rate_limit_reset = int(reset)
+        self._emit("request", method=method, url=url, status=response.status_code,
+                   seconds=seconds, rate_limit_remaining=remaining)
+
+    def record_retry(self, url: str, response: Union[requests.Response, Exception],
+                     delay: float):
+        """Records retry of request after response or connection error."""
+        with self._lock:
+            self._endpoint(url)["retries"] += 1
+        status = response.status_code if isinstance(response, requests.Response) \
+            else type(response).__name__
+        self._emit("retry", url=url, status=status, delay=delay)
+
+    def record_not_modified(self, url: str):
+        """Records response served from cache on ``304 Not Modified``."""
+        with self._lock:
+            self._endpoint(url)["not_modified"] += 1
+        self._emit("not_modified", url=url)
+
+    def record_failure(self, url: str, response: requests.Response):
+        """Records request failed after retries."""
+        with self._lock:
+            self._endpoint(url)["failures"] += 1
+        logger.warning("Request to %s failed with status %s: %s",
+                       url, response.status_code, response.text)
+        self._emit("failure", url=url, status=response.status_code)
+
+    def record_issue(self, issue: str, seconds: float):
+        """Records time of fetching comments of issue, only slowest are kept."""
+        with self._lock:
+            if len(self._slowest_issues) < self.n_slowest:
+                heapq.heappush(self._slowest_issues, (seconds, issue))
+            else:
+                heapq.heappushpop(self._slowest_issues, (seconds, issue))
+
+    @property
+    def slowest_issues(self) -> List[Tuple[str, float]]:
+        """Slowest issues and seconds spent on them, slowest first."""
+        with self._lock:
+            return [(issue, seconds) for seconds, issue in
+                    sorted(self._slowest_issues, reverse=True)]
+
+    def summary(self) -> dict:
+        """Summary of run."""
+        with self._lock:
+            endpoints = {name: dict(counters) for name, counters in self.endpoints.items()}
+            phases = {name: dict(phase) for name, phase in self.phases.items()}
+        return {"seconds": time.time() - self.started_at,
+                "requests": sum(counters["requests"] for counters in endpoints.values()),
+                "bytes": sum(counters["bytes"] for counters in endpoints.values()),
+                "retries": sum(counters["retries"] for counters in endpoints.values()),
+                "not_modified": sum(counters["not_modified"]
+                                    for counters in endpoints.values()),
+                "failures": sum(counters["failures"] for counters in endpoints.values()),
+                "rate_limit_remaining": self.rate_limit_remaining,
+                "rate_limit_reset": self.rate_limit_reset,
+                "phases": phases,
+                "endpoints": endpoints,
+                "slowest_issues": [{"issue": issue, "seconds": seconds}
+                                   for issue, seconds in self.slowest_issues]}
+
+    def to_prometheus(self) -> str:
+        """Summary of run in Prometheus text exposition format."""
+        summary = self.summary()
+        lines = []
+
+        def metric(name: str, kind: str, description: str,
+                   samples: List[Tuple[str, float]]):
+            lines.append("# HELP monitor_{} {}".format(name, description))
+            lines.append("# TYPE monitor_{} {}".format(name, kind))
+            for labels, value in samples:
+                lines.append("monitor_{}{} {}".format(name, labels, value))
+
+        endpoints = sorted(summary["endpoints"].items())
+        for counter, description in [("requests", "Requests sent per endpoint."),
+                                     ("bytes", "Bytes of response bodies per endpoint."),
+                                     ("seconds", "Seconds spent in requests per endpoint."),
+                                     ("retries", "Retried requests per endpoint."),
+                                     ("not_modified", "Responses served from cache per endpoint."),
+                                     ("failures", "Failed requests per endpoint.")]:
+            metric("endpoint_{}_total".format(counter), "counter", description,
+                   [('{{endpoint="{}"}}'.format(_escape_label(name)), counters[counter])
+                    for name, counters in endpoints])
+
+        phases = sorted(summary["phases"].items())
+        metric("phase_seconds_total", "counter", "Seconds spent per phase.",
+               [('{{phase="{}"}}'.format(_escape_label(name)), phase["seconds"])
+                for name, phase in phases])
+        metric("phase_calls_total", "counter", "Calls per phase.",
+               [('{{phase="{}"}}'.format(_escape_label(name)), phase["calls"])
+                for name, phase in phases])
+        if summary["rate_limit_remaining"] is not None:
+            metric("rate_limit_remaining", "gauge", "Remaining GitHub api rate limit.",
+                   [("", summary["rate_limit_remaining"])])
+        metric("slowest_issue_seconds", "gauge", "Seconds of fetching comments of slowest issues.",
+               [('{{issue="{}"}}'.format(_escape_label(slowest["issue"])), slowest["seconds"])
+                for slowest in summary["slowest_issues"]])
+        metric("run_seconds", "gauge", "Duration of run in seconds.",
+               [("", summary["seconds"])])
+        return "\n".join(lines) + "\n"
+
+    def write(self, folder: str, name: str):
+        """Writes json summary and Prometheus textfile of run.
+
+        Args:
+            folder: folder to write files to
+            name: name of files without extension
+        """
+        with open(os.path.join(folder, "{}.metrics.json".format(name)), "w",
+                  encoding="utf-8") as file:
+            json.dump(self.summary(), file, indent=2)
+        with open(os.path.join(folder, "{}.prom".format(name)), "w", encoding="utf-8") as file:
+            file.write(self.to_prometheus())
@@ -3,131 +3,974 @@ Purpose of this class is to ba an adapter to command line commands
 and execute specifics scripts for monitoring needs.
 """
 import json
+import logging
+import math
 import os
-from datetime import datetime
-from typing import Optional, List
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from contextlib import ExitStack
+from itertools import islice
+from typing import (Callable, Deque, Dict, Iterable, Iterator, Optional, List, Set, Tuple,
+                    Union)
 
 import requests
 
-from monitor.entities import IssueMeta, IssueCommentMeta, RepoMeta
-from monitor.report import FullReport
-from monitor.utils import UrlsHelper, GitHubUrlsHelper
+from monitor.cache import HttpCache
+from monitor.daemon import MonitorDaemon
+from monitor.diff import SnapshotDiff
+from monitor.entities import GitHubAuthorAssociations, IssueMeta, IssueCommentMeta, RepoMeta
+from monitor.graphql import crawl_open_issues
+from monitor.metrics import Metrics
+from monitor.report import FullReport, RepoReport, TrendsReport
+from monitor.schema import SnapshotWriter, records_to_issues, write_snapshot
+from monitor.search import AccountSearch
+from monitor.snapshots import (SnapshotStore, import_json_snapshots, json_snapshots,
+                               load_latest_snapshot)
+from monitor.state import RepoState
+from monitor.storage import IssueStore
+from monitor.transport import HttpTransport, RecordingTransport, ReplayTransport
+from monitor.tokens import TokenPool
+from monitor.trends import collect_trends
+from monitor.utils import UrlsHelper, GitHubUrlsHelper, get_page, get_per_page, set_page
+
+logger = logging.getLogger(__name__)
 
 
 # pylint: disable=too-few-public-methods
-def save_open_issues_to_json(repo_meta: RepoMeta,
-                             folder: Optional[str] = None):
-    """Saves open issues to json."""
+def json_snapshot_path(name: str, folder: Optional[str] = None) -> str:
+    """Path of new json snapshot of repository, folder is created if needed."""
     folder = folder or "./resources"
     if not os.path.exists(folder):
         os.makedirs(folder)
-    file_name = f'{repo_meta.name}_{datetime.now().strftime("%m-%d-%Y-%H-%M")}.json'
-    with open(f"{folder}/{file_name}", "w") as file:
-        json.dump([i.to_dict() for i in repo_meta.issues], file)
+    file_name = f'{name}_{datetime.now().strftime("%m-%d-%Y-%H-%M")}.json'
+    return f"{folder}/{file_name}"
+
+
+def save_open_issues_to_json(repo_meta: RepoMeta,
+                             folder: Optional[str] = None):
+    """Saves open issues to json."""
+    write_snapshot(json_snapshot_path(repo_meta.name, folder), repo_meta.issues)
 
 
+def save_open_issues_to_store(repo_meta: RepoMeta, store: Union[SnapshotStore, IssueStore]):
+    """Saves open issues to delta-encoded snapshot store or SQLite issue store."""
+    store.save(repo_meta.name, [i.to_dict() for i in repo_meta.issues])
+
+
+# pylint: disable=too-many-instance-attributes
 class Monitor:
     """Monitor class."""
 
-    def __init__(self, token: Optional[str] = None, urls: Optional[UrlsHelper] = None):
-        """Monitor class."""
-        self.token = token
-        self.headers = {"Authorization": "token {}".format(self.token)} if self.token else {}
+    RETRY_STATUSES: List[int] = [500, 502, 503, 504]
+    RATE_LIMIT_STATUSES: List[int] = [403, 429]
+    BACKENDS: List[str] = ["rest", "graphql"]
+    SEARCH_LIMIT: int = 1000
+    SEARCH_START: datetime = datetime(2008, 1, 1)
+    SEARCH_INTERVAL: float = 2.0
+
+    # pylint: disable=too-many-arguments,too-many-locals
+    def __init__(self,
+                 token: Optional[Union[str, List[str]]] = None,
+                 urls: Optional[UrlsHelper] = None,
+                 max_workers: int = 1,
+                 pool_size: int = 10,
+                 max_retries: int = 5,
+                 backoff_factor: float = 1.0,
+                 timeout: Optional[float] = 30.0,
+                 cache_dir: Optional[str] = None,
+                 cache_size: int = 256 * 1024 * 1024,
+                 backend: str = "rest",
+                 snapshots_dir: Optional[str] = None,
+                 record: Optional[str] = None,
+                 replay: Optional[str] = None,
+                 replay_latency: float = 0.0,
+                 metrics: Optional[Metrics] = None,
+                 tail_comments: bool = False,
+                 pipeline: bool = False,
+                 report_processes: Optional[int] = None,
+                 database: Optional[str] = None):
+        """Monitor class.
+
+        Args:
+            token: GitHub access token, list or comma separated tokens to schedule
+                requests over by their remaining rate limit
+            urls: urls helper, GitHub API by default
+            max_workers: number of concurrent comments requests
+            pool_size: number of pooled connections per host
+            max_retries: number of retries for rate limited and server error responses,
+                connection errors and timeouts
+            backoff_factor: base delay in seconds for exponential backoff between retries
+            timeout: seconds to wait for connection and for response data of request
+            cache_dir: folder for on-disk cache of responses, disabled if not specified
+            cache_size: max size of on-disk cache in bytes
+            backend: api used to fetch open issues, ``rest`` or ``graphql``
+            snapshots_dir: folder of delta-encoded snapshot store, if specified
+                snapshots are saved there instead of json files in ./resources
+            record: path of archive to record all http exchanges to
+            replay: path of recorded archive to serve responses from instead of network
+            replay_latency: seconds every replayed response is delayed by
+            metrics: collector of timings and requests of run, new one by default
+            tail_comments: fetch only latest comments needed for report, from last
+                page backwards, and skip issues without comments
+            pipeline: stream issues of each repository page by page into snapshot
+                and issue store report is answered from, keeping no fetched issues
+            report_processes: number of processes rendering reports of repositories
+                in parallel, 0 for number of CPUs, rendered in single process by default
+            database: path of SQLite database to keep issues, comments and snapshots
+                history of all repositories in, used instead of ``snapshots_dir``
+        """
+        if backend not in self.BACKENDS:
+            raise ValueError("Unknown backend {}, available: {}".format(backend, self.BACKENDS))
+        tokens = token.split(",") if isinstance(token, str) else list(token or [])
+        self.token = tokens[0] if tokens else None
+        self.tokens = TokenPool(tokens) if tokens else None
         self.urls = urls if urls else GitHubUrlsHelper()
+        self.max_workers = max(1, max_workers)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backend = backend
+        self.tail_comments = tail_comments
+        self.pipeline = pipeline
+        self.report_processes = report_processes
 
-    def _get_comments(self, account: str, repo: str, issue_number: str) -> List[IssueCommentMeta]:
-        """Get issue comments."""
-        comments = []
-        issue_comments_response = requests.get(self.urls.get_comments_url(number=issue_number,
-                                                                          account=account,
-                                                                          repo=repo),
-                                               headers=self.headers)
+        if replay:
+            self.transport = ReplayTransport(replay, latency=replay_latency)
+        else:
+            self.transport = HttpTransport(pool_size=pool_size, timeout=timeout)
+            if record:
+                self.transport = RecordingTransport(record, self.transport)
+        self.cache = HttpCache(cache_dir, max_size=cache_size) if cache_dir else None
+        self.snapshots: Optional[Union[SnapshotStore, IssueStore]] = None
+        if database:
+            self.snapshots = IssueStore(database)
+        elif snapshots_dir:
+            self.snapshots = SnapshotStore(snapshots_dir)
+        self.metrics = metrics if metrics is not None else Metrics()
+        self._spool: Optional[IssueStore] = None
+        self._spool_dir: Optional[tempfile.TemporaryDirectory] = None
+
+    def _is_retryable(self, response: requests.Response) -> bool:
+        """Is response a rate limit or transient server error?"""
+        if response.status_code in self.RETRY_STATUSES:
+            return True
+        if response.status_code in self.RATE_LIMIT_STATUSES:
+            return response.status_code == 429 \
+                or "Retry-After" in response.headers \
+                or response.headers.get("X-RateLimit-Remaining") == "0"
+        return False
+
+    def _retry_delay(self, response: requests.Response, attempt: int) -> float:
+        """Seconds to wait before retrying request.
+
+        ``Retry-After`` header has priority, then ``X-RateLimit-Reset``
+        for exhausted rate limit, then exponential backoff.
+        """
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is not None and retry_after.isdigit():
+            return float(retry_after)
+        reset = response.headers.get("X-RateLimit-Reset")
+        if response.headers.get("X-RateLimit-Remaining") == "0" and reset is not None:
+            if self.tokens is not None and self.tokens.has_headroom():
+                # retried with another token
+                return 0.0
+            return max(0.0, float(reset) - time.time()) + 1
+        return self.backoff_factor * (2 ** attempt)
+
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Sends request with transport retrying on rate limits, server errors,
+        connection errors and timeouts.
+
+        Connection errors and timeouts are retried with exponential backoff,
+        and raised when retries are exhausted.
+        """
+        attempt = 0
+        while True:
+            try:
+                response = self._send_once(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as error:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.backoff_factor * (2 ** attempt)
+                self.metrics.record_retry(url, error, delay)
+            else:
+                if not self._is_retryable(response) or attempt >= self.max_retries:
+                    return response
+                delay = self._retry_delay(response, attempt)
+                self.metrics.record_retry(url, response, delay)
+            time.sleep(delay)
+            attempt += 1
+
+    def _send_once(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Sends request with token with most headroom and records it in metrics."""
+        token = None
+        if self.tokens is not None:
+            token = self.tokens.acquire()
+            kwargs["headers"] = dict(kwargs.get("headers") or {},
+                                     Authorization="token {}".format(token))
+        start = time.perf_counter()
+        try:
+            response = self.transport.send(method, url, **kwargs)
+        except requests.RequestException:
+            if token is not None:
+                self.tokens.release(token)
+            raise
+        self.metrics.record_request(method, url, response, time.perf_counter() - start)
+        if token is not None:
+            self.tokens.update(token, response)
+        return response
+
+    def _get(self, url: str) -> requests.Response:
+        """Performs GET request retrying on rate limits and server errors.
+
+        If cache is enabled request is conditional and body
+        of ``304 Not Modified`` response is served from cache.
+        """
+        headers = self.cache.conditional_headers(url) if self.cache else {}
+        response = self._send("GET", url, headers=headers)
+
+        if self.cache is not None:
+            if response.status_code == 304:
+                self.metrics.record_not_modified(url)
+                cached_response = self.cache.cached_response(url, response)
+                # entry could be evicted in between, request it unconditionally
+                return cached_response if cached_response is not None \
+                    else self._send("GET", url)
+            if response.ok:
+                self.cache.store(url, response)
+        return response
+
+    def _post(self, url: str, payload: dict) -> requests.Response:
+        """Performs POST request with json payload retrying on rate limits and server errors."""
+        return self._send("POST", url, json=payload)
+
+    def invalidate_cache(self, url: Optional[str] = None):
+        """Removes url or all responses from on-disk cache."""
+        if self.cache is not None:
+            self.cache.invalidate(url)
+
+    def _fetch_comments(self, account: str, repo: str, issue_number: str) -> List[dict]:
+        """Fetches issue comments payloads.
+
+        Threads with more than one page of comments are fetched
+        concurrently based on ``Link`` header of first page.
+        """
+        start = time.perf_counter()
+        comments_data = []
+        comments_url = self.urls.get_comments_url(number=issue_number,
+                                                  account=account,
+                                                  repo=repo)
+        issue_comments_response = self._get(comments_url)
         if issue_comments_response.ok:
-            comments_data = json.loads(issue_comments_response.text)
-            comments = [IssueCommentMeta(user=comment.get("user", {}).get("login"),
-                                         author_association=comment.get("author_association"),
-                                         user_type=comment.get("user", {}).get("type"),
-                                         created_at=datetime.fromisoformat(
-                                             comment.get("created_at")[:-1]),
-                                         updated_at=datetime.fromisoformat(
-                                             comment.get("updated_at")[:-1]))
-                        for comment in comments_data]
+            comments_data = self._load_json(issue_comments_response)
         else:
-            # TODO: warning or raise error  # pylint: disable=fixme
-            print(issue_comments_response.text)
+            self.metrics.record_failure(comments_url, issue_comments_response)
+
+        last_page = self._last_page(issue_comments_response)
+        if last_page is not None and last_page > 1:
+            last_url = issue_comments_response.links["last"]["url"]
+            pages_urls = [set_page(last_url, page) for page in range(2, last_page + 1)]
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for url, response in zip(pages_urls, executor.map(self._get, pages_urls)):
+                    if response.ok:
+                        comments_data.extend(self._load_json(response))
+                    else:
+                        self.metrics.record_failure(url, response)
+
+        seconds = time.perf_counter() - start
+        self.metrics.record_issue("{}/{}#{}".format(account, repo, issue_number), seconds)
+        return comments_data
+
+    def _fetch_latest_comments(self, account: str, repo: str, issue: dict) -> List[dict]:
+        """Fetches only latest comments of issue needed for its summary.
+
+        Number of comments from issue payload is used to skip issues without
+        comments and to request last page first. It could be stale, as in
+        cached or incremental listings, so last page is corrected by ``Link``
+        header of fetched page and followed on, and number of comments of
+        payload is updated. Pages are walked backwards until last member
+        comment and last non bot comment are found, last comment is always
+        on last page. Falls back to fetching all comments if number of
+        comments or page size is unknown.
+        """
+        n_comments = issue.get("comments")
+        url = self.urls.get_comments_url(number=issue.get("number"), account=account, repo=repo)
+        per_page = get_per_page(url)
+        if not isinstance(n_comments, int) or per_page is None:
+            return self._fetch_comments(account, repo, issue.get("number"))
+        if n_comments == 0:
+            return []
 
-        return comments
+        start = time.perf_counter()
+        pages: Dict[int, List[dict]] = {}
+
+        def fetch(page: int) -> Optional[requests.Response]:
+            page_url = set_page(url, page)
+            response = self._get(page_url)
+            if not response.ok:
+                self.metrics.record_failure(page_url, response)
+                return None
+            pages[page] = self._load_json(response)
+            return response
+
+        last_page = math.ceil(n_comments / per_page)
+        response = fetch(last_page)
+        while response is not None and "next" in response.links:
+            linked_last_page = self._last_page(response)
+            last_page = linked_last_page if linked_last_page is not None \
+                and linked_last_page > last_page else last_page + 1
+            response = fetch(last_page)
+        if response is not None and len(pages[last_page]) == 0 and last_page > 1:
+            # page past the end, comments were deleted since count was taken
+            comments_data = self._fetch_comments(account, repo, issue.get("number"))
+            issue["comments"] = len(comments_data)
+            return comments_data
+        if response is not None:
+            issue["comments"] = (last_page - 1) * per_page + len(pages[last_page])
+
+        members_associations = GitHubAuthorAssociations.members_associations()
+        comments_data: List[dict] = []
+        has_member_comment, has_user_comment = False, False
+        for page in range(last_page, 0, -1):
+            if page not in pages and fetch(page) is None:
+                break
+            page_data = pages.get(page, [])
+            comments_data = page_data + comments_data
+            has_member_comment = has_member_comment or any(
+                comment.get("author_association") in members_associations
+                for comment in page_data)
+            has_user_comment = has_user_comment or any(
+                comment.get("user", {}).get("type") != "Bot" for comment in page_data)
+            if has_member_comment and has_user_comment:
+                break
+
+        seconds = time.perf_counter() - start
+        self.metrics.record_issue("{}/{}#{}".format(account, repo, issue.get("number")), seconds)
+        return comments_data
+
+    def _submit_comments(self, executor: ThreadPoolExecutor,
+                         account: str, repo: str, issue: dict) -> Future:
+        """Submits fetch of comments of issue to executor."""
+        if self.tail_comments:
+            return executor.submit(self._fetch_latest_comments, account, repo, issue)
+        return executor.submit(self._fetch_comments, account, repo, issue.get("number"))
+
+    def _load_json(self, response: requests.Response):
+        """Decodes json body of response."""
+        with self.metrics.phase("json"):
+            return json.loads(response.text)
+
+    def _get_comments(self, account: str, repo: str, issue_number: str) -> List[IssueCommentMeta]:
+        """Get issue comments."""
+        return [self._parse_comment(comment)
+                for comment in self._fetch_comments(account, repo, issue_number)]
+
+    @staticmethod
+    def _last_page(response: requests.Response) -> Optional[int]:
+        """Number of last page from ``Link`` header of response."""
+        last = response.links.get("last")
+        return get_page(last["url"]) if last is not None else None
+
+    @staticmethod
+    def _is_last_page(response: requests.Response, items: list) -> bool:
+        """Is response a last page of listing?"""
+        if "Link" in response.headers:
+            return "next" not in response.links
+        per_page = get_per_page(response.url) if response.url else None
+        return len(items) == 0 or (per_page is not None and len(items) < per_page)
+
+    def _iter_pages(self, executor: ThreadPoolExecutor,
+                    page_url: Callable[[int], str],
+                    max_pages: int) -> Iterator[list]:
+        """Yields pages of listing in order.
+
+        If first page has ``Link`` header with ``rel="last"``, remaining pages
+        are fetched concurrently in executor, at most ``max_workers`` pages
+        ahead of consumer. Otherwise pages are fetched one by one until last page.
+
+        Raises:
+            requests.HTTPError: if page can not be fetched after retries
+        """
+        first_response = self._get(page_url(1))
+        first_response.raise_for_status()
+        items = self._load_json(first_response)
+        yield items
+
+        last_page = self._last_page(first_response)
+        if last_page is not None:
+            pages = iter(range(2, min(last_page, max_pages) + 1))
+            futures: Deque[Future] = deque(executor.submit(self._get, page_url(page))
+                                           for page in islice(pages, self.max_workers))
+            while futures:
+                response = futures.popleft().result()
+                for page in islice(pages, 1):
+                    futures.append(executor.submit(self._get, page_url(page)))
+                response.raise_for_status()
+                yield self._load_json(response)
+            return
+
+        page, response = 1, first_response
+        while page < max_pages and not self._is_last_page(response, items):
+            page += 1
+            response = self._get(page_url(page))
+            response.raise_for_status()
+            items = self._load_json(response)
+            if len(items) > 0:
+                yield items
+
+    def _iter_crawl(self, account: str, repo: str,
+                    issues_url: Callable[[int], str],
+                    max_pages: Optional[int] = None) -> Iterator[Tuple[dict, List[dict]]]:
+        """Yields issues and comments of each issue page by page.
+
+        Pages of issues are fanned out based on ``Link`` header of first page.
+        Comments of open issues of a page are requested in a pool of ``max_workers``
+        threads while next page of issues is being fetched, so payloads of
+        at most two pages of issues and their comments wait for consumer.
+
+        Args:
+            account: GitHub account
+            repo: name of repo
+            issues_url: url of page of issues for page number
+            max_pages: max number of pages to fetch
+
+        Yields:
+            pairs of issue and its comments payloads in order of GitHub api
+        """
+        max_pages = max_pages if max_pages is not None else 100
+
+        def resolve(page: List[Tuple[dict, Optional[Future]]]):
+            for issue, comments in page:
+                yield issue, comments.result() if comments is not None else []
+
+        pending: Deque[List[Tuple[dict, Optional[Future]]]] = deque()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for fetched_repo_issues in self._iter_pages(executor, issues_url, max_pages):
+                pending.append([(issue, self._submit_comments(executor, account, repo, issue)
+                                 if issue.get("state") == "open" else None)
+                                for issue in fetched_repo_issues])
+                if len(pending) > 1:
+                    yield from resolve(pending.popleft())
+            while pending:
+                yield from resolve(pending.popleft())
+
+    def _crawl(self, account: str, repo: str,
+               issues_url: Callable[[int], str],
+               max_pages: Optional[int] = None) -> List[Tuple[dict, List[dict]]]:
+        """Fetches pages of issues and comments of each issue, see ``_iter_crawl``."""
+        return list(self._iter_crawl(account, repo, issues_url, max_pages=max_pages))
+
+    def _issues_url(self, account: str, repo: str) -> Callable[[int], str]:
+        """Url of page of open issues of repository for page number."""
+        return lambda page: self.urls.get_issues_url(account=account, repo=repo, page=page)
+
+    def _crawl_open(self, account: str, repo: str,
+                    max_pages: Optional[int] = None) -> List[Tuple[dict, List[dict]]]:
+        """Fetches open issues and their comments with configured backend."""
+        with self.metrics.phase("crawl"):
+            if self.backend == "graphql":
+                return crawl_open_issues(self._post, self.urls.get_graphql_url(),
+                                         account, repo, max_pages=max_pages)
+            return self._crawl(account, repo, self._issues_url(account, repo),
+                               max_pages=max_pages)
 
     def get_open_issues(self, account: str,
                         repo: str,
                         max_pages: Optional[int] = None) -> List[IssueMeta]:
-        """Gets open issues from GitHub api."""
-        page = 1
-        max_counter = max_pages if max_pages is not None else 100
-
-        repo_issues = []
-        while max_counter > 0:
-            max_counter -= 1
-
-            issues_response = requests.get(self.urls.get_issues_url(account=account,
-                                                                    repo=repo,
-                                                                    page=page),
-                                           headers=self.headers)
-            if issues_response.ok:
-                fetched_repo_issues = json.loads(issues_response.text)
-                if len(fetched_repo_issues) == 0:
-                    break
-
-                for issue in fetched_repo_issues:
-                    assignee = issue.get("assignee")
-                    if assignee is not None:
-                        assignee = assignee.get("login")
-                    number = issue.get("number")
-                    comments = self._get_comments(account, repo, number)
-
-                    meta = IssueMeta(title=issue.get("title"),
-                                     number=number,
-                                     state=issue.get("state"),
-                                     assignee=assignee,
-                                     author_association=issue.get("author_association"),
-                                     comments=comments,
-                                     created_at=datetime.fromisoformat(
-                                         issue.get("created_at")[:-1]),
-                                     updated_at=datetime.fromisoformat(
-                                         issue.get("updated_at")[:-1]),
-                                     user=issue.get("user", {}).get("login"),
-                                     pull_request=issue.get("pull_request", {}).get("url"))
-                    repo_issues.append(meta)
-                page += 1
-            else:
-                break
+        """Gets open issues from GitHub api.
+
+        Order of returned issues matches order of GitHub api.
+        GraphQL backend fetches only last 100 comments of each issue.
+
+        Raises:
+            requests.HTTPError: if page of issues can not be fetched after retries
+        """
+        fetched = self._crawl_open(account, repo, max_pages=max_pages)
+        if len(fetched) == 0:
+            logger.warning("No open issues fetched for %s/%s", account, repo)
+        return self._parse_issues(fetched)
+
+    def iter_open_issues(self, account: str,
+                         repo: str,
+                         max_pages: Optional[int] = None) -> Iterator[IssueMeta]:
+        """Yields open issues from GitHub api page by page.
+
+        Unlike ``get_open_issues`` only payloads of at most two pages of issues
+        and their comments are held at a time, so memory does not grow with
+        number of issues unless consumer keeps them. GraphQL backend fetches
+        all issues before yielding them.
 
-        # TODO: warning if empty results  # pylint: disable=fixme
-        return repo_issues
+        Raises:
+            requests.HTTPError: if page of issues can not be fetched after retries
+        """
+        if self.backend == "graphql":
+            yield from self.get_open_issues(account, repo, max_pages=max_pages)
+            return
+        for issue, comments in self._iter_crawl(account, repo, self._issues_url(account, repo),
+                                                max_pages=max_pages):
+            yield self._parse_issue(issue, [self._parse_comment(c) for c in comments])
 
-    def render_report(self, repos_urls: [List[str]]) -> str:
-        """Renders report."""
+    def _parse_issues(self, fetched: List[Tuple[dict, List[dict]]]) -> List[IssueMeta]:
+        """Converts pairs of issue and its comments payloads to issues meta."""
+        with self.metrics.phase("entities"):
+            return [self._parse_issue(issue, [self._parse_comment(c) for c in comments])
+                    for issue, comments in fetched]
+
+    def sync_open_issues(self, account: str,
+                         repo: str,
+                         folder: Optional[str] = None,
+                         max_pages: Optional[int] = None,
+                         state: Optional[RepoState] = None) -> List[IssueMeta]:
+        """Gets open issues incrementally, see ``sync_state``.
+
+        Returns:
+            open issues, most recently created first
+        """
+        return self.parse_state(self.sync_state(account, repo, folder=folder,
+                                                max_pages=max_pages, state=state))
+
+    def sync_state(self, account: str,
+                   repo: str,
+                   folder: Optional[str] = None,
+                   max_pages: Optional[int] = None,
+                   state: Optional[RepoState] = None) -> RepoState:
+        """Syncs state of repository with issues updated since previous sync.
+
+        Only issues updated since last sync and their comments are fetched,
+        closed ones are removed from state. First sync fetches all open issues.
+
+        Args:
+            account: GitHub account
+            repo: name of repo
+            folder: folder of stored states
+            max_pages: max number of pages to fetch
+            state: state kept in memory since previous sync, updated in place.
+                Loaded from folder by default.
+
+        Returns:
+            synced state
+        """
+        state = state if state is not None else RepoState.load(account, repo, folder)
+        synced_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+        if state.synced_at is None:
+            fetched = self._crawl_open(account, repo, max_pages=max_pages)
+        else:
+            with self.metrics.phase("crawl"):
+                fetched = self._crawl(account, repo,
+                                      lambda page: self.urls.get_updated_issues_url(
+                                          account=account, repo=repo,
+                                          since=state.synced_at, page=page),
+                                      max_pages=max_pages)
+        state.merge(fetched, synced_at=synced_at)
+        state.save(folder)
+        return state
+
+    def parse_state(self, state: RepoState,
+                    numbers: Optional[Set[str]] = None) -> List[IssueMeta]:
+        """Converts issues and comments stored in state of repository to issues meta.
+
+        Args:
+            state: state of repository
+            numbers: numbers of issues to convert, all by default
+        """
+        return self._parse_issues(state.items(numbers))
+
+    def get_account_open_issues(self, account: str,
+                                repos: Optional[List[str]] = None) -> List[RepoMeta]:
+        """Gets open issues of all repositories of account or organization with search api.
+
+        Open items of all repositories are searched in bulk, so repositories
+        with few issues cost no separate listing requests, and new
+        repositories are found without listing them. If repositories are
+        specified, only they are searched.
+
+        Args:
+            account: GitHub account or organization
+            repos: names of repositories to keep, all by default
+
+        Returns:
+            repositories with open issues, in order of their newest issue
+        """
+        search = AccountSearch(self._get, self.urls.get_search_issues_url,
+                               limit=self.SEARCH_LIMIT, start=self.SEARCH_START,
+                               interval=self.SEARCH_INTERVAL)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            with self.metrics.phase("crawl"):
+                grouped: Dict[Tuple[str, str], List[Tuple[dict, Future]]] = {}
+                for item in search.open_items(account, repos=repos):
+                    repo_account, name = item["repository_url"].split("/")[-2:]
+                    if repos is not None and name not in repos:
+                        continue
+                    comments = self._submit_comments(executor, repo_account, name, item)
+                    grouped.setdefault((repo_account, name), []).append((item, comments))
+                fetched = {key: [(item, comments.result()) for item, comments in pending]
+                           for key, pending in grouped.items()}
+
+        return [RepoMeta(account=repo_account, name=name, issues=self._parse_issues(items))
+                for (repo_account, name), items in fetched.items()]
+
+    @staticmethod
+    def _parse_comment(comment: dict) -> IssueCommentMeta:
+        """Converts GitHub api comment payload to comment meta."""
+        return IssueCommentMeta(user=comment.get("user", {}).get("login"),
+                                author_association=comment.get("author_association"),
+                                user_type=comment.get("user", {}).get("type"),
+                                created_at=datetime.fromisoformat(
+                                    comment.get("created_at")[:-1]),
+                                updated_at=datetime.fromisoformat(
+                                    comment.get("updated_at")[:-1]))
+
+    @staticmethod
+    def _parse_issue(issue: dict, comments: List[IssueCommentMeta]) -> IssueMeta:
+        """Converts GitHub api issue payload to issue meta."""
+        assignee = issue.get("assignee")
+        if assignee is not None:
+            assignee = assignee.get("login")
+
+        return IssueMeta(title=issue.get("title"),
+                         number=issue.get("number"),
+                         state=issue.get("state"),
+                         assignee=assignee,
+                         author_association=issue.get("author_association"),
+                         comments=comments,
+                         created_at=datetime.fromisoformat(
+                             issue.get("created_at")[:-1]),
+                         updated_at=datetime.fromisoformat(
+                             issue.get("updated_at")[:-1]),
+                         user=issue.get("user", {}).get("login"),
+                         pull_request=issue.get("pull_request", {}).get("url"),
+                         labels=[label.get("name") if isinstance(label, dict) else label
+                                 for label in issue.get("labels") or []],
+                         n_comments=issue.get("comments") if isinstance(issue.get("comments"), int)
+                         else None)
+
+    def _build_report(self, repos_urls: [List[str]],
+                      incremental: bool = False,
+                      columnar: bool = False) -> FullReport:
+        """Fetches issues of repositories, saves snapshots and builds full report.
+
+        Args:
+            repos_urls: urls of repositories
+            incremental: fetch only issues updated since previous run
+            columnar: compute report on columnar issues tables, requires numpy
+        """
         repos = []
+        diffs = {}
         for url in repos_urls:
             parts = url.split("/")
             account, name = parts[-2], parts[-1]
-            repo = RepoMeta(account=account,
-                            name=name,
-                            issues=self.get_open_issues(account=account,
-                                                        repo=name))
-            save_open_issues_to_json(repo)
+            if self.pipeline and not incremental:
+                repo, diff = self._stream_repo(account, name)
+            else:
+                issues = self.sync_open_issues(account=account, repo=name) if incremental \
+                    else self.get_open_issues(account=account, repo=name)
+                repo = RepoMeta(account=account,
+                                name=name,
+                                issues=issues)
+                diff = self._save_snapshot(repo)
+            if diff is not None:
+                diffs[name] = diff
             repos.append(repo)
 
-        report = FullReport(repos)
+        return FullReport(repos, columnar=columnar, diffs=diffs, metrics=self.metrics,
+                          processes=self.report_processes,
+                          store=self._report_store(streamed=self.pipeline and not incremental))
+
+    def _report_store(self, streamed: bool = False) -> Optional[IssueStore]:
+        """Issue store to answer sections of reports of fetched repositories from, if any.
+
+        Args:
+            streamed: repositories were streamed by ``_stream_repo``
+        """
+        if streamed:
+            return self._pipeline_store()
+        return self.snapshots if isinstance(self.snapshots, IssueStore) else None
+
+    def _previous_snapshot(self, name: str) -> Tuple[Optional[datetime], Iterable[dict]]:
+        """Latest snapshot of repository to diff with.
+
+        Database has latest snapshot indexed, so only summaries of its
+        issues are read, otherwise whole snapshot is loaded.
+
+        Returns:
+            date and issues records or summaries of snapshot, ``(None, [])`` if there is none
+        """
+        if isinstance(self.snapshots, IssueStore):
+            dates = self.snapshots.dates(name)
+            return (dates[-1], self.snapshots.summaries(name, as_of=dates[-1])) \
+                if dates else (None, [])
+        return load_latest_snapshot(name, store=self.snapshots)
+
+    def _save_snapshot(self, repo: RepoMeta) -> Optional[SnapshotDiff]:
+        """Saves snapshot of fetched repository.
+
+        Returns:
+            changes since previous snapshot, ``None`` if there is no previous snapshot
+        """
+        logger.info("Fetched %d open issues of %s/%s", len(repo.issues), repo.account, repo.name)
+        with self.metrics.phase("snapshots"):
+            diff = None
+            previous_date, previous = self._previous_snapshot(repo.name)
+            if previous_date is not None:
+                diff = SnapshotDiff(previous, [i.to_dict() for i in repo.issues],
+                                    stale_days=RepoReport.OLD_UPDATED_ISSUE_DAYS,
+                                    previous_date=previous_date.strftime("%Y-%m-%d"))
+
+            if self.snapshots is not None:
+                save_open_issues_to_store(repo, self.snapshots)
+            else:
+                save_open_issues_to_json(repo)
+        return diff
+
+    def _stream_repo(self, account: str, name: str) -> Tuple[RepoMeta, Optional[SnapshotDiff]]:
+        """Streams open issues of repository into snapshot, diff and report store.
+
+        Every issue is written to snapshot, compared with previous snapshot and
+        written to issue store report is answered from as soon as its page is
+        fetched, so no issues are kept in memory. Issue store is database if it
+        is configured, otherwise temporary database of monitor. Diff keeps only
+        summaries of issues, read from database without loading previous snapshot.
+
+        Returns:
+            repository without issues and changes since previous snapshot,
+            ``None`` if there is no previous snapshot
+        """
+        with self.metrics.phase("pipeline"):
+            diff = None
+            previous_date, previous = self._previous_snapshot(name)
+            if previous_date is not None:
+                diff = SnapshotDiff(previous, stale_days=RepoReport.OLD_UPDATED_ISSUE_DAYS,
+                                    previous_date=previous_date.strftime("%Y-%m-%d"))
+            del previous
+
+            store = self._pipeline_store()
+            n_issues = 0
+            with ExitStack() as stack:
+                writers = [stack.enter_context(store.writer(name,
+                                                            history=store is self.snapshots))]
+                if self.snapshots is None:
+                    writers.append(stack.enter_context(SnapshotWriter(json_snapshot_path(name))))
+                elif isinstance(self.snapshots, SnapshotStore):
+                    writers.append(stack.enter_context(self.snapshots.writer(name)))
+                for issue in self.iter_open_issues(account, name):
+                    record = issue.to_dict()
+                    if diff is not None:
+                        diff.add(record)
+                    for writer in writers:
+                        writer.write(record)
+                    n_issues += 1
+        logger.info("Fetched %d open issues of %s/%s", n_issues, account, name)
+        return RepoMeta(account=account, name=name, issues=[]), diff
+
+    def _pipeline_store(self) -> IssueStore:
+        """Issue store streamed issues are written to, database if it is configured."""
+        if isinstance(self.snapshots, IssueStore):
+            return self.snapshots
+        if self._spool is None:
+            self._spool_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+            self._spool = IssueStore(os.path.join(self._spool_dir.name, "pipeline.db"))
+        return self._spool
+
+    def _build_account_report(self, account: str,
+                              repos: Optional[List[str]] = None,
+                              columnar: bool = False) -> FullReport:
+        """Searches open issues of account, saves snapshots and builds full report.
+
+        Args:
+            account: GitHub account or organization
+            repos: names of repositories to keep, all by default
+            columnar: compute report on columnar issues tables, requires numpy
+        """
+        repos_meta = self.get_account_open_issues(account, repos=repos)
+        diffs = {}
+        for repo in repos_meta:
+            diff = self._save_snapshot(repo)
+            if diff is not None:
+                diffs[repo.name] = diff
+        return FullReport(repos_meta, columnar=columnar, diffs=diffs, metrics=self.metrics,
+                          processes=self.report_processes, store=self._report_store())
+
+    def render_account_report(self, account: str,
+                              repos: Optional[List[str]] = None,
+                              columnar: bool = False) -> str:
+        """Renders report of all repositories of account with open issues.
+
+        Args:
+            account: GitHub account or organization
+            repos: names of repositories to keep, all by default
+            columnar: compute report on columnar issues tables, requires numpy
+        """
+        return self._build_account_report(account, repos=repos, columnar=columnar).render_report()
+
+    def render_report(self, repos_urls: [List[str]],
+                      incremental: bool = False,
+                      columnar: bool = False) -> str:
+        """Renders report.
+
+        Args:
+            repos_urls: urls of repositories
+            incremental: fetch only issues updated since previous run
+            columnar: compute report on columnar issues tables, requires numpy
+        """
+        report = self._build_report(repos_urls, incremental=incremental, columnar=columnar)
         return report.render_report()
 
+    def _build_report_from_snapshots(self, repos_urls: [List[str]],
+                                     resources: Optional[str] = None,
+                                     columnar: bool = False) -> FullReport:
+        """Builds full report from latest snapshots of repositories without fetching issues.
+
+        Args:
+            repos_urls: urls of repositories
+            resources: folder of json snapshots, used if snapshot store is not configured
+            columnar: compute report on columnar issues tables, requires numpy
+        """
+        repos = []
+        dates = []
+        for url in repos_urls:
+            parts = url.split("/")
+            account, name = parts[-2], parts[-1]
+            taken_at, records = load_latest_snapshot(name, folder=resources,
+                                                     store=self.snapshots)
+            if taken_at is None:
+                raise ValueError("There is no snapshot of {}".format(name))
+            dates.append(taken_at)
+            repos.append(RepoMeta(account=account, name=name,
+                                  issues=records_to_issues(records, as_of=taken_at)))
+        return FullReport(repos, as_of=max(dates) if dates else None, columnar=columnar,
+                          metrics=self.metrics, processes=self.report_processes)
+
+    def render_report_from_snapshots(self, repos_urls: [List[str]],
+                                     resources: Optional[str] = None,
+                                     columnar: bool = False) -> str:
+        """Renders report from latest snapshots of repositories.
+
+        Snapshots are read from snapshot store if it is configured,
+        otherwise from json snapshots in resources folder. Days are counted
+        till date of latest snapshot.
+
+        Args:
+            repos_urls: urls of repositories
+            resources: folder of json snapshots, ./resources by default
+            columnar: compute report on columnar issues tables, requires numpy
+        """
+        report = self._build_report_from_snapshots(repos_urls, resources=resources,
+                                                   columnar=columnar)
+        return report.render_report()
+
+    def import_snapshots(self, folder: Optional[str] = None) -> Dict[str, int]:
+        """Imports json snapshots from folder into snapshot store.
+
+        Args:
+            folder: folder of json snapshots, ./resources by default
+
+        Returns:
+            number of imported snapshots per repository
+        """
+        store = self.snapshots if self.snapshots is not None else SnapshotStore()
+        return import_json_snapshots(store, folder)
+
     def generate_reports_to_folder(self, repos_urls: [List[str]],
-                                   folder: Optional[str] = None):
+                                   folder: Optional[str] = None,
+                                   incremental: bool = False,
+                                   columnar: bool = False):
         """Generate report and save it to specified folder."""
+        report = self._build_report(repos_urls, incremental=incremental, columnar=columnar)
+        self._write_report_to_folder(report, folder)
+
+    def generate_account_report_to_folder(self, account: str,
+                                          folder: Optional[str] = None,
+                                          repos: Optional[List[str]] = None,
+                                          columnar: bool = False):
+        """Generate report of all repositories of account and save it to specified folder."""
+        report = self._build_account_report(account, repos=repos, columnar=columnar)
+        self._write_report_to_folder(report, folder)
+
+    def _write_report_to_folder(self, report: FullReport, folder: Optional[str] = None):
+        """Writes report and metrics of run to folder."""
         folder = folder if folder is not None else "reports/reports/issues"
         if not os.path.exists(folder):
             os.makedirs(folder)
-        rendered_report = self.render_report(repos_urls=repos_urls)
-        report_name = "Report-{}.md".format(datetime.now().strftime("%m-%d-%Y_%H_%M"))
+        report_name = "Report-{}".format(datetime.now().strftime("%m-%d-%Y_%H_%M"))
+        with open("./{}/{}.md".format(folder, report_name), "w") as file:
+            report.write_report(file)
+        self.metrics.write(folder, report_name)
+
+    def generate_reports_from_snapshots_to_folder(self, repos_urls: [List[str]],
+                                                  folder: Optional[str] = None,
+                                                  resources: Optional[str] = None,
+                                                  columnar: bool = False):
+        """Generate report from latest snapshots and save it to specified folder."""
+        report = self._build_report_from_snapshots(repos_urls, resources=resources,
+                                                   columnar=columnar)
+        self._write_report_to_folder(report, folder)
+
+    # pylint: disable=too-many-arguments
+    def serve(self, repos_urls: [List[str]],
+              host: str = "127.0.0.1",
+              port: int = 8000,
+              interval: float = 900.0,
+              intervals: Optional[Dict[str, float]] = None,
+              folder: Optional[str] = None,
+              columnar: bool = False,
+              webhook_secret: Optional[str] = None):
+        """Keeps issues of repositories in memory and serves their reports over http.
+
+        Repositories are refreshed incrementally on schedule and reports are
+        served from memory at ``/report.md``, ``/report.json``,
+        ``/repos/<name>.md`` and ``/repos/<name>.json`` until interrupted.
+        With webhook secret, ``issues`` and ``issue_comment`` events posted
+        to ``/webhook`` are applied to repositories as they happen.
+
+        Args:
+            repos_urls: urls of repositories
+            host: host to serve reports on
+            port: port to serve reports on
+            interval: seconds between refreshes of repository
+            intervals: seconds between refreshes per repository name
+            folder: folder of stored states of incremental sync
+            columnar: compute reports on columnar issues tables, requires numpy
+            webhook_secret: secret of GitHub webhook of repositories
+        """
+        MonitorDaemon(self, repos_urls, interval=interval, intervals=intervals,
+                      host=host, port=port, state_dir=folder, columnar=columnar,
+                      secret=webhook_secret).run()
+
+    def render_trends_report(self, repos_names: Optional[List[str]] = None,
+                             resources: Optional[str] = None,
+                             max_workers: Optional[int] = None) -> str:
+        """Renders trends report from history of snapshots.
+
+        Snapshots are read from snapshot store if it is configured,
+        otherwise from json snapshots in resources folder.
+
+        Args:
+            repos_names: names of repositories, all with snapshots by default
+            resources: folder of json snapshots, ./resources by default
+            max_workers: number of processes parsing json snapshots
+        """
+        if repos_names is None:
+            repos_names = self.snapshots.names() if self.snapshots is not None \
+                else sorted(json_snapshots(resources))
+        trends = {name: collect_trends(name, folder=resources, store=self.snapshots,
+                                       max_workers=max_workers)
+                  for name in repos_names}
+        return TrendsReport(trends).render_report()
+
+    def generate_trends_report_to_folder(self, repos_names: Optional[List[str]] = None,
+                                         folder: Optional[str] = None,
+                                         resources: Optional[str] = None,
+                                         max_workers: Optional[int] = None):
+        """Generate trends report and save it to specified folder."""
+        folder = folder if folder is not None else "reports/reports/trends"
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+        rendered_report = self.render_trends_report(repos_names=repos_names,
+                                                    resources=resources,
+                                                    max_workers=max_workers)
+        report_name = "Trends-{}.md".format(datetime.now().strftime("%m-%d-%Y_%H_%M"))
         with open("./{}/{}".format(folder, report_name), "w") as file:
             file.write(rendered_report)
@@ -1,11 +1,25 @@
 """Report class."""
-from collections import Counter
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
 
-from jinja2 import Environment, PackageLoader, select_autoescape
+from jinja2 import Environment, FileSystemBytecodeCache, PackageLoader, select_autoescape
 
-from monitor.entities import RepoMeta, IssueMeta
+from monitor.diff import SnapshotDiff
+from monitor.entities import GitHubAuthorAssociations, RepoMeta, IssueMeta
+from monitor.metrics import Metrics
+from monitor.storage import IssueStore
+from monitor.table import IssueTable
+from monitor.trends import AGE_BUCKETS
+
+# Shared by all reports, so each template is loaded and compiled once per process.
+# Compiled templates are also cached on disk between runs.
+ENVIRONMENT: Environment = Environment(
+    loader=PackageLoader("monitor"),
+    autoescape=select_autoescape(),
+    bytecode_cache=FileSystemBytecodeCache()
+)
 
 
 class RepoReport:
@@ -13,105 +27,365 @@ class RepoReport:
 
     OLD_ISSUE_DAYS: int = 365 * 3
     OLD_UPDATED_ISSUE_DAYS: int = 14
+    SECTIONS: List[str] = ["n_open_issues", "n_issues_by_members", "n_issues_by_users",
+                           "top_authors", "top_author_associations", "old_updated_issues",
+                           "issues_with_community_association",
+                           "days_since_last_comment_by_member",
+                           "open_issues_sorted_by_update_date",
+                           "issues_by_label", "issues_by_assignee",
+                           "unassigned_community_issues"]
+    ISSUES_SECTIONS: List[str] = ["old_updated_issues", "issues_with_community_association",
+                                  "days_since_last_comment_by_member",
+                                  "open_issues_sorted_by_update_date",
+                                  "unassigned_community_issues"]
 
-    def __init__(self, repo: RepoMeta):
+    # pylint: disable=too-many-arguments
+    def __init__(self, repo: RepoMeta,
+                 as_of: Optional[datetime] = None,
+                 columnar: bool = False,
+                 diff: Optional[SnapshotDiff] = None,
+                 metrics: Optional[Metrics] = None,
+                 store: Optional[IssueStore] = None):
         """Repo report class.
 
         Args:
             repo: repository meta info
+            as_of: reference time for all ``days_since_*`` values of issues
+            columnar: compute report sections on columnar issues table,
+                requires numpy
+            diff: changes since previous snapshot, rendered as delta section
+            metrics: collector of sections evaluation and rendering timings,
+                new one by default
+            store: issue store with latest snapshot of repository, if specified
+                sections are answered by its indexed queries instead of issues
+                of repo, and issues of sections are read from it while rendered
         """
         self.repo = repo
-        env = Environment(
-            loader=PackageLoader("monitor"),
-            autoescape=select_autoescape()
-        )
-        self.template = env.get_template("repo_report.md")
+        self.diff = diff
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.store = store
+        self.as_of = as_of
+        if as_of is not None:
+            for issue in self.repo.issues:
+                issue.as_of = as_of
+        self.table = IssueTable(repo.issues) if columnar and store is None else None
+        self.template = ENVIRONMENT.get_template("repo_report.md")
+
+    @staticmethod
+    def _stored_issues(pairs: Iterator[Tuple[str, IssueMeta]]) -> Iterator[IssueMeta]:
+        """Issues of pairs of repository name and issue queried from store."""
+        return (issue for _, issue in pairs)
 
     @property
     def n_open_issues(self) -> int:
         """Number of open issues."""
+        if self.store is not None:
+            return self.store.n_open_issues(self.repo.name)
         return len(self.repo.issues)
 
     @property
     def n_issues_by_members(self) -> int:
         """Number of open issues created my members."""
-        return len([i for i in self.repo.issues
-                    if i.author_association in ["MEMBER", "COLLABORATOR"]])
+        if self.store is not None:
+            return self.store.n_issues_by_members(self.repo.name)
+        if self.table is not None:
+            return int(self.table.has_flags(IssueTable.AUTHORED_BY_MEMBER).sum())
+        counts = self.repo.counts("author_association")
+        return sum(counts.get(association, 0)
+                   for association in GitHubAuthorAssociations.members_associations())
 
     @property
     def n_issues_by_users(self) -> int:
         """Number of issues create by users."""
-        return len([i for i in self.repo.issues
-                    if i.author_association not in ["MEMBER", "COLLABORATOR"]])
+        if self.store is not None:
+            return self.store.n_issues_by_users(self.repo.name)
+        if self.table is not None:
+            return int((~self.table.has_flags(IssueTable.AUTHORED_BY_MEMBER)).sum())
+        return self.n_open_issues - self.n_issues_by_members
 
     @property
     def top_authors(self) -> List[Tuple[str, int]]:
         """Returns top 5 authors of issues."""
-        res = []
-        for author, count in dict(Counter(issue.user for issue in self.repo.issues)).items():
-            res.append((author, count))
-        return sorted(res, key=lambda pair: -pair[1])[:5]
+        if self.store is not None:
+            return self.store.top_authors(self.repo.name)
+        if self.table is not None:
+            res = self.table.counts(self.table.user_codes, self.table.users)
+            return sorted(res, key=lambda pair: -pair[1])[:5]
+        return sorted(self.repo.counts("author").items(), key=lambda pair: -pair[1])[:5]
 
     @property
     def top_author_associations(self) -> Dict[str, int]:
         """Returns top authors associations and number of issues."""
-        return dict(Counter(issue.author_association for issue in self.repo.issues))
+        if self.store is not None:
+            return self.store.top_author_associations(self.repo.name)
+        if self.table is not None:
+            return dict(self.table.counts(self.table.association_codes,
+                                          self.table.associations))
+        return self.repo.counts("author_association")
 
     @property
-    def old_updated_issues(self) -> List[IssueMeta]:
+    def old_updated_issues(self) -> Iterable[IssueMeta]:
         """Get issues not updated for a long time."""
+        if self.store is not None:
+            return self._stored_issues(self.store.old_updated_issues(
+                self.repo.name, as_of=self.as_of, days=self.OLD_ISSUE_DAYS))
+        if self.table is not None:
+            days = self.table.days_since_last_update
+            return self.table.select(days > self.OLD_ISSUE_DAYS, descending=days)
         return sorted([i for i in self.repo.issues
                        if i.days_since_last_update > self.OLD_ISSUE_DAYS],
                       key=lambda i: -i.days_since_last_update)
 
     @property
-    def issues_with_community_association(self) -> List[IssueMeta]:
+    def issues_with_community_association(self) -> Iterable[IssueMeta]:
         """Issues that was associated with community contributor
         a.k.a last commented by community or created by community.
         """
+        if self.store is not None:
+            return self._stored_issues(self.store.issues_with_community_association(
+                self.repo.name, as_of=self.as_of))
+        if self.table is not None:
+            return self.table.select(self.table.community_mask,
+                                     descending=self.table.days_since_last_update)
         issues = [i for i in self.repo.issues
                   if i.is_authored_by_or_last_commented_by_community]
         return sorted(issues, key=lambda i: -i.days_since_last_update)
 
     @property
-    def days_since_last_comment_by_member(self) -> list[IssueMeta]:
+    def days_since_last_comment_by_member(self) -> Iterable[IssueMeta]:
         """Issues sorted by last update by member."""
+        if self.store is not None:
+            return self._stored_issues(self.store.days_since_last_comment_by_member(
+                self.repo.name, as_of=self.as_of))
+        if self.table is not None:
+            days = self.table.days_since_last_member_comment
+            return self.table.select(IssueTable.nonzero_mask(days), descending=days)
         return sorted([i for i in self.repo.issues if i.days_since_last_member_comment],
                       key=lambda i: -i.days_since_last_member_comment)
 
     @property
-    def open_issues_sorted_by_update_date(self) -> List[IssueMeta]:
+    def open_issues_sorted_by_update_date(self) -> Iterable[IssueMeta]:
         """Open issues sorted by update date."""
+        if self.store is not None:
+            return self._stored_issues(self.store.open_issues_sorted_by_update_date(
+                self.repo.name, as_of=self.as_of))
+        if self.table is not None:
+            return self.table.select(descending=self.table.days_since_last_update)
         return sorted(self.repo.issues, key=lambda i: -i.days_since_last_update)
 
+    @property
+    def issues_by_label(self) -> Dict[str, int]:
+        """Number of open issues per label, most frequent first."""
+        if self.store is not None:
+            return self.store.issues_by_label(self.repo.name)
+        return dict(sorted(self.repo.counts("label").items(), key=lambda pair: -pair[1]))
+
+    @property
+    def issues_by_assignee(self) -> Dict[Optional[str], int]:
+        """Number of open issues per assignee, unassigned ones under ``None``."""
+        if self.store is not None:
+            return self.store.issues_by_assignee(self.repo.name)
+        return dict(sorted(self.repo.counts("assignee").items(), key=lambda pair: -pair[1]))
+
+    def stale_issues(self, **criteria) -> List[IssueMeta]:
+        """Issues matching criteria of ``RepoMeta.select`` not updated
+        for ``OLD_UPDATED_ISSUE_DAYS``, selected from repo indexes.
+
+        Examples:
+            report.stale_issues(label="bug", assignee=None)
+        """
+        return sorted([i for i in self.repo.select(**criteria)
+                       if i.days_since_last_update > self.OLD_UPDATED_ISSUE_DAYS],
+                      key=lambda i: -i.days_since_last_update)
+
+    @property
+    def unassigned_community_issues(self) -> Iterable[IssueMeta]:
+        """Unassigned issues authored by community not updated for two weeks."""
+        if self.store is not None:
+            return self._stored_issues(self.store.unassigned_community_issues(
+                self.repo.name, as_of=self.as_of, days=self.OLD_UPDATED_ISSUE_DAYS))
+        members = GitHubAuthorAssociations.members_associations()
+        community = [association for association in self.repo.indexes["author_association"]
+                     if association not in members]
+        return self.stale_issues(assignee=None, author_association=community)
+
+    def sections(self) -> Dict[str, object]:
+        """Evaluates all report sections once."""
+        with self.metrics.phase("report_sections"):
+            sections = {name: getattr(self, name) for name in self.SECTIONS}
+        sections.update(repo=self.repo, diff=self.diff)
+        return sections
+
+    def to_dict(self) -> dict:
+        """Converts report sections to dict, issues are converted without comments."""
+        sections = self.sections()
+        result = {"account": self.repo.account,
+                  "name": self.repo.name,
+                  "diff": self.diff.to_dict() if self.diff is not None else None}
+        for name in self.SECTIONS:
+            value = sections[name]
+            if name in self.ISSUES_SECTIONS:
+                value = [{key: field for key, field in issue.to_dict().items()
+                          if key != "comments"} for issue in value]
+            result[name] = value
+        return result
+
+    def generate_report(self) -> Iterator[str]:
+        """Generates markdown report for repo in chunks.
+
+        Sections are evaluated before rendering, so time of evaluating
+        sections and of rendering template are measured separately.
+        """
+        start = time.perf_counter()
+        chunks = self.template.generate(report=self.sections())
+        seconds = 0.0
+        for chunk in chunks:
+            seconds += time.perf_counter() - start
+            yield chunk
+            start = time.perf_counter()
+        self.metrics.record_phase("render", seconds + time.perf_counter() - start)
+
     def render_report(self) -> str:
         """Renders markdown report for repo."""
-        return self.template.render(report=self)
+        return "".join(self.generate_report())
+
+
+def _render_repo_report(repo: RepoMeta,
+                        as_of: datetime,
+                        columnar: bool,
+                        diff: Optional[SnapshotDiff],
+                        store_path: Optional[str] = None
+                        ) -> Tuple[str, Dict[str, Dict[str, float]]]:
+    """Renders repo report in worker process.
+
+    Args:
+        repo: repository meta info
+        as_of: reference time for report
+        columnar: compute report on columnar issues table
+        diff: changes since previous snapshot
+        store_path: path of issue store to answer sections from, opened in worker
+
+    Returns:
+        markdown report of repo and timings of its phases
+    """
+    metrics = Metrics()
+    store = IssueStore(store_path) if store_path is not None else None
+    try:
+        report = RepoReport(repo, as_of=as_of, columnar=columnar, diff=diff, metrics=metrics,
+                            store=store)
+        return report.render_report(), metrics.phases
+    finally:
+        if store is not None:
+            store.close()
 
 
 class FullReport:
     """Full report class."""
 
     def __init__(self,
-                 repos: List[RepoMeta]):
-        """"""
+                 repos: List[RepoMeta],
+                 as_of: Optional[datetime] = None,
+                 columnar: bool = False,
+                 diffs: Optional[Dict[str, SnapshotDiff]] = None,
+                 metrics: Optional[Metrics] = None,
+                 processes: Optional[int] = None,
+                 store: Optional[IssueStore] = None):
+        """Full report class.
+
+        Args:
+            repos: repositories meta info
+            as_of: reference time for report, now by default
+            columnar: compute repo reports on columnar issues tables, requires numpy
+            diffs: changes since previous snapshot per repository name
+            metrics: collector of sections evaluation and rendering timings,
+                new one by default
+            processes: number of processes rendering repo reports in parallel,
+                0 for number of CPUs. Repo reports are rendered one by one
+                in this process if not specified
+            store: issue store with latest snapshots of repositories to answer
+                sections of repo reports from
+        """
         self.repos = repos
-        env = Environment(
-            loader=PackageLoader("monitor"),
-            autoescape=select_autoescape()
-        )
-        self.template = env.get_template("full_report.md")
+        self.diffs = diffs if diffs is not None else {}
+        self.as_of = as_of if as_of is not None else datetime.now()
+        self.columnar = columnar
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.processes = processes
+        self.store = store
+        self.template = ENVIRONMENT.get_template("full_report.md")
 
     def __str__(self):
         return "Full report({repos})".format(repos=self.repos[:3])
 
+    def _repo_reports(self) -> Iterator[Tuple[RepoMeta, Iterator[str]]]:
+        """Yields repositories and chunks of their reports, one repository at a time."""
+        if self.processes is not None:
+            yield from self._parallel_repo_reports()
+            return
+        for repo in self.repos:
+            repo_report = RepoReport(repo, as_of=self.as_of, columnar=self.columnar,
+                                     diff=self.diffs.get(repo.name), metrics=self.metrics,
+                                     store=self.store)
+            yield repo, repo_report.generate_report()
+
+    def _parallel_repo_reports(self) -> Iterator[Tuple[RepoMeta, List[str]]]:
+        """Yields repositories and their reports rendered in process pool.
+
+        Reports are yielded in order of repositories as soon as
+        all preceding ones are rendered. Timings of worker processes
+        are added to metrics of report.
+        """
+        with ProcessPoolExecutor(max_workers=self.processes or None) as executor:
+            rendered = executor.map(_render_repo_report,
+                                    self.repos,
+                                    [self.as_of] * len(self.repos),
+                                    [self.columnar] * len(self.repos),
+                                    [self.diffs.get(repo.name) for repo in self.repos],
+                                    [self.store.path if self.store is not None else None]
+                                    * len(self.repos))
+            for repo, (report, phases) in zip(self.repos, rendered):
+                self.metrics.merge_phases(phases)
+                yield repo, [report]
+
+    def generate_report(self) -> Iterator[str]:
+        """Generates full report in chunks.
+
+        Sections of repositories are rendered lazily,
+        so whole report is never held in memory.
+        """
+        return self.template.generate(repos=self._repo_reports(),
+                                      date=self.as_of.strftime("%m-%d-%Y"))
+
+    def write_report(self, file: TextIO):
+        """Writes full report to file chunk by chunk."""
+        for chunk in self.generate_report():
+            file.write(chunk)
+
     def render_report(self) -> str:
         """Renders full report."""
-        repos = []
+        return "".join(self.generate_report())
 
-        for repo in self.repos:
-            repo_reports = RepoReport(repo)
-            repos.append((repo, repo_reports.render_report()))
 
-        return self.template.render(repos=repos,
-                                    date=datetime.now().strftime("%m-%d-%Y"))
+class TrendsReport:
+    """Trends report of repositories snapshots history."""
+
+    def __init__(self, trends: Dict[str, List[dict]],
+                 as_of: Optional[datetime] = None):
+        """Trends report class.
+
+        Args:
+            trends: summaries of snapshots in chronological order per repository
+            as_of: date of report, now by default
+        """
+        self.trends = trends
+        self.as_of = as_of if as_of is not None else datetime.now()
+        self.template = ENVIRONMENT.get_template("trends_report.md")
+
+    @property
+    def age_labels(self) -> List[str]:
+        """Labels of age buckets."""
+        return [label for _, label in AGE_BUCKETS]
+
+    def render_report(self) -> str:
+        """Renders markdown trends report."""
+        return self.template.render(report=self, date=self.as_of.strftime("%m-%d-%Y"))
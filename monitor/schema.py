@@ -0,0 +1,120 @@
+"""Versioned schema of json snapshots of open issues.
+
+Version 1 snapshots are plain lists of issues records without dates and
+comments. Version 2 snapshots wrap records, which round-trip through
+``IssueMeta.to_dict`` and ``IssueMeta.from_dict``, into
+``{"schema_version": 2, "issues": [...]}``.
+"""
+import json
+import os
+from datetime import datetime
+from typing import Any, List, Optional, Tuple, Union
+
+from monitor.entities import IssueMeta
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+SCHEMA_VERSION: int = 2
+
+
+def dumps(obj: Any) -> bytes:
+    """Encodes object to json, with orjson if it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)  # pylint: disable=no-member
+    return json.dumps(obj).encode("utf-8")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decodes json, with orjson if it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)  # pylint: disable=no-member
+    return json.loads(data)
+
+
+def encode_snapshot(issues: List[IssueMeta]) -> dict:
+    """Snapshot of issues in current schema version."""
+    return {"schema_version": SCHEMA_VERSION,
+            "issues": [issue.to_dict() for issue in issues]}
+
+
+def decode_snapshot(data: Union[list, dict]) -> Tuple[int, List[dict]]:
+    """Schema version and issues records of decoded snapshot.
+
+    Raises:
+        ValueError: if snapshot is written by newer schema version
+    """
+    if isinstance(data, list):
+        return 1, data
+    version = data.get("schema_version", 1)
+    if version > SCHEMA_VERSION:
+        raise ValueError("Snapshot schema version {} is newer than supported {}"
+                         .format(version, SCHEMA_VERSION))
+    return version, data["issues"]
+
+
+def read_snapshot(path: str) -> List[dict]:
+    """Reads issues records of json snapshot file of any schema version."""
+    with open(path, "rb") as file:
+        _, records = decode_snapshot(loads(file.read()))
+    return records
+
+
+def write_snapshot(path: str, issues: List[IssueMeta]):
+    """Writes issues to json snapshot file in current schema version."""
+    with open(path, "wb") as file:
+        file.write(dumps(encode_snapshot(issues)))
+
+
+class SnapshotWriter:
+    """Writes json snapshot in current schema version record by record.
+
+    Snapshot is written to temporary file next to ``path``, which replaces
+    ``path`` only when writer is closed without error, so partially
+    written snapshot is never read as latest one.
+    """
+
+    def __init__(self, path: str):
+        """Streaming snapshot writer.
+
+        Args:
+            path: path of json snapshot file
+        """
+        self.path = path
+        self.n_records = 0
+        self._tmp_path = "{}.tmp".format(path)
+        self._file = None
+
+    def __enter__(self) -> 'SnapshotWriter':
+        self._file = open(self._tmp_path, "wb")  # pylint: disable=consider-using-with
+        self._file.write(b'{"schema_version": %d, "issues": [' % SCHEMA_VERSION)
+        return self
+
+    def write(self, record: dict):
+        """Appends issue record to snapshot."""
+        if self.n_records > 0:
+            self._file.write(b",")
+        self._file.write(dumps(record))
+        self.n_records += 1
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self._file.write(b"]}")
+        self._file.close()
+        if exc_type is None:
+            os.replace(self._tmp_path, self.path)
+        else:
+            os.remove(self._tmp_path)
+
+
+def records_to_issues(records: List[dict],
+                      as_of: Optional[datetime] = None) -> List[IssueMeta]:
+    """Restores issues from records of snapshot.
+
+    Args:
+        records: issues records
+        as_of: reference time for ``days_since_*`` values, usually date of snapshot
+    """
+    return [IssueMeta.from_dict(record, as_of=as_of) for record in records]
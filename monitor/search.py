@@ -0,0 +1,151 @@
+"""GitHub search api crawl of open issues and pull requests of accounts."""
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional, Tuple
+
+import requests
+
+# GitHub search query can not be longer than 256 characters
+MAX_QUERY_LENGTH: int = 256
+SEARCH_TIME_FORMAT: str = "%Y-%m-%dT%H:%M:%SZ"
+
+
+def _created(start: datetime, end: datetime) -> str:
+    """Qualifier of items created in range of dates."""
+    return " created:{}..{}".format(start.strftime(SEARCH_TIME_FORMAT),
+                                    end.strftime(SEARCH_TIME_FORMAT))
+
+
+def account_queries(account: str,
+                    repos: Optional[List[str]] = None,
+                    max_length: int = MAX_QUERY_LENGTH) -> List[str]:
+    """Queries of open items of account.
+
+    Repositories are searched by ``repo:`` qualifiers in batches, so each
+    query with qualifier of creation dates added fits ``max_length``.
+
+    Args:
+        account: GitHub account or organization
+        repos: names of repositories to search, all by default
+        max_length: max length of query
+
+    Returns:
+        search queries
+    """
+    base = "is:open"
+    if repos is None:
+        return ["{} user:{}".format(base, account)]
+    max_length -= len(_created(datetime.min, datetime.min))
+    queries, query = [], base
+    for name in repos:
+        qualifier = " repo:{}/{}".format(account, name)
+        if query != base and len(query) + len(qualifier) > max_length:
+            queries.append(query)
+            query = base
+        query += qualifier
+    if query != base:
+        queries.append(query)
+    return queries
+
+
+class AccountSearch:
+    """Search of open issues and pull requests of account.
+
+    Search returns at most ``limit`` results per query, so larger results
+    are split by halves of creation date range until each part fits.
+    Search api allows about 30 requests per minute, so pages are fetched
+    one after another, at least ``interval`` seconds apart.
+    """
+
+    def __init__(self, get: Callable[[str], requests.Response],
+                 search_url: Callable[[str, int], str],
+                 limit: int = 1000,
+                 start: datetime = datetime(2008, 1, 1),
+                 interval: float = 2.0):
+        """Account search.
+
+        Args:
+            get: function sending GET request to url
+            search_url: url of page of search results for query and page number
+            limit: max number of results of query
+            start: date before any item was created
+            interval: min seconds between search requests
+        """
+        self.get = get
+        self.search_url = search_url
+        self.limit = limit
+        self.start = start
+        self.interval = interval
+        self._next_request = 0.0
+
+    def _fetch(self, query: str, page: int) -> dict:
+        """Fetches page of search results, waiting for interval since previous request.
+
+        Raises:
+            requests.HTTPError: if page can not be fetched after retries
+        """
+        delay = self._next_request - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        try:
+            response = self.get(self.search_url(query, page))
+        finally:
+            self._next_request = time.monotonic() + self.interval
+        response.raise_for_status()
+        return json.loads(response.text)
+
+    def pages(self, query: str) -> Tuple[int, List[dict]]:
+        """Fetches all accessible pages of search results.
+
+        Returns:
+            total count of results and fetched items, at most ``limit``
+        """
+        data = self._fetch(query, 1)
+        items, total = data["items"], data["total_count"]
+        if total > self.limit or len(items) == 0:
+            return total, items
+        per_page = len(items)
+        for page in range(2, -(-total // per_page) + 1):
+            items.extend(self._fetch(query, page)["items"])
+        return total, items
+
+    def _query_items(self, base_query: str) -> List[dict]:
+        """Items of query, split by creation dates if there are more than ``limit``."""
+        now = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+        items = []
+        ranges: List[Optional[Tuple[datetime, datetime]]] = [None]
+        while ranges:
+            dates = ranges.pop()
+            total, found = self.pages(base_query if dates is None
+                                      else base_query + _created(*dates))
+            start, end = dates if dates is not None else (self.start, now)
+            if total > self.limit and end - start > timedelta(seconds=1):
+                middle = (start + (end - start) / 2).replace(microsecond=0)
+                # newer half is searched first to keep items newest first
+                ranges.extend([(start, middle), (middle + timedelta(seconds=1), end)])
+                continue
+            items.extend(found)
+        return items
+
+    def open_items(self, account: str, repos: Optional[List[str]] = None) -> List[dict]:
+        """Searches open issues and pull requests of account.
+
+        Args:
+            account: GitHub account or organization
+            repos: names of repositories to search, all by default
+
+        Returns:
+            items of search, newest first
+        """
+        queries = account_queries(account, repos)
+        items, seen = [], set()
+        for query in queries:
+            for item in self._query_items(query):
+                key = (item.get("repository_url"), item.get("number"))
+                if key not in seen:
+                    seen.add(key)
+                    items.append(item)
+        if len(queries) > 1:
+            items.sort(key=lambda item: item.get("created_at"), reverse=True)
+        return items
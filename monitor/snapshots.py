@@ -0,0 +1,334 @@
+"""Delta-encoded store of open issues snapshots."""
+import glob
+import json
+import mmap
+import os
+import zlib
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from monitor.entities import IssueMeta
+from monitor.schema import dumps, loads, read_snapshot
+
+SNAPSHOT_DATE_FORMAT: str = "%m-%d-%Y-%H-%M"
+# derived values of records, which are measured against reference time
+# or summarize comments, so they are recomputed from stored fields on load
+RECOMPUTED_FIELDS: tuple = tuple(name for name in IssueMeta.DERIVED_FIELDS
+                                 if name != "n_comments")
+DAYS_FIELDS: tuple = tuple(name for name in IssueMeta.DERIVED_FIELDS
+                           if name.startswith("days_since_"))
+
+
+class SnapshotStore:
+    """Append-only store of snapshots of repositories issues.
+
+    Snapshots of each repository are stored in single data file as
+    zlib compressed records: full base snapshot followed by deltas
+    keyed by issue number. Every ``base_interval`` snapshot is stored as
+    base again, so any snapshot is restored from nearest base and
+    limited number of deltas read from memory-mapped data file.
+
+    Derived values of records, such as ``days_since_*`` ones changing with
+    date of snapshot, are not stored, so delta has only changed issues.
+    They are recomputed as of date of snapshot when it is loaded.
+    """
+
+    def __init__(self, folder: Optional[str] = None, base_interval: int = 10):
+        """Snapshot store.
+
+        Args:
+            folder: folder of store
+            base_interval: number of snapshots between full base snapshots
+        """
+        self.folder = folder or "./resources/snapshots"
+        self.base_interval = base_interval
+        if not os.path.exists(self.folder):
+            os.makedirs(self.folder)
+
+    def _data_path(self, name: str) -> str:
+        """Path of data file of repository."""
+        return os.path.join(self.folder, "{}.snap".format(name))
+
+    def _index_path(self, name: str) -> str:
+        """Path of index file of repository."""
+        return os.path.join(self.folder, "{}.index.json".format(name))
+
+    def _index(self, name: str) -> List[dict]:
+        """Index of snapshots of repository."""
+        path = self._index_path(name)
+        if not os.path.exists(path):
+            return []
+        with open(path, "r", encoding="utf-8") as file:
+            return json.load(file)
+
+    def names(self) -> List[str]:
+        """Names of stored repositories."""
+        suffix = ".index.json"
+        return sorted(name[:-len(suffix)] for name in os.listdir(self.folder)
+                      if name.endswith(suffix))
+
+    def dates(self, name: str) -> List[datetime]:
+        """Dates of stored snapshots of repository in chronological order."""
+        return [datetime.strptime(entry["date"], SNAPSHOT_DATE_FORMAT)
+                for entry in self._index(name)]
+
+    @staticmethod
+    def _strip(record: dict, taken_at: datetime) -> dict:
+        """Record without derived values.
+
+        Records of schema version 1 have no dates and comments to recompute
+        derived values from, so their ``days_since_*`` values are stored as
+        ordinal days they are counted from.
+        """
+        if "created_at" in record and "comments" in record:
+            return {key: value for key, value in record.items()
+                    if key not in RECOMPUTED_FIELDS}
+        day = taken_at.toordinal()
+        result = {key: value for key, value in record.items() if key not in DAYS_FIELDS}
+        result["days_counted_from"] = {key: day - record[key] if record[key] is not None else None
+                                       for key in DAYS_FIELDS if key in record}
+        return result
+
+    @staticmethod
+    def _restore(records: List[dict], taken_at: datetime) -> List[dict]:
+        """Records with derived values recomputed as of date of snapshot."""
+        day = taken_at.toordinal()
+        restored = []
+        for record in records:
+            if "days_counted_from" in record:
+                record = dict(record)
+                for key, counted_from in record.pop("days_counted_from").items():
+                    record[key] = day - counted_from if counted_from is not None else None
+            else:
+                record = IssueMeta.from_dict(record, as_of=taken_at).to_dict()
+            restored.append(record)
+        return restored
+
+    @staticmethod
+    def _apply(records: List[dict], delta: dict) -> List[dict]:
+        """Applies delta to snapshot."""
+        by_number = {record["number"]: record for record in records}
+        for number in delta["remove"]:
+            by_number.pop(number, None)
+        for record in delta["upsert"]:
+            by_number[record["number"]] = record
+        return [by_number[number] for number in delta["order"]]
+
+    def writer(self, name: str, taken_at: Optional[datetime] = None) -> "SnapshotStoreWriter":
+        """Writer of snapshot of repository record by record.
+
+        Args:
+            name: name of repository
+            taken_at: time snapshot was taken, now by default
+        """
+        return SnapshotStoreWriter(self, name, taken_at)
+
+    def save(self, name: str, records: List[dict], taken_at: Optional[datetime] = None):
+        """Appends snapshot of repository.
+
+        Args:
+            name: name of repository
+            records: issues records, each one has ``number`` field
+            taken_at: time snapshot was taken, now by default
+        """
+        with self.writer(name, taken_at) as writer:
+            for record in records:
+                writer.write(record)
+
+    def _append_index(self, name: str, entry: dict):
+        """Appends entry to index of snapshots of repository."""
+        index = self._index(name)
+        index.append(entry)
+        with open(self._index_path(name), "w", encoding="utf-8") as file:
+            json.dump(index, file)
+
+    def _iter_records(self, name: str, index: List[dict]) -> Iterator[Tuple[dict, dict]]:
+        """Yields index entries and decoded payloads read from memory-mapped data file."""
+        if len(index) == 0:
+            return
+        with open(self._data_path(name), "rb") as file, \
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for entry in index:
+                chunk = data[entry["offset"]:entry["offset"] + entry["length"]]
+                yield entry, loads(zlib.decompress(chunk))
+
+    def load(self, name: str, taken_at: Optional[datetime] = None) -> List[dict]:
+        """Loads snapshot of repository.
+
+        Args:
+            name: name of repository
+            taken_at: date of snapshot, latest snapshot taken at or before it is loaded.
+                Latest snapshot by default.
+
+        Returns:
+            issues records, empty if there is no such snapshot
+        """
+        index = self._index(name)
+        if taken_at is not None:
+            index = [entry for entry in index
+                     if datetime.strptime(entry["date"], SNAPSHOT_DATE_FORMAT) <= taken_at]
+        if len(index) == 0:
+            return []
+        return self._restore(self._load_stored(name, index),
+                             datetime.strptime(index[-1]["date"], SNAPSHOT_DATE_FORMAT))
+
+    def _load_stored(self, name: str, index: List[dict]) -> List[dict]:
+        """Stored records of last snapshot of index, without derived values."""
+        if len(index) == 0:
+            return []
+        base = max(i for i, entry in enumerate(index) if entry["kind"] == "base")
+        records = []
+        for entry, payload in self._iter_records(name, index[base:]):
+            records = payload["issues"] if entry["kind"] == "base" \
+                else self._apply(records, payload)
+        return records
+
+    def iter_snapshots(self, name: str) -> Iterator[Tuple[datetime, List[dict]]]:
+        """Yields all snapshots of repository in chronological order."""
+        records = []
+        for entry, payload in self._iter_records(name, self._index(name)):
+            records = payload["issues"] if entry["kind"] == "base" \
+                else self._apply(records, payload)
+            taken_at = datetime.strptime(entry["date"], SNAPSHOT_DATE_FORMAT)
+            yield taken_at, self._restore(records, taken_at)
+
+
+
+class SnapshotStoreWriter:
+    """Writer of snapshot of repository to snapshot store record by record.
+
+    Records are compressed into data file as they are written. Delta is
+    computed against stored records of previous snapshot, which are the
+    only ones held in memory, so base snapshot is written in constant memory.
+    Snapshot is added to index only when writer is closed without error.
+    """
+
+    def __init__(self, store: SnapshotStore, name: str, taken_at: Optional[datetime] = None):
+        """Snapshot store writer.
+
+        Args:
+            store: snapshot store to write to
+            name: name of repository
+            taken_at: time snapshot was taken, now by default
+        """
+        self.store = store
+        self.name = name
+        self.taken_at = taken_at or datetime.now()
+        index = store._index(name)  # pylint: disable=protected-access
+        self.kind = "base" if len(index) % store.base_interval == 0 else "delta"
+        self._previous: Dict[int, dict] = {} if self.kind == "base" else {
+            record["number"]: record
+            for record in store._load_stored(name, index)}  # pylint: disable=protected-access
+        self._order: List[int] = []
+        self._n_written = 0
+        self._compressor = zlib.compressobj(9)
+        self._file = None
+        self._offset = 0
+
+    def __enter__(self) -> "SnapshotStoreWriter":
+        self._file = open(self.store._data_path(self.name), "ab")  # pylint: disable=protected-access
+        self._offset = self._file.tell()
+        self._file.write(self._compressor.compress(
+            b'{"issues":[' if self.kind == "base" else b'{"upsert":['))
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            if exc_type is not None:
+                self._file.truncate(self._offset)
+                return
+            if self.kind == "base":
+                tail = b"]}"
+            else:
+                current = set(self._order)
+                tail = b'],"order":' + dumps(self._order) + b',"remove":' + dumps(
+                    [number for number in self._previous if number not in current]) + b"}"
+            self._file.write(self._compressor.compress(tail) + self._compressor.flush())
+            length = self._file.tell() - self._offset
+        finally:
+            self._file.close()
+        self.store._append_index(  # pylint: disable=protected-access
+            self.name, {"kind": self.kind,
+                        "date": self.taken_at.strftime(SNAPSHOT_DATE_FORMAT),
+                        "offset": self._offset, "length": length})
+
+    def write(self, record: dict):
+        """Writes issue record, which has ``number`` field."""
+        record = SnapshotStore._strip(record, self.taken_at)  # pylint: disable=protected-access
+        if self.kind == "delta":
+            self._order.append(record["number"])
+            if self._previous.get(record["number"]) == record:
+                return
+        self._file.write(self._compressor.compress(
+            (b"," if self._n_written else b"") + dumps(record)))
+        self._n_written += 1
+
+
+def parse_snapshot_file_name(path: str) -> Tuple[str, datetime]:
+    """Returns repository name and date of json snapshot file."""
+    name, date = os.path.splitext(os.path.basename(path))[0].rsplit("_", 1)
+    return name, datetime.strptime(date, SNAPSHOT_DATE_FORMAT)
+
+
+def json_snapshots(folder: Optional[str] = None) -> Dict[str, List[str]]:
+    """Paths of json snapshot files per repository in chronological order."""
+    folder = folder or "./resources"
+    files: Dict[str, List[Tuple[datetime, str]]] = {}
+    for path in glob.glob(os.path.join(folder, "*_*.json")):
+        try:
+            name, taken_at = parse_snapshot_file_name(path)
+        except ValueError:
+            continue
+        files.setdefault(name, []).append((taken_at, path))
+    return {name: [path for _, path in sorted(paths)] for name, paths in files.items()}
+
+
+def load_latest_snapshot(name: str,
+                         folder: Optional[str] = None,
+                         store: Optional[SnapshotStore] = None
+                         ) -> Tuple[Optional[datetime], List[dict]]:
+    """Loads latest snapshot of repository.
+
+    Args:
+        name: name of repository
+        folder: folder of json snapshots, used if store is not specified
+        store: snapshot store
+
+    Returns:
+        date and issues records of snapshot, ``(None, [])`` if there is no snapshot
+    """
+    if store is not None:
+        dates = store.dates(name)
+        return (dates[-1], store.load(name)) if dates else (None, [])
+
+    paths = json_snapshots(folder).get(name)
+    if not paths:
+        return None, []
+    _, taken_at = parse_snapshot_file_name(paths[-1])
+    return taken_at, read_snapshot(paths[-1])
+
+
+def import_json_snapshots(store: SnapshotStore,
+                          folder: Optional[str] = None) -> Dict[str, int]:
+    """Imports json snapshots written by ``save_open_issues_to_json`` into store.
+
+    Store is append-only, so snapshots not newer than latest stored one are skipped.
+
+    Args:
+        store: snapshot store
+        folder: folder of json snapshots
+
+    Returns:
+        number of imported snapshots per repository
+    """
+    imported = {}
+    for name, paths in json_snapshots(folder).items():
+        stored_dates = store.dates(name)
+        imported[name] = 0
+        for path in paths:
+            _, taken_at = parse_snapshot_file_name(path)
+            if stored_dates and taken_at <= max(stored_dates):
+                continue
+            store.save(name, read_snapshot(path), taken_at=taken_at)
+            imported[name] += 1
+    return imported
@@ -0,0 +1,107 @@
+"""Stored state of repository for incremental sync."""
+import json
+import os
+from typing import Dict, List, Optional, Set, Tuple
+
+ISSUE_FIELDS: List[str] = ["title", "number", "state", "assignee", "author_association",
+                           "comments", "created_at", "updated_at", "user",
+                           "pull_request", "labels"]
+COMMENT_FIELDS: List[str] = ["id", "user", "author_association", "created_at", "updated_at"]
+
+
+def compact_issue(issue: dict) -> dict:
+    """Strips GitHub api issue payload to fields used by monitor."""
+    result = {field: issue.get(field) for field in ISSUE_FIELDS if field in issue}
+    if result.get("assignee") is not None:
+        result["assignee"] = {"login": result["assignee"].get("login")}
+    if result.get("user") is not None:
+        result["user"] = {"login": result["user"].get("login"),
+                          "type": result["user"].get("type")}
+    if result.get("pull_request") is not None:
+        result["pull_request"] = {"url": result["pull_request"].get("url")}
+    if result.get("labels") is not None:
+        result["labels"] = [{"name": label.get("name")} for label in result["labels"]]
+    return result
+
+
+def compact_comment(comment: dict) -> dict:
+    """Strips GitHub api comment payload to fields used by monitor."""
+    result = {field: comment.get(field) for field in COMMENT_FIELDS}
+    if result.get("user") is not None:
+        result["user"] = {"login": result["user"].get("login"),
+                          "type": result["user"].get("type")}
+    return result
+
+
+class RepoState:
+    """Open issues and comments of repository as returned by GitHub api."""
+
+    def __init__(self,
+                 account: str,
+                 name: str,
+                 synced_at: Optional[str] = None,
+                 issues: Optional[Dict[str, dict]] = None):
+        """Repository state.
+
+        Args:
+            account: GitHub account
+            name: name of repo
+            synced_at: ISO time of last sync, used as ``since`` for next one
+            issues: issue number to ``{"issue": ..., "comments": [...]}`` payloads
+        """
+        self.account = account
+        self.name = name
+        self.synced_at = synced_at
+        self.issues = issues if issues is not None else {}
+
+    @staticmethod
+    def path(account: str, name: str, folder: Optional[str] = None) -> str:
+        """Path of state file for repository."""
+        folder = folder or "./resources/state"
+        return f"{folder}/{account}_{name}.json"
+
+    @classmethod
+    def load(cls, account: str, name: str, folder: Optional[str] = None) -> 'RepoState':
+        """Loads state of repository, empty state if it was never synced."""
+        path = cls.path(account, name, folder)
+        if not os.path.exists(path):
+            return cls(account, name)
+        with open(path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+        return cls(account, name, synced_at=data.get("synced_at"), issues=data.get("issues"))
+
+    def save(self, folder: Optional[str] = None):
+        """Saves state of repository."""
+        path = self.path(self.account, self.name, folder)
+        if not os.path.exists(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({"synced_at": self.synced_at, "issues": self.issues}, file)
+
+    def merge(self, fetched: List[Tuple[dict, List[dict]]], synced_at: str):
+        """Merges fetched issues into state.
+
+        Open issues are added or replaced, closed ones are removed.
+
+        Args:
+            fetched: pairs of issue and its comments payloads
+            synced_at: ISO time fetch was started at
+        """
+        for issue, comments in fetched:
+            number = str(issue.get("number"))
+            if issue.get("state") == "open":
+                self.issues[number] = {"issue": compact_issue(issue),
+                                       "comments": [compact_comment(c) for c in comments]}
+            else:
+                self.issues.pop(number, None)
+        self.synced_at = synced_at
+
+    def items(self, numbers: Optional[Set[str]] = None) -> List[Tuple[dict, List[dict]]]:
+        """Pairs of issue and comments payloads, most recently created first.
+
+        Args:
+            numbers: numbers of issues to return, all by default
+        """
+        items = [(entry["issue"], entry["comments"]) for number, entry in self.issues.items()
+                 if numbers is None or number in numbers]
+        return sorted(items, key=lambda item: item[0].get("created_at"), reverse=True)
@@ -0,0 +1,523 @@
+"""SQLite store of open issues, comments and snapshots history."""
+import os
+import sqlite3
+import threading
+import uuid
+import zlib
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from monitor.entities import GitHubAuthorAssociations, IssueCommentMeta, IssueMeta, to_iso
+from monitor.schema import dumps, loads
+
+SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    repo TEXT NOT NULL,
+    taken_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS snapshots_repo_taken_at ON snapshots (repo, taken_at);
+
+CREATE TABLE IF NOT EXISTS snapshot_chunks (
+    snapshot_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (snapshot_id, position)
+);
+
+CREATE TABLE IF NOT EXISTS issues (
+    id INTEGER PRIMARY KEY,
+    repo TEXT NOT NULL,
+    number NOT NULL,
+    title TEXT,
+    state TEXT,
+    assignee TEXT,
+    author_association TEXT,
+    user TEXT,
+    pull_request TEXT,
+    labels BLOB,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    n_comments INTEGER NOT NULL,
+    last_commented_by TEXT,
+    last_commenter_type TEXT,
+    last_member_comment_at TEXT,
+    community INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS issues_repo_number ON issues (repo, number);
+CREATE INDEX IF NOT EXISTS issues_repo_updated_at ON issues (repo, updated_at);
+CREATE INDEX IF NOT EXISTS issues_updated_at ON issues (updated_at);
+CREATE INDEX IF NOT EXISTS issues_repo_author_association
+    ON issues (repo, author_association);
+CREATE INDEX IF NOT EXISTS issues_repo_last_member_comment_at
+    ON issues (repo, last_member_comment_at);
+CREATE INDEX IF NOT EXISTS issues_last_member_comment_at ON issues (last_member_comment_at);
+CREATE INDEX IF NOT EXISTS issues_community_updated_at ON issues (updated_at)
+    WHERE community = 1;
+CREATE INDEX IF NOT EXISTS issues_repo_assignee ON issues (repo, assignee);
+
+CREATE TABLE IF NOT EXISTS comments (
+    issue_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    user TEXT,
+    author_association TEXT,
+    user_type TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (issue_id, position)
+);
+"""
+
+ISSUE_COLUMNS: str = "id, repo, number, title, state, assignee, author_association, user, " \
+                     "pull_request, labels, created_at, updated_at, n_comments"
+
+
+def _to_column(time: Optional[datetime]) -> Optional[str]:
+    """Converts datetime to fixed width ISO 8601 string, so columns sort as times."""
+    return time.isoformat(timespec="microseconds") if time is not None else None
+
+
+class IssueStore:
+    """Store of repositories issues in single SQLite database.
+
+    Snapshots history is kept as compressed records, so store can be used
+    in place of ``SnapshotStore``. Latest snapshot of each repository is also
+    kept as indexed rows of issues and comments, so report sections are
+    answered by queries over all repositories and only issues within
+    ``limit`` of query are restored with their comments.
+    """
+
+    BATCH_SIZE: int = 500
+
+    def __init__(self, path: Optional[str] = None):
+        """Issue store.
+
+        Args:
+            path: path of database file
+        """
+        self.path = path or "./resources/monitor.db"
+        folder = os.path.dirname(self.path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.executescript(SCHEMA)
+
+    def close(self):
+        """Closes database."""
+        with self._lock:
+            self._connection.close()
+
+    def _query(self, sql: str, parameters: tuple = ()) -> List[tuple]:
+        """Rows of query."""
+        with self._lock:
+            return self._connection.execute(sql, parameters).fetchall()
+
+    def names(self) -> List[str]:
+        """Names of stored repositories."""
+        return [name for name, in self._query("SELECT DISTINCT repo FROM snapshots ORDER BY repo")]
+
+    def dates(self, name: str) -> List[datetime]:
+        """Dates of stored snapshots of repository in chronological order."""
+        return [datetime.fromisoformat(taken_at) for taken_at, in self._query(
+            "SELECT taken_at FROM snapshots WHERE repo = ? ORDER BY taken_at", (name,))]
+
+    def writer(self, name: str, taken_at: Optional[datetime] = None,
+               history: bool = True) -> "IssueStoreWriter":
+        """Writer of snapshot of repository record by record.
+
+        Args:
+            name: name of repository
+            taken_at: time snapshot was taken, now by default
+            history: append snapshot to history, otherwise only indexed rows are replaced
+        """
+        return IssueStoreWriter(self, name, taken_at, history)
+
+    def save(self, name: str, records: List[dict], taken_at: Optional[datetime] = None):
+        """Appends snapshot of repository.
+
+        If snapshot is latest one of repository, its issues and comments
+        replace indexed rows of repository. Records without dates and
+        comments (schema version 1) are kept in history only.
+
+        Args:
+            name: name of repository
+            records: issues records written by ``IssueMeta.to_dict``
+            taken_at: time snapshot was taken, now by default
+        """
+        with self.writer(name, taken_at) as writer:
+            for record in records:
+                writer.write(record)
+
+    def _delete_issues(self, name: str):
+        """Deletes indexed rows of repository, must be called under lock in transaction."""
+        self._connection.execute("DELETE FROM comments WHERE issue_id IN "
+                                 "(SELECT id FROM issues WHERE repo = ?)", (name,))
+        self._connection.execute("DELETE FROM issues WHERE repo = ?", (name,))
+
+    def _insert_issues(self, name: str, issues: List[IssueMeta]):
+        """Inserts indexed rows of issues, must be called under lock in transaction."""
+        for issue in issues:
+            cursor = self._connection.execute(
+                "INSERT INTO issues (repo, number, title, state, assignee, author_association, "
+                "user, pull_request, labels, created_at, updated_at, n_comments, "
+                "last_commented_by, last_commenter_type, last_member_comment_at, community) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (name, issue.number, issue.title, issue.state, issue.assignee,
+                 issue.author_association, issue.user, issue.pull_request,
+                 dumps(issue.labels), _to_column(issue.created_at),
+                 _to_column(issue.updated_at), issue.n_comments, issue.last_commented_by,
+                 issue.last_commenter_type, _to_column(issue.last_member_comment_at),
+                 int(issue.is_authored_by_or_last_commented_by_community)))
+            self._connection.executemany(
+                "INSERT INTO comments (issue_id, position, user, author_association, "
+                "user_type, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(cursor.lastrowid, position, comment.user, comment.author_association,
+                  comment.user_type, _to_column(comment.created_at),
+                  _to_column(comment.updated_at))
+                 for position, comment in enumerate(issue.comments)])
+
+    def load(self, name: str, taken_at: Optional[datetime] = None) -> List[dict]:
+        """Loads snapshot of repository.
+
+        Args:
+            name: name of repository
+            taken_at: date of snapshot, latest snapshot taken at or before it is loaded.
+                Latest snapshot by default.
+
+        Returns:
+            issues records, empty if there is no such snapshot
+        """
+        rows = self._query("SELECT id FROM snapshots WHERE repo = ? AND taken_at <= ? "
+                           "ORDER BY taken_at DESC, id DESC LIMIT 1",
+                           (name, _to_column(taken_at or datetime.max)))
+        return self._records(rows[0][0]) if rows else []
+
+    def iter_snapshots(self, name: str) -> Iterator[Tuple[datetime, List[dict]]]:
+        """Yields all snapshots of repository in chronological order."""
+        rows = self._query("SELECT id, taken_at FROM snapshots WHERE repo = ? "
+                           "ORDER BY taken_at, id", (name,))
+        for snapshot_id, taken_at in rows:
+            yield datetime.fromisoformat(taken_at), self._records(snapshot_id)
+
+    def _records(self, snapshot_id: int) -> List[dict]:
+        """Records of snapshot joined from its chunks."""
+        return [record for data, in self._query(
+            "SELECT data FROM snapshot_chunks WHERE snapshot_id = ? ORDER BY position",
+            (snapshot_id,)) for record in loads(zlib.decompress(data))]
+
+    def summaries(self, name: str, as_of: datetime) -> Iterator[dict]:
+        """Yields summaries of indexed issues of repository compared by ``SnapshotDiff``.
+
+        Rows are read in batches, so whole snapshot is never loaded.
+
+        Args:
+            name: name of repository
+            as_of: date of latest snapshot, ``days_since_last_update`` is measured against
+        """
+        with self._lock:
+            cursor = self._connection.execute(
+                "SELECT number, title, n_comments, last_commented_by, last_commenter_type, "
+                "updated_at, (SELECT MAX(created_at) FROM comments WHERE issue_id = issues.id) "
+                "FROM issues WHERE repo = ? ORDER BY id", (name,))
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(self.BATCH_SIZE)
+            if len(rows) == 0:
+                return
+            for (number, title, n_comments, last_commented_by, last_commenter_type,
+                 updated_at, last_comment_at) in rows:
+                yield {"number": number, "title": title, "n_comments": n_comments,
+                       "last_commented_by": last_commented_by,
+                       "last_commenter_type": last_commenter_type,
+                       "days_since_last_update":
+                           (as_of - datetime.fromisoformat(updated_at)).days,
+                       "last_comment_at": to_iso(datetime.fromisoformat(last_comment_at))
+                       if last_comment_at is not None else None}
+
+    @staticmethod
+    def _where(name: Optional[str], *conditions: str) -> Tuple[str, tuple]:
+        """Where clause of conditions, limited to repository if it is specified."""
+        parameters = ()
+        if name is not None:
+            conditions = ("repo = ?",) + conditions
+            parameters = (name,)
+        return ("WHERE " + " AND ".join(conditions) if conditions else ""), parameters
+
+    def _comments(self, ids: tuple) -> Dict[int, List[IssueCommentMeta]]:
+        """Comments of issues by issue id."""
+        comments: Dict[int, List[IssueCommentMeta]] = {}
+        for issue_id, user, association, user_type, created_at, updated_at in self._query(
+                "SELECT issue_id, user, author_association, user_type, created_at, "
+                "updated_at FROM comments WHERE issue_id IN ({}) "
+                "ORDER BY issue_id, position".format(", ".join("?" * len(ids))), ids):
+            comments.setdefault(issue_id, []).append(IssueCommentMeta(
+                user=user, author_association=association, user_type=user_type,
+                created_at=datetime.fromisoformat(created_at),
+                updated_at=datetime.fromisoformat(updated_at)))
+        return comments
+
+    def _issues(self, sql: str, parameters: tuple,  # pylint: disable=too-many-locals
+                as_of: Optional[datetime]) -> Iterator[Tuple[str, IssueMeta]]:
+        """Restores issues selected by query with their comments.
+
+        Rows are read in batches, so only one batch of issues is held in memory.
+
+        Yields:
+            pairs of repository name and issue in order of query
+        """
+        as_of = as_of if as_of is not None else datetime.now()
+        with self._lock:
+            cursor = self._connection.execute(sql, parameters)
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(self.BATCH_SIZE)
+            if len(rows) == 0:
+                return
+            comments = self._comments(tuple(row[0] for row in rows))
+            for (issue_id, repo, number, title, state, assignee, association, user,
+                 pull_request, labels, created_at, updated_at, n_comments) in rows:
+                yield repo, IssueMeta(title=title, number=number, state=state, assignee=assignee,
+                                      author_association=association,
+                                      comments=comments.get(issue_id, []), user=user,
+                                      created_at=datetime.fromisoformat(created_at),
+                                      updated_at=datetime.fromisoformat(updated_at),
+                                      pull_request=pull_request, labels=loads(labels),
+                                      as_of=as_of, n_comments=n_comments)
+
+    def n_open_issues(self, name: Optional[str] = None) -> int:
+        """Number of open issues of repository, of all repositories by default."""
+        where, parameters = self._where(name)
+        return self._query("SELECT COUNT(*) FROM issues {}".format(where), parameters)[0][0]
+
+    def n_issues_by_members(self, name: Optional[str] = None) -> int:
+        """Number of open issues created by members."""
+        where, parameters = self._where(name, "author_association IN (?, ?)")
+        return self._query("SELECT COUNT(*) FROM issues {}".format(where),
+                           parameters + tuple(GitHubAuthorAssociations.members_associations())
+                           )[0][0]
+
+    def n_issues_by_users(self, name: Optional[str] = None) -> int:
+        """Number of open issues created by users."""
+        return self.n_open_issues(name) - self.n_issues_by_members(name)
+
+    def top_authors(self, name: Optional[str] = None, limit: int = 5) -> List[Tuple[str, int]]:
+        """Top authors of open issues and numbers of their issues."""
+        where, parameters = self._where(name)
+        return self._query("SELECT user, COUNT(*) AS n FROM issues {} GROUP BY user "
+                           "ORDER BY n DESC, MIN(id) LIMIT ?".format(where), parameters + (limit,))
+
+    def top_author_associations(self, name: Optional[str] = None) -> Dict[str, int]:
+        """Authors associations and numbers of open issues."""
+        where, parameters = self._where(name)
+        return dict(self._query("SELECT author_association, COUNT(*) FROM issues {} "
+                                "GROUP BY author_association ORDER BY MIN(id)".format(where),
+                                parameters))
+
+    def old_updated_issues(self, name: Optional[str] = None,
+                           as_of: Optional[datetime] = None,
+                           days: int = 365 * 3,
+                           limit: int = -1) -> Iterator[Tuple[str, IssueMeta]]:
+        """Issues not updated for more than ``days`` days, least recently updated first.
+
+        Args:
+            name: name of repository, all repositories by default
+            as_of: reference time, now by default
+            days: number of days
+            limit: max number of issues, all by default
+
+        Yields:
+            pairs of repository name and issue
+        """
+        as_of = as_of if as_of is not None else datetime.now()
+        where, parameters = self._where(name, "updated_at <= ?")
+        return self._issues("SELECT {} FROM issues {} ORDER BY updated_at LIMIT ?"
+                            .format(ISSUE_COLUMNS, where),
+                            parameters + (_to_column(as_of - timedelta(days=days + 1)), limit),
+                            as_of)
+
+    def issues_with_community_association(self, name: Optional[str] = None,
+                                          as_of: Optional[datetime] = None,
+                                          limit: int = -1) -> Iterator[Tuple[str, IssueMeta]]:
+        """Issues created or last commented by community, least recently updated first.
+
+        Args:
+            name: name of repository, all repositories by default
+            as_of: reference time, now by default
+            limit: max number of issues, all by default
+
+        Yields:
+            pairs of repository name and issue
+        """
+        where, parameters = self._where(name, "community = 1")
+        return self._issues("SELECT {} FROM issues {} ORDER BY updated_at LIMIT ?"
+                            .format(ISSUE_COLUMNS, where), parameters + (limit,), as_of)
+
+    def days_since_last_comment_by_member(self, name: Optional[str] = None,
+                                          as_of: Optional[datetime] = None,
+                                          limit: int = -1) -> Iterator[Tuple[str, IssueMeta]]:
+        """Issues last commented by member at least a day ago, least recently commented first.
+
+        Args:
+            name: name of repository, all repositories by default
+            as_of: reference time, now by default
+            limit: max number of issues, all by default
+
+        Yields:
+            pairs of repository name and issue
+        """
+        as_of = as_of if as_of is not None else datetime.now()
+        where, parameters = self._where(name, "last_member_comment_at <= ?")
+        return self._issues("SELECT {} FROM issues {} ORDER BY last_member_comment_at LIMIT ?"
+                            .format(ISSUE_COLUMNS, where),
+                            parameters + (_to_column(as_of - timedelta(days=1)), limit),
+                            as_of)
+
+    def open_issues_sorted_by_update_date(self, name: Optional[str] = None,
+                                          as_of: Optional[datetime] = None,
+                                          limit: int = -1) -> Iterator[Tuple[str, IssueMeta]]:
+        """Open issues, least recently updated first.
+
+        Args:
+            name: name of repository, all repositories by default
+            as_of: reference time, now by default
+            limit: max number of issues, all by default
+
+        Yields:
+            pairs of repository name and issue
+        """
+        where, parameters = self._where(name)
+        return self._issues("SELECT {} FROM issues {} ORDER BY updated_at LIMIT ?"
+                            .format(ISSUE_COLUMNS, where), parameters + (limit,), as_of)
+
+    def issues_by_label(self, name: Optional[str] = None) -> Dict[str, int]:
+        """Number of open issues per label, most frequent first."""
+        where, parameters = self._where(name)
+        return dict(self._query("SELECT label.value, COUNT(*) AS n FROM issues, "
+                                "json_each(CAST(issues.labels AS TEXT)) AS label {} "
+                                "GROUP BY label.value ORDER BY n DESC, MIN(issues.id)"
+                                .format(where), parameters))
+
+    def issues_by_assignee(self, name: Optional[str] = None) -> Dict[Optional[str], int]:
+        """Number of open issues per assignee, unassigned ones under ``None``, most first."""
+        where, parameters = self._where(name)
+        return dict(self._query("SELECT assignee, COUNT(*) AS n FROM issues {} "
+                                "GROUP BY assignee ORDER BY n DESC, MIN(id)".format(where),
+                                parameters))
+
+    def unassigned_community_issues(self, name: Optional[str] = None,
+                                    as_of: Optional[datetime] = None,
+                                    days: int = 14,
+                                    limit: int = -1) -> Iterator[Tuple[str, IssueMeta]]:
+        """Unassigned issues authored by community not updated for more than ``days`` days,
+        least recently updated first.
+
+        Args:
+            name: name of repository, all repositories by default
+            as_of: reference time, now by default
+            days: number of days
+            limit: max number of issues, all by default
+
+        Yields:
+            pairs of repository name and issue
+        """
+        as_of = as_of if as_of is not None else datetime.now()
+        where, parameters = self._where(name, "assignee IS NULL",
+                                        "author_association NOT IN (?, ?)", "updated_at <= ?")
+        return self._issues("SELECT {} FROM issues {} ORDER BY updated_at LIMIT ?"
+                            .format(ISSUE_COLUMNS, where),
+                            parameters + tuple(GitHubAuthorAssociations.members_associations())
+                            + (_to_column(as_of - timedelta(days=days + 1)), limit), as_of)
+
+
+class IssueStoreWriter:
+    """Writer of snapshot of repository to issue store record by record.
+
+    Records are written in batches of ``IssueStore.BATCH_SIZE``, as compressed
+    chunks of snapshot and as indexed rows kept under pending name of repository,
+    so only one batch is held in memory. Snapshot joins history and its rows
+    replace ones of repository only when writer is closed without error.
+    """
+
+    def __init__(self, store: IssueStore, name: str, taken_at: Optional[datetime] = None,
+                 history: bool = True):
+        """Issue store writer.
+
+        Args:
+            store: issue store to write to
+            name: name of repository
+            taken_at: time snapshot was taken, now by default
+            history: append snapshot to history, otherwise only indexed rows are replaced
+        """
+        self.store = store
+        self.name = name
+        self.taken_at = taken_at or datetime.now()
+        self.history = history
+        self._pending = "{}#{}".format(name, uuid.uuid4().hex)
+        self._batch: List[dict] = []
+        self._indexed = True
+        self._snapshot_id: Optional[int] = None
+        self._position = 0
+
+    def __enter__(self) -> "IssueStoreWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self._flush()
+        connection = self.store._connection  # pylint: disable=protected-access
+        with self.store._lock, connection:  # pylint: disable=protected-access
+            if exc_type is None:
+                latest, = connection.execute("SELECT MAX(taken_at) FROM snapshots "
+                                             "WHERE repo = ?", (self.name,)).fetchone()
+                if self._indexed and (latest is None or _to_column(self.taken_at) >= latest):
+                    self.store._delete_issues(self.name)  # pylint: disable=protected-access
+                    connection.execute("UPDATE issues SET repo = ? WHERE repo = ?",
+                                       (self.name, self._pending))
+                if self.history and self._snapshot_id is None:
+                    self._insert_snapshot()
+                connection.execute("UPDATE snapshots SET repo = ? WHERE id = ?",
+                                   (self.name, self._snapshot_id))
+            elif self._snapshot_id is not None:
+                connection.execute("DELETE FROM snapshot_chunks WHERE snapshot_id = ?",
+                                   (self._snapshot_id,))
+                connection.execute("DELETE FROM snapshots WHERE id = ?", (self._snapshot_id,))
+            self.store._delete_issues(self._pending)  # pylint: disable=protected-access
+
+    def write(self, record: dict):
+        """Writes issue record written by ``IssueMeta.to_dict``."""
+        self._batch.append(record)
+        if len(self._batch) >= self.store.BATCH_SIZE:
+            self._flush()
+
+    def _insert_snapshot(self):
+        """Inserts pending snapshot row, must be called under lock in transaction."""
+        self._snapshot_id = self.store._connection.execute(  # pylint: disable=protected-access
+            "INSERT INTO snapshots (repo, taken_at) VALUES (?, ?)",
+            (self._pending, _to_column(self.taken_at))).lastrowid
+
+    def _flush(self):
+        """Writes batch of records."""
+        if len(self._batch) == 0:
+            return
+        issues = None
+        if self._indexed:
+            try:
+                issues = [IssueMeta.from_dict(record, as_of=self.taken_at)
+                          for record in self._batch]
+            except ValueError:
+                self._indexed = False
+
+        connection = self.store._connection  # pylint: disable=protected-access
+        with self.store._lock, connection:  # pylint: disable=protected-access
+            if self.history:
+                if self._snapshot_id is None:
+                    self._insert_snapshot()
+                connection.execute("INSERT INTO snapshot_chunks (snapshot_id, position, data) "
+                                   "VALUES (?, ?, ?)", (self._snapshot_id, self._position,
+                                                        zlib.compress(dumps(self._batch))))
+                self._position += 1
+            if issues is not None:
+                self.store._insert_issues(self._pending, issues)  # pylint: disable=protected-access
+        self._batch = []
@@ -0,0 +1,131 @@
+"""Columnar representation of repository issues.
+
+Requires optional ``numpy`` dependency.
+"""
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from monitor.entities import IssueMeta, GitHubAuthorAssociations
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+EPOCH: datetime = datetime(1970, 1, 1)
+SECONDS_IN_DAY: int = 24 * 60 * 60
+
+
+def _seconds(time: Optional[datetime]) -> float:
+    """Seconds since naive epoch, NaN for missing time."""
+    return (time - EPOCH).total_seconds() if time is not None else float("nan")
+
+
+def _categorize(values: List[str]) -> Tuple[List[str], 'np.ndarray']:
+    """Encodes values as category codes.
+
+    Categories are ordered by first occurrence of value.
+    """
+    categories: Dict[str, int] = {}
+    codes = np.fromiter((categories.setdefault(value, len(categories)) for value in values),
+                        dtype=np.int32, count=len(values))
+    return list(categories), codes
+
+
+class IssueTable:
+    """Issues of repository stored as columns.
+
+    Times are stored as seconds, author association, last commenter
+    association and author are stored as category codes and
+    issue properties as bitmask flags.
+    """
+
+    PULL_REQUEST: int = 1
+    AUTHORED_BY_MEMBER: int = 2
+    LAST_COMMENTED_BY_MEMBER: int = 4
+    COMMENTED: int = 8
+
+    def __init__(self, issues: List[IssueMeta]):
+        """Columnar issues table.
+
+        Args:
+            issues: issues of repository
+        """
+        if np is None:
+            raise ImportError("Columnar issue table requires numpy, "
+                              "install it with 'pip install numpy'.")
+
+        self.issues = issues
+        n_issues = len(issues)
+
+        def column(values) -> 'np.ndarray':
+            return np.fromiter(values, dtype=np.float64, count=n_issues)
+
+        self.as_of = column(_seconds(i.as_of) for i in issues)
+        self.created_at = column(_seconds(i.created_at) for i in issues)
+        self.updated_at = column(_seconds(i.updated_at) for i in issues)
+        self.last_member_comment_at = column(_seconds(i.last_member_comment_at) for i in issues)
+
+        self.associations, self.association_codes = \
+            _categorize([i.author_association for i in issues])
+        self.users, self.user_codes = _categorize([i.user for i in issues])
+        self.last_commenter_types, self.last_commenter_type_codes = \
+            _categorize([i.last_commenter_type for i in issues])
+
+        members = GitHubAuthorAssociations.members_associations()
+        self.flags = np.zeros(n_issues, dtype=np.uint8)
+        self.flags[column(i.pull_request is not None for i in issues) > 0] |= self.PULL_REQUEST
+        self.flags[column(i.n_comments > 0 for i in issues) > 0] |= self.COMMENTED
+        self.flags[self._in_categories(self.association_codes, self.associations,
+                                       members)] |= self.AUTHORED_BY_MEMBER
+        self.flags[self._in_categories(self.last_commenter_type_codes,
+                                       self.last_commenter_types,
+                                       members)] |= self.LAST_COMMENTED_BY_MEMBER
+
+    @staticmethod
+    def _in_categories(codes: 'np.ndarray', categories: List[str],
+                       values: List[str]) -> 'np.ndarray':
+        """Mask of codes which categories are in values."""
+        return np.isin(codes, [code for code, category in enumerate(categories)
+                               if category in values])
+
+    def __len__(self):
+        return len(self.issues)
+
+    @staticmethod
+    def nonzero_mask(values: 'np.ndarray') -> 'np.ndarray':
+        """Mask of values which are neither zero nor NaN."""
+        return ~np.isnan(values) & (values != 0)
+
+    def has_flags(self, flags: int) -> 'np.ndarray':
+        """Mask of issues with all specified flags set."""
+        return (self.flags & flags) == flags
+
+    @property
+    def days_since_last_update(self) -> 'np.ndarray':
+        """Number of days since last update."""
+        return np.floor((self.as_of - self.updated_at) / SECONDS_IN_DAY)
+
+    @property
+    def days_since_last_member_comment(self) -> 'np.ndarray':
+        """Number of days since last member comment, NaN if there is no such comment."""
+        return np.floor((self.as_of - self.last_member_comment_at) / SECONDS_IN_DAY)
+
+    @property
+    def community_mask(self) -> 'np.ndarray':
+        """Mask of issues authored by or last commented by community."""
+        return ~self.has_flags(self.AUTHORED_BY_MEMBER) | \
+            (self.has_flags(self.COMMENTED) & ~self.has_flags(self.LAST_COMMENTED_BY_MEMBER))
+
+    def counts(self, codes: 'np.ndarray', categories: List[str]) -> List[Tuple[str, int]]:
+        """Number of issues in each category, in order of first occurrence."""
+        counts = np.bincount(codes, minlength=len(categories))
+        return [(category, int(count)) for category, count in zip(categories, counts)]
+
+    def select(self, mask: Optional['np.ndarray'] = None,
+               descending: Optional['np.ndarray'] = None) -> List[IssueMeta]:
+        """Issues selected by mask in stable descending order of values."""
+        indices = np.arange(len(self.issues)) if mask is None else np.flatnonzero(mask)
+        if descending is not None:
+            indices = indices[np.argsort(-descending[indices], kind="stable")]
+        return [self.issues[index] for index in indices]
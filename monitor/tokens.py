@@ -0,0 +1,91 @@
+"""Pool of GitHub access tokens scheduled by remaining rate limit."""
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+import requests
+
+
+class TokenPool:
+    """Routes requests to token with most remaining rate limit.
+
+    Remaining quota and reset time of each token are taken from
+    ``X-RateLimit-*`` headers of its responses. Token is reserved for
+    every request in flight, so concurrent requests spread over tokens.
+    Token not used yet is assumed to have full ``limit``. Pool waits only
+    when every token is exhausted, until earliest reset.
+    """
+
+    def __init__(self, tokens: List[str], limit: int = 5000,
+                 clock: Callable[[], float] = time.time,
+                 sleep: Callable[[float], None] = time.sleep):
+        """Token pool.
+
+        Args:
+            tokens: GitHub access tokens
+            limit: assumed hourly limit of token not used yet
+            clock: current unix time
+            sleep: waits for specified number of seconds
+        """
+        if len(tokens) == 0:
+            raise ValueError("Token pool needs at least one token")
+        self.tokens = list(tokens)
+        self.limit = limit
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self.remaining: Dict[str, int] = {token: limit for token in self.tokens}
+        self.reset: Dict[str, Optional[float]] = {token: None for token in self.tokens}
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def _restore_reset_tokens(self, now: float):
+        """Restores full limit of tokens which reset time passed, must be called under lock."""
+        for token in self.tokens:
+            reset = self.reset[token]
+            if reset is not None and reset <= now:
+                self.remaining[token] = self.limit
+                self.reset[token] = None
+
+    def acquire(self) -> str:
+        """Reserves request on token with most headroom, waits if all tokens are exhausted."""
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._restore_reset_tokens(now)
+                token = max(self.tokens, key=lambda t: self.remaining[t])
+                if self.remaining[token] > 0:
+                    self.remaining[token] -= 1
+                    return token
+                resets = [reset for reset in self.reset.values() if reset is not None]
+                wait = min(resets) - now if resets else 0.0
+            self._sleep(max(0.0, wait) + 1)
+
+    def release(self, token: str):
+        """Returns reservation of request which got no response."""
+        with self._lock:
+            self.remaining[token] = min(self.limit, self.remaining[token] + 1)
+
+    def update(self, token: str, response: requests.Response):
+        """Updates quota of token from rate limit headers of its response."""
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        reset = response.headers.get("X-RateLimit-Reset")
+        with self._lock:
+            if remaining is None or not remaining.isdigit():
+                # response without rate limit, such as from cache, returns reservation
+                self.remaining[token] = min(self.limit, self.remaining[token] + 1)
+                return
+            reset = float(reset) if reset is not None and reset.isdigit() else None
+            if reset is not None and reset == self.reset[token]:
+                # responses of concurrent requests of same window can arrive out of order
+                self.remaining[token] = min(self.remaining[token], int(remaining))
+            else:
+                self.remaining[token] = int(remaining)
+            self.reset[token] = reset if reset is not None else self.reset[token]
+
+    def has_headroom(self) -> bool:
+        """Has any token remaining quota?"""
+        with self._lock:
+            self._restore_reset_tokens(self._clock())
+            return any(remaining > 0 for remaining in self.remaining.values())
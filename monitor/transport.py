@@ -0,0 +1,147 @@
+"""Transports sending http requests of monitor."""
+import gzip
+import json
+import threading
+import time
+from typing import Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+
+def request_key(method: str, url: str, payload: Optional[dict] = None) -> str:
+    """Key of request independent of order of query parameters and payload keys."""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    key = "{} {}".format(method.upper(), urlunsplit(parts._replace(query=query)))
+    if payload is not None:
+        key += " " + json.dumps(payload, sort_keys=True)
+    return key
+
+
+# pylint: disable=too-few-public-methods
+class HttpTransport:
+    """Sends requests in pooled session."""
+
+    def __init__(self, headers: Optional[Dict[str, str]] = None, pool_size: int = 10,
+                 timeout: Optional[float] = 30.0):
+        """Http transport.
+
+        Args:
+            headers: headers sent with every request
+            pool_size: number of pooled connections per host
+            timeout: seconds to wait for connection and for response data,
+                waits forever if None
+        """
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update(headers or {})
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Sends request.
+
+        Args:
+            method: http method
+            url: url
+            **kwargs: ``headers``, ``json`` payload and ``timeout`` of request,
+                timeout of transport by default
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.request(method, url, **kwargs)
+
+
+class RecordingTransport:
+    """Sends requests with wrapped transport and records exchanges to archive.
+
+    Archive is gzip compressed json lines file, one exchange per line
+    with status code, headers used by monitor and body of response.
+    Every exchange is appended as separate gzip member, so archive is
+    complete even if crawl is interrupted.
+    """
+
+    RECORDED_HEADERS: tuple = ("Content-Type", "ETag", "Last-Modified", "Link", "Retry-After",
+                               "X-RateLimit-Limit", "X-RateLimit-Remaining",
+                               "X-RateLimit-Reset")
+
+    def __init__(self, path: str, transport: Optional[HttpTransport] = None):
+        """Recording transport.
+
+        Args:
+            path: path of archive, overwritten if exists
+            transport: transport sending requests, http transport by default
+        """
+        self.path = path
+        self.transport = transport if transport is not None else HttpTransport()
+        self._lock = threading.Lock()
+        with gzip.open(self.path, "wt", encoding="utf-8"):
+            pass
+
+    def send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Sends request and records exchange."""
+        response = self.transport.send(method, url, **kwargs)
+        record = {"key": request_key(method, url, kwargs.get("json")),
+                  "status": response.status_code,
+                  "headers": {name: response.headers[name] for name in self.RECORDED_HEADERS
+                              if name in response.headers},
+                  "body": response.text}
+        line = json.dumps(record) + "\n"
+        with self._lock, gzip.open(self.path, "at", encoding="utf-8") as file:
+            file.write(line)
+        return response
+
+
+class ReplayTransport:
+    """Serves responses recorded by ``RecordingTransport`` without network.
+
+    Repeated requests are served recorded responses in order of recording,
+    last one is served once they are exhausted. Requests missing in archive
+    get ``404 Not Found`` response.
+    """
+
+    def __init__(self, path: str, latency: float = 0.0):
+        """Replay transport.
+
+        Args:
+            path: path of archive
+            latency: seconds every response is delayed by
+        """
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._responses: Dict[str, List[dict]] = {}
+        self._served: Dict[str, int] = {}
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            for line in file:
+                record = json.loads(line)
+                self._responses.setdefault(record["key"], []).append(record)
+
+    def __len__(self):
+        return sum(len(records) for records in self._responses.values())
+
+    def send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Serves recorded response to request."""
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+        key = request_key(method, url, kwargs.get("json"))
+        with self._lock:
+            records = self._responses.get(key)
+            if records:
+                index = self._served.get(key, 0)
+                self._served[key] = index + 1
+                record = records[min(index, len(records) - 1)]
+            else:
+                record = {"status": 404, "headers": {},
+                          "body": json.dumps({"message": "Not recorded"})}
+
+        response = requests.Response()
+        response.status_code = record["status"]
+        response.url = url
+        response.encoding = "utf-8"
+        response.headers = CaseInsensitiveDict(record["headers"])
+        response._content = record["body"].encode("utf-8")  # pylint: disable=protected-access
+        return response
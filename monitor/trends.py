@@ -0,0 +1,91 @@
+"""Historical trends of open issues snapshots."""
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from statistics import median
+from typing import List, Optional, Tuple
+
+from monitor.entities import GitHubAuthorAssociations
+from monitor.schema import read_snapshot
+from monitor.snapshots import SnapshotStore, json_snapshots, parse_snapshot_file_name
+
+AGE_BUCKETS: List[Tuple[Optional[int], str]] = [(30, "< 1 month"),
+                                                (90, "1-3 months"),
+                                                (365, "3-12 months"),
+                                                (365 * 3, "1-3 years"),
+                                                (None, "> 3 years")]
+
+
+def summarize_snapshot(records: List[dict], taken_at: datetime) -> dict:
+    """Summarizes snapshot of open issues.
+
+    Args:
+        records: issues records of snapshot
+        taken_at: date of snapshot
+
+    Returns:
+        open count, members/community split, age distribution and
+        days since last member comment statistics of snapshot
+    """
+    members = GitHubAuthorAssociations.members_associations()
+    ages = {label: 0 for _, label in AGE_BUCKETS}
+    days_since_member_comment = []
+    n_by_members = 0
+    n_pull_requests = 0
+    for record in records:
+        if record.get("author_association") in members:
+            n_by_members += 1
+        if record.get("pull_request"):
+            n_pull_requests += 1
+
+        age = record.get("days_since_create_date") or 0
+        for max_age, label in AGE_BUCKETS:
+            if max_age is None or age < max_age:
+                ages[label] += 1
+                break
+
+        if record.get("days_since_last_member_comment") is not None:
+            days_since_member_comment.append(record["days_since_last_member_comment"])
+
+    return {"date": taken_at.strftime("%Y-%m-%d"),
+            "n_open": len(records),
+            "n_by_members": n_by_members,
+            "n_by_community": len(records) - n_by_members,
+            "n_pull_requests": n_pull_requests,
+            "ages": ages,
+            "median_days_since_member_comment":
+                median(days_since_member_comment) if days_since_member_comment else None,
+            "n_never_commented_by_member": len(records) - len(days_since_member_comment)}
+
+
+def _summarize_file(path: str) -> dict:
+    """Loads and summarizes json snapshot file."""
+    _, taken_at = parse_snapshot_file_name(path)
+    return summarize_snapshot(read_snapshot(path), taken_at)
+
+
+def collect_trends(name: str,
+                   folder: Optional[str] = None,
+                   store: Optional[SnapshotStore] = None,
+                   max_workers: Optional[int] = None) -> List[dict]:
+    """Summaries of all snapshots of repository in chronological order.
+
+    Json snapshots are parsed in process pool and only their summaries are
+    sent back, snapshots from store are restored one by one, so only
+    few snapshots are in memory at a time.
+
+    Args:
+        name: name of repository
+        folder: folder of json snapshots, used if store is not specified
+        store: snapshot store
+        max_workers: number of processes parsing json snapshots
+
+    Returns:
+        summaries of snapshots
+    """
+    if store is not None:
+        return [summarize_snapshot(records, taken_at)
+                for taken_at, records in store.iter_snapshots(name)]
+
+    paths = json_snapshots(folder).get(name, [])
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_summarize_file, paths, chunksize=4))
@@ -2,6 +2,31 @@
 
 from abc import ABC,abstractmethod
 from typing import Optional, Union
+from urllib.parse import parse_qs, quote, urlencode, urlparse, urlunparse
+
+
+def _get_query_int(url: str, name: str) -> Optional[int]:
+    """Returns integer query parameter of url."""
+    values = parse_qs(urlparse(url).query).get(name)
+    return int(values[0]) if values and values[0].isdigit() else None
+
+
+def get_page(url: str) -> Optional[int]:
+    """Returns ``page`` query parameter of url."""
+    return _get_query_int(url, "page")
+
+
+def get_per_page(url: str) -> Optional[int]:
+    """Returns ``per_page`` query parameter of url."""
+    return _get_query_int(url, "per_page")
+
+
+def set_page(url: str, page: Union[str, int]) -> str:
+    """Returns url with ``page`` query parameter replaced."""
+    parts = urlparse(url)
+    query = parse_qs(parts.query)
+    query["page"] = [str(page)]
+    return urlunparse(parts._replace(query=urlencode(query, doseq=True)))
 
 
 class UrlsHelper(ABC):
@@ -18,10 +43,35 @@ class UrlsHelper(ABC):
                          repo: str, number: Union[str, int]) -> str:
         """Return url for comments for specified parameters."""
 
+    @abstractmethod
+    def get_updated_issues_url(self, account: str, repo: str, since: str,
+                               page: Optional[Union[str, int]] = None) -> str:
+        """Returns url for issues in any state updated since specified ISO time."""
+
+    @abstractmethod
+    def get_search_issues_url(self, query: str,
+                              page: Optional[Union[str, int]] = None) -> str:
+        """Returns url for search of issues and pull requests, newest first."""
+
+    @abstractmethod
+    def get_graphql_url(self) -> str:
+        """Returns url of GraphQL api."""
+
 
 class GitHubUrlsHelper(UrlsHelper):
     """Github API urls helper."""
 
+    def get_graphql_url(self) -> str:
+        """Returns url of GraphQL api."""
+        return "https://api.github.com/graphql"
+
+    def get_search_issues_url(self, query: str,
+                              page: Optional[Union[str, int]] = None) -> str:
+        """Returns url for search of issues and pull requests, newest first."""
+        page = page if page else 1
+        return "https://api.github.com/search/issues?q={query}&sort=created&order=desc" \
+               "&page={page}&per_page=100".format(query=quote(query), page=page)
+
     def get_comments_url(self, account: str, repo: str,
                          number: Union[str, int]) -> str:
         """Return url for comments for specified parameters."""
@@ -38,3 +88,13 @@ class GitHubUrlsHelper(UrlsHelper):
                "issues?page={page}&state=open&per_page=100".format(account=account,
                                                                    repo=repo,
                                                                    page=page)
+
+    def get_updated_issues_url(self, account: str, repo: str, since: str,
+                               page: Optional[Union[str, int]] = None) -> str:
+        """Returns url for issues in any state updated since specified ISO time."""
+        page = page if page else 1
+        return "https://api.github.com/repos/{account}/{repo}/" \
+               "issues?page={page}&state=all&since={since}&per_page=100".format(account=account,
+                                                                                repo=repo,
+                                                                                page=page,
+                                                                                since=since)
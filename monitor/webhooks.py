@@ -0,0 +1,88 @@
+"""GitHub webhook events applied to stored state of repositories."""
+import hashlib
+import hmac
+from typing import List, Optional, Tuple
+
+from monitor.state import RepoState, compact_comment, compact_issue
+
+EVENTS: List[str] = ["issues", "issue_comment"]
+CLOSING_ACTIONS: List[str] = ["closed", "deleted", "transferred"]
+
+
+def sign(secret: str, body: bytes) -> str:
+    """``X-Hub-Signature-256`` header value of body."""
+    digest = hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+    return "sha256={}".format(digest)
+
+
+def verify_signature(secret: str, body: bytes, signature: Optional[str]) -> bool:
+    """Is body signed by secret, as in ``X-Hub-Signature-256`` header of delivery?"""
+    if signature is None:
+        return False
+    return hmac.compare_digest(sign(secret, body), signature)
+
+
+def event_repository(payload: dict) -> Optional[Tuple[str, str]]:
+    """Account and name of repository of event."""
+    full_name = payload.get("repository", {}).get("full_name")
+    if full_name is None or "/" not in full_name:
+        return None
+    account, name = full_name.split("/", 1)
+    return account, name
+
+
+def _is_older(payload: dict, stored: Optional[dict]) -> bool:
+    """Was payload of issue or comment updated before stored one?"""
+    return stored is not None and payload.get("updated_at") is not None \
+        and stored.get("updated_at") is not None and payload["updated_at"] < stored["updated_at"]
+
+
+def apply_event(state: RepoState, event: str, payload: dict) -> bool:
+    """Applies ``issues`` or ``issue_comment`` event to state of repository.
+
+    Opened and changed issues replace stored issue keeping its comments,
+    closed ones are removed. Comments are added, replaced or removed by id.
+    Issue commented before it was stored is added with this comment only,
+    its other comments are fetched by next sync, as issue was updated since.
+    GitHub does not guarantee order of deliveries and redelivers them, so
+    issue or comment updated before stored one is not applied.
+
+    Args:
+        state: state of repository
+        event: name of event from ``X-GitHub-Event`` header
+        payload: payload of event
+
+    Returns:
+        was state changed by event
+    """
+    issue = payload.get("issue")
+    if event not in EVENTS or issue is None:
+        return False
+    number = str(issue.get("number"))
+    action = payload.get("action")
+    stored = state.issues.get(number)
+    changed = not _is_older(issue, stored["issue"] if stored is not None else None)
+
+    if (event == "issues" and action in CLOSING_ACTIONS) or issue.get("state") != "open":
+        return changed and state.issues.pop(number, None) is not None
+    entry = state.issues.setdefault(number, {"comments": []})
+    if changed:
+        entry["issue"] = compact_issue(issue)
+    if event == "issues":
+        return changed
+
+    comment = compact_comment(payload.get("comment", {}))
+    comments = entry["comments"]
+    index = next((i for i, stored in enumerate(comments)
+                  if stored.get("id") is not None and stored.get("id") == comment["id"]), None)
+    if action == "deleted":
+        if index is not None:
+            comments.pop(index)
+            changed = True
+    elif index is None:
+        comments.append(comment)
+        changed = True
+    elif not _is_older(comment, comments[index]):
+        comments[index] = comment
+        changed = True
+    return changed
@@ -0,0 +1,29 @@
+"""Tests for benchmarks fake server."""
+import unittest
+
+from benchmarks.server import FakeGitHubServer, LocalUrlsHelper
+from monitor import Monitor
+
+
+class TestFakeGitHubServer(unittest.TestCase):
+    """Tests monitor crawls fake server as GitHub api."""
+
+    def test_get_open_issues(self):
+        """Tests issues and paginated comments are served with link headers."""
+        with FakeGitHubServer(n_issues=120, n_comments=3, per_page=50) as server:
+            monitor = Monitor(urls=LocalUrlsHelper(server.url), max_workers=4)
+            issues = monitor.get_open_issues("MockQiskit", "mock-qiskit-terra", max_pages=3)
+
+            self.assertEqual([issue.number for issue in issues], list(range(120, 0, -1)))
+            self.assertTrue(all(issue.n_comments == 3 for issue in issues))
+            self.assertEqual(server.n_requests, 3 + 120)
+
+    def test_errors_and_rate_limit_are_retried(self):
+        """Tests failed and rate limited requests are retried by monitor."""
+        with FakeGitHubServer(n_issues=30, n_comments=1, error_rate=0.2,
+                              rate_limit=1000) as server:
+            monitor = Monitor(urls=LocalUrlsHelper(server.url), backoff_factor=0)
+            issues = monitor.get_open_issues("MockQiskit", "mock-qiskit-terra")
+
+            self.assertEqual(len(issues), 30)
+            self.assertGreater(server.n_requests, 1 + 30)
@@ -0,0 +1,64 @@
+"""Tests for http cache."""
+import os
+import tempfile
+import unittest
+
+import httpretty
+
+from monitor import Monitor
+from monitor.cache import HttpCache
+from .test_utils import MockUrlsHelper
+
+
+class TestHttpCache(unittest.TestCase):
+    """Tests on-disk http cache."""
+
+    def setUp(self) -> None:
+        self.urls = MockUrlsHelper()
+        self.cache_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        resources_dir = "{}/resources".format(os.path.dirname(os.path.abspath(__file__)))
+        with open("{}/comments.json".format(resources_dir), "r") as file:
+            self.comments_response_data = file.read()
+
+    def tearDown(self) -> None:
+        self.cache_dir.cleanup()
+
+    # pylint: disable=protected-access
+    @httpretty.activate(verbose=True, allow_net_connect=False)
+    def test_not_modified_served_from_cache(self):
+        """Tests conditional request and serving body on 304."""
+        httpretty.register_uri(httpretty.GET,
+                               self.urls.get_comments_url("MockQiskit", "mock-qiskit-terra", 42),
+                               responses=[
+                                   httpretty.Response(body=self.comments_response_data,
+                                                      status=200,
+                                                      adding_headers={"ETag": '"abc"'}),
+                                   httpretty.Response(body="", status=304)
+                               ])
+
+        monitor = Monitor(urls=self.urls, cache_dir=self.cache_dir.name)
+        first = monitor._get_comments("MockQiskit", "mock-qiskit-terra", 42)
+        second = monitor._get_comments("MockQiskit", "mock-qiskit-terra", 42)
+
+        self.assertEqual(httpretty.last_request().headers.get("If-None-Match"), '"abc"')
+        self.assertEqual(len(first), 6)
+        self.assertEqual([c.user for c in first], [c.user for c in second])
+
+    def test_eviction_and_invalidation(self):
+        """Tests size bound and invalidation of cache."""
+        cache = HttpCache(self.cache_dir.name, max_size=1024)
+
+        class _Response:  # pylint: disable=too-few-public-methods
+            headers = {"ETag": '"etag"'}
+            text = "x" * 400
+
+        for i in range(5):
+            cache.store("http://localhost/{}".format(i), _Response())
+        self.assertLessEqual(cache.size, 1024)
+        cached = [i for i in range(5)
+                  if cache.conditional_headers("http://localhost/{}".format(i))]
+        self.assertEqual(len(cached), 2)
+
+        cache.invalidate()
+        self.assertEqual(cache.conditional_headers("http://localhost/{}".format(cached[0])), {})
+        self.assertEqual(cache.size, 0)
@@ -0,0 +1,71 @@
+"""Tests for monitor daemon."""
+import json
+import tempfile
+import unittest
+from urllib.request import urlopen
+from urllib.error import HTTPError
+
+from benchmarks.server import FakeGitHubServer, LocalUrlsHelper
+from monitor import Monitor
+from monitor.daemon import MonitorDaemon
+
+
+class TestMonitorDaemon(unittest.TestCase):
+    """Tests refreshing and serving of reports."""
+
+    def setUp(self) -> None:
+        self.folder = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.server = FakeGitHubServer(n_issues=30, n_comments=2).start()
+        self.now = [1000.0]
+        self.daemon = MonitorDaemon(Monitor(urls=LocalUrlsHelper(self.server.url), max_workers=4),
+                                    ["https://github.com/MockQiskit/mock-qiskit-terra",
+                                     "https://github.com/MockQiskit/mock-qiskit-aer"],
+                                    interval=600, intervals={"mock-qiskit-aer": 60},
+                                    port=0, state_dir=self.folder.name,
+                                    clock=lambda: self.now[0])
+
+    def tearDown(self) -> None:
+        self.daemon.stop()
+        self.server.stop()
+        self.folder.cleanup()
+
+    def get(self, path: str) -> str:
+        """Body of response of daemon."""
+        with urlopen(self.daemon.url + path) as response:
+            return response.read().decode("utf-8")
+
+    def test_refresh_schedule(self):
+        """Tests each repository is refreshed on its own schedule."""
+        self.assertEqual(self.daemon.refresh_due(), ["mock-qiskit-terra", "mock-qiskit-aer"])
+        self.assertEqual(self.daemon.refresh_due(), [])
+        self.assertEqual(self.daemon.seconds_to_next_refresh(), 60)
+
+        self.now[0] += 60
+        n_requests = self.server.n_requests
+        repo = self.daemon.repos["mock-qiskit-aer"]
+        self.assertEqual(self.daemon.refresh_due(), ["mock-qiskit-aer"])
+        self.assertGreater(self.server.n_requests, n_requests)
+        self.assertIs(self.daemon.repos["mock-qiskit-aer"], repo)
+        self.assertEqual(len(repo.issues), 30)
+
+    def test_serves_reports(self):
+        """Tests reports are served from memory without requests to GitHub."""
+        self.daemon.refresh_due()
+        self.daemon.start()
+        n_requests = self.server.n_requests
+
+        full_report = self.get("/report.md")
+        self.assertIn("MockQiskit/mock-qiskit-terra", full_report)
+        self.assertLess(full_report.index("mock-qiskit-terra"),
+                        full_report.index("mock-qiskit-aer"))
+        self.assertIn("MockQiskit/mock-qiskit-aer", self.get("/repos/mock-qiskit-aer.md"))
+
+        repo_report = json.loads(self.get("/repos/mock-qiskit-terra.json"))
+        self.assertEqual(repo_report["n_open_issues"], 30)
+        self.assertEqual(len(repo_report["open_issues_sorted_by_update_date"]), 30)
+        self.assertEqual([r["name"] for r in json.loads(self.get("/report.json"))["repos"]],
+                         ["mock-qiskit-terra", "mock-qiskit-aer"])
+        self.assertIn("mock-qiskit-aer", json.loads(self.get("/health"))["refreshed_at"])
+        with self.assertRaises(HTTPError):
+            self.get("/repos/unknown.md")
+        self.assertEqual(self.server.n_requests, n_requests)
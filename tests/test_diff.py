@@ -0,0 +1,75 @@
+"""Tests for snapshots diff."""
+import unittest
+
+from monitor.diff import SnapshotDiff
+from monitor.entities import RepoMeta, GitHubAuthorAssociations
+from monitor.report import RepoReport
+from .test_report import generate_issues
+
+
+class TestSnapshotDiff(unittest.TestCase):
+    """Tests diff of snapshots."""
+
+    def setUp(self) -> None:
+        self.issues = generate_issues(5, 2)
+        self.previous = [issue.to_dict() for issue in self.issues]
+        current = [dict(record) for record in self.previous[1:]]
+        current.append(dict(self.previous[0], number="42", title="New issue"))
+        current[0].update(n_comments=4, last_commented_by="AwesomeUser",
+                          last_commenter_type=GitHubAuthorAssociations.NONE)
+        current[1].update(days_since_last_update=15)
+        self.current = current
+
+    def test_diff(self):
+        """Tests change sets of diff."""
+        diff = SnapshotDiff(self.previous, self.current, stale_days=14,
+                            previous_date="2022-09-06")
+
+        self.assertTrue(diff.has_changes)
+        self.assertEqual([r["number"] for r in diff.opened], ["42"])
+        self.assertEqual([r["number"] for r in diff.closed], ["0"])
+        self.assertEqual([r["number"] for r in diff.newly_commented_by_community], ["1"])
+        self.assertEqual([r["number"] for r in diff.newly_stale], ["2"])
+        self.assertEqual([(r["number"], delta) for r, delta in diff.comment_deltas], [("1", 2)])
+        self.assertEqual([(r["number"], old, new) for r, old, new in diff.commenter_type_changes],
+                         [("1", GitHubAuthorAssociations.MEMBER, GitHubAuthorAssociations.NONE)])
+        self.assertFalse(SnapshotDiff(self.previous, self.previous).has_changes)
+
+    def test_new_comment_by_same_community_user(self):
+        """Tests new comment of last community commenter is detected."""
+        previous = dict(self.previous[2], last_commented_by="AwesomeUser",
+                        last_commenter_type=GitHubAuthorAssociations.NONE)
+        more_comments = dict(previous, n_comments=previous["n_comments"] + 1)
+        later_comment = dict(previous, comments=previous["comments"][:-1] + [
+            dict(previous["comments"][-1], created_at="2100-01-01T00:00:00")])
+        member_comment = dict(more_comments,
+                              last_commenter_type=GitHubAuthorAssociations.MEMBER)
+
+        for current, commented in [(more_comments, True), (later_comment, True),
+                                   (member_comment, False), (previous, False)]:
+            diff = SnapshotDiff([previous], [current])
+            self.assertEqual(len(diff.newly_commented_by_community), int(commented))
+
+    def test_diff_of_streamed_snapshot(self):
+        """Tests records added one by one give same change sets."""
+        expected = SnapshotDiff(self.previous, self.current, stale_days=14)
+        diff = SnapshotDiff(self.previous, stale_days=14)
+        for record in self.current:
+            diff.add(record)
+        self.assertEqual(diff.to_dict(), expected.to_dict())
+
+    def test_delta_section(self):
+        """Tests delta section is rendered in repo report."""
+        diff = SnapshotDiff(self.previous, self.current, previous_date="2022-09-06")
+        report = RepoReport(RepoMeta("MockQiskit", "mock-qiskit-terra", issues=self.issues),
+                            diff=diff)
+        report_md = report.render_report()
+
+        self.assertIn("Changes since 2022-09-06", report_md)
+        self.assertIn("| Opened | [https://github.com/MockQiskit/mock-qiskit-terra/issues/42]",
+                      report_md)
+        self.assertIn("| Comments +2 |", report_md)
+        self.assertIn("| Last commenter MEMBER → NONE |", report_md)
+        self.assertNotIn("Changes since",
+                         RepoReport(RepoMeta("MockQiskit", "mock-qiskit-terra",
+                                             issues=self.issues)).render_report())
@@ -1,7 +1,9 @@
 """Tests entities."""
+import pickle
 import unittest
+from datetime import datetime, timedelta
 
-from monitor.entities import IssueMeta, IssueCommentMeta, GitHubAuthorAssociations
+from monitor.entities import IssueMeta, IssueCommentMeta, GitHubAuthorAssociations, RepoMeta
 
 
 class TestEntities(unittest.TestCase):
@@ -27,6 +29,7 @@ class TestEntities(unittest.TestCase):
 
     def test_issue_to_dict(self):
         """Tests converting to dict."""
+        as_of = datetime(2022, 9, 13, 12, 30)
         issue = IssueMeta(title="Awesome issue",
                           number=42,
                           state="open",
@@ -36,26 +39,161 @@ class TestEntities(unittest.TestCase):
                               IssueCommentMeta(user="AwesomeCommentor",
                                                author_association=
                                                GitHubAuthorAssociations.FIRST_TIME_CONTRIBUTOR,
-                                               user_type="User")
+                                               user_type="User",
+                                               created_at=as_of - timedelta(days=1),
+                                               updated_at=as_of - timedelta(days=1))
                           ],
-                          user="AwesomeAuthor")
+                          user="AwesomeAuthor",
+                          created_at=as_of - timedelta(days=3),
+                          updated_at=as_of - timedelta(days=1),
+                          as_of=as_of)
 
         reference_dict = {
             'assignee': 'AwesomePerson',
             'author_association': 'FIRST_TIME_CONTRIBUTOR',
-            'days_since_create_date': 0,
+            'comments': [{'author_association': 'FIRST_TIME_CONTRIBUTOR',
+                          'created_at': '2022-09-12T12:30:00',
+                          'updated_at': '2022-09-12T12:30:00',
+                          'user': 'AwesomeCommentor',
+                          'user_type': 'User'}],
+            'created_at': '2022-09-10T12:30:00',
+            'days_since_create_date': 3,
             'days_since_last_member_comment': None,
-            'days_since_last_update': 0,
-            'days_since_last_user_comment': 0,
+            'days_since_last_update': 1,
+            'days_since_last_user_comment': 1,
             'is_authored_by_or_last_commented_by_community': True,
             'labels': [],
             'last_commented_by': 'AwesomeCommentor',
             'last_commenter_type': 'FIRST_TIME_CONTRIBUTOR',
+            'n_comments': 1,
             'number': 42,
             'pull_request': None,
             'state': 'open',
             'title': 'Awesome issue',
+            'updated_at': '2022-09-12T12:30:00',
             'user': 'AwesomeAuthor'
         }
 
         self.assertEqual(issue.to_dict(), reference_dict)
+
+        restored = IssueMeta.from_dict(issue.to_dict(), as_of=as_of)
+        self.assertEqual(restored.to_dict(), reference_dict)
+        self.assertEqual(restored.created_at, issue.created_at)
+        self.assertEqual(restored.comments[0].created_at, issue.comments[0].created_at)
+
+        with self.assertRaises(ValueError):
+            IssueMeta.from_dict({key: value for key, value in reference_dict.items()
+                                 if key not in ["comments", "created_at", "updated_at"]})
+
+    def test_issue_comments_summary(self):
+        """Tests derived values are measured against reference time."""
+        as_of = datetime(2022, 9, 13)
+        issue = IssueMeta(title="Awesome issue",
+                          number=42,
+                          state="open",
+                          assignee=None,
+                          author_association=GitHubAuthorAssociations.MEMBER,
+                          comments=[
+                              IssueCommentMeta(user="AwesomeMember",
+                                               author_association=GitHubAuthorAssociations.MEMBER,
+                                               user_type="User",
+                                               created_at=as_of - timedelta(days=10)),
+                              IssueCommentMeta(user="AwesomeContributor",
+                                               author_association=
+                                               GitHubAuthorAssociations.CONTRIBUTOR,
+                                               user_type="User",
+                                               created_at=as_of - timedelta(days=3)),
+                              IssueCommentMeta(user="AwesomeBot",
+                                               author_association=GitHubAuthorAssociations.NONE,
+                                               user_type="Bot",
+                                               created_at=as_of - timedelta(days=5))
+                          ],
+                          user="AwesomeAuthor",
+                          created_at=as_of - timedelta(days=30),
+                          updated_at=as_of - timedelta(days=2),
+                          as_of=as_of)
+
+        self.assertEqual(issue.days_since_create_date, 30)
+        self.assertEqual(issue.days_since_last_update, 2)
+        self.assertEqual(issue.days_since_last_member_comment, 10)
+        self.assertEqual(issue.days_since_last_user_comment, 3)
+        self.assertEqual(issue.last_commented_by, "AwesomeContributor")
+        self.assertEqual(issue.last_commenter_type, GitHubAuthorAssociations.CONTRIBUTOR)
+        self.assertTrue(issue.is_authored_by_or_last_commented_by_community)
+        self.assertFalse(hasattr(issue, "__dict__"))
+
+        issue.comments = []
+        self.assertEqual(issue.last_commented_by, "")
+        self.assertIsNone(issue.days_since_last_member_comment)
+        self.assertFalse(issue.is_authored_by_or_last_commented_by_community)
+
+    def test_repo_indexes(self):
+        """Tests issues are selected by intersection of repo indexes."""
+        def issue(number: int, assignee, association: str, labels):
+            return IssueMeta(title="Issue {}".format(number), number=number, state="open",
+                             assignee=assignee, author_association=association, comments=[],
+                             user="Author {}".format(number % 2), labels=labels)
+
+        bug = issue(1, None, GitHubAuthorAssociations.NONE, ["bug"])
+        feature = issue(2, None, GitHubAuthorAssociations.CONTRIBUTOR, ["feature"])
+        assigned = issue(3, "AwesomeAssignee", GitHubAuthorAssociations.NONE, ["bug"])
+        members_bug = issue(4, None, GitHubAuthorAssociations.MEMBER, ["bug", "good first issue"])
+        repo = RepoMeta("MockQiskit", "mock-qiskit-terra",
+                        issues=[bug, feature, assigned, members_bug])
+
+        self.assertEqual(repo.select(label="bug", assignee=None), [bug, members_bug])
+        self.assertEqual(repo.select(label="bug", assignee=None,
+                                     author_association=[GitHubAuthorAssociations.NONE,
+                                                         GitHubAuthorAssociations.CONTRIBUTOR]),
+                         [bug])
+        self.assertEqual(repo.select(label="wontfix"), [])
+        self.assertEqual(repo.select(), repo.issues)
+        self.assertEqual(repo.counts("label"), {"bug": 3, "feature": 1, "good first issue": 1})
+        self.assertEqual(repo.counts("author"), {"Author 1": 2, "Author 0": 2})
+
+        self.assertEqual(repo.select(author_association=[GitHubAuthorAssociations.CONTRIBUTOR,
+                                                         GitHubAuthorAssociations.NONE]),
+                         [bug, feature, assigned])
+        self.assertEqual(repo.select(label=["good first issue", "feature", "bug"],
+                                     assignee=None), [bug, feature, members_bug])
+
+        repo.remove_issue(bug)
+        repo.remove_issue(bug)
+        self.assertEqual(repo.issues, [feature, assigned, members_bug])
+        self.assertEqual(repo.counts("assignee"), {None: 2, "AwesomeAssignee": 1})
+        self.assertEqual(repo.select(label="bug", author_association=GitHubAuthorAssociations.NONE),
+                         [assigned])
+
+        repo.add_issue(bug)
+        copy = pickle.loads(pickle.dumps(repo))
+        self.assertEqual([i.number for i in copy.select(label="bug", assignee=None)], [4, 1])
+        self.assertEqual([i.number for i in copy.select(label=["feature", "bug"], assignee=None)],
+                         [2, 4, 1])
+
+        for issue in [feature, assigned, members_bug]:
+            repo.remove_issue(issue)
+        repo.add_issue(feature)
+        self.assertEqual(repo.issues, [bug, feature])
+        self.assertEqual(repo.select(label=["feature", "bug"],
+                                     author_association=[GitHubAuthorAssociations.NONE,
+                                                         GitHubAuthorAssociations.CONTRIBUTOR]),
+                         [bug, feature])
+        self.assertEqual(repo.counts("label"), {"bug": 1, "feature": 1})
+
+    def test_repo_select_order(self):
+        """Tests issues selected by any of values are in order they were added."""
+        def issue(number: int, association: str, labels):
+            return IssueMeta(title="Issue {}".format(number), number=number, state="open",
+                             assignee=None, author_association=association, comments=[],
+                             user="Author", labels=labels)
+
+        repo = RepoMeta("MockQiskit", "mock-qiskit-terra", issues=[
+            issue(1, GitHubAuthorAssociations.NONE, ["feature"]),
+            issue(2, GitHubAuthorAssociations.NONE, ["bug"]),
+            issue(3, GitHubAuthorAssociations.MEMBER, ["bug"]),
+            issue(4, GitHubAuthorAssociations.MEMBER, ["bug"])
+        ] + [issue(number, GitHubAuthorAssociations.NONE, ["docs"]) for number in range(5, 10)])
+
+        selected = repo.select(label=["bug", "feature"],
+                               author_association=GitHubAuthorAssociations.NONE)
+        self.assertEqual([i.number for i in selected], [1, 2])
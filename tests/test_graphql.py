@@ -0,0 +1,112 @@
+"""Tests for GraphQL fetch backend."""
+import json
+import os
+import unittest
+
+import httpretty
+import requests
+
+from monitor import Monitor
+from monitor.entities import IssueMeta, IssueCommentMeta
+from .test_utils import MockUrlsHelper
+
+
+def to_graphql_actor(user: dict) -> dict:
+    """Converts REST api user to GraphQL actor."""
+    login = user.get("login")
+    if user.get("type") == "Bot":
+        login = login.replace("[bot]", "")
+    return {"login": login, "__typename": user.get("type")}
+
+
+class MockGraphQLServer:  # pylint: disable=too-few-public-methods
+    """Stand-in GraphQL api serving REST fixtures in pages."""
+
+    def __init__(self, issues: list, comments: list, page_size: int = 30):
+        self.page_size = page_size
+        self.comments = [{"authorAssociation": c["author_association"],
+                          "createdAt": c["created_at"],
+                          "updatedAt": c["updated_at"],
+                          "author": to_graphql_actor(c["user"])} for c in comments]
+        self.items = {"issues": [], "pullRequests": []}
+        for issue in issues:
+            connection = "pullRequests" if "pull_request" in issue else "issues"
+            self.items[connection].append(self._to_node(issue))
+        self.n_requests = 0
+
+    def _to_node(self, issue: dict) -> dict:
+        """Converts REST api issue to GraphQL node."""
+        assignee = issue.get("assignee")
+        return {"number": issue["number"],
+                "title": issue["title"],
+                "state": issue["state"].upper(),
+                "createdAt": issue["created_at"],
+                "updatedAt": issue["updated_at"],
+                "authorAssociation": issue["author_association"],
+                "author": to_graphql_actor(issue["user"]),
+                "assignees": {"nodes": [{"login": assignee["login"]}] if assignee else []},
+                "labels": {"nodes": [{"name": label["name"]} for label in issue["labels"]]},
+                "comments": {"totalCount": len(self.comments), "nodes": self.comments}}
+
+    def __call__(self, request, uri, response_headers):
+        """Serves GraphQL request."""
+        self.n_requests += 1
+        payload = json.loads(request.body)
+        connection = "pullRequests" if "pullRequests(" in payload["query"] else "issues"
+        start = int(payload["variables"]["cursor"] or 0)
+        end = start + self.page_size
+        nodes = self.items[connection][start:end]
+        page_info = {"hasNextPage": end < len(self.items[connection]),
+                     "endCursor": str(end)}
+        body = {"data": {"repository": {"items": {"pageInfo": page_info, "nodes": nodes}}}}
+        return [200, response_headers, json.dumps(body)]
+
+
+class TestGraphQLBackend(unittest.TestCase):
+    """Tests GraphQL fetch backend."""
+
+    def setUp(self) -> None:
+        self.urls = MockUrlsHelper()
+        self.monitor = Monitor(urls=self.urls, backend="graphql")
+        resources_dir = "{}/resources".format(os.path.dirname(os.path.abspath(__file__)))
+        with open("{}/issues.json".format(resources_dir), "r") as file:
+            self.issues = json.load(file)
+        with open("{}/comments.json".format(resources_dir), "r") as file:
+            self.comments = json.load(file)
+
+    @httpretty.activate(verbose=True, allow_net_connect=False)
+    def test_get_open_issues(self):
+        """Tests open issues are built from nested GraphQL response."""
+        server = MockGraphQLServer(self.issues, self.comments)
+        httpretty.register_uri(httpretty.POST, self.urls.get_graphql_url(), body=server)
+
+        open_issues = self.monitor.get_open_issues("MockQiskit", "mock-qiskit-terra")
+
+        self.assertEqual(len(open_issues), 100)
+        # ceil(n / 30) pages for issues and for pull requests instead of 1 + 100 requests
+        n_issues = len(server.items["issues"])
+        n_pulls = len(server.items["pullRequests"])
+        self.assertEqual(server.n_requests, -(-n_issues // 30) + -(-n_pulls // 30))
+        self.assertEqual(sorted(i.number for i in open_issues),
+                         sorted(i["number"] for i in self.issues))
+        self.assertEqual(len([i for i in open_issues if i.pull_request]), n_pulls)
+        self.assertTrue(all(isinstance(i, IssueMeta) for i in open_issues))
+
+        by_number = {i["number"]: i for i in self.issues}
+        for issue in open_issues:
+            reference = by_number[issue.number]
+            self.assertEqual(issue.user, reference["user"]["login"])
+            self.assertEqual(issue.author_association, reference["author_association"])
+            self.assertEqual(len(issue.comments), 6)
+            self.assertTrue(all(isinstance(c, IssueCommentMeta) for c in issue.comments))
+            self.assertEqual([c.user for c in issue.comments],
+                             [c["user"]["login"] for c in self.comments])
+
+    @httpretty.activate(verbose=True, allow_net_connect=False)
+    def test_query_errors(self):
+        """Tests errors of GraphQL query are raised."""
+        httpretty.register_uri(httpretty.POST, self.urls.get_graphql_url(),
+                               body=json.dumps({"errors": [{"message": "Bad query"}]}))
+
+        with self.assertRaises(requests.HTTPError):
+            self.monitor.get_open_issues("MockQiskit", "mock-qiskit-terra")
@@ -0,0 +1,87 @@
+"""Tests for run metrics."""
+import json
+import os
+import tempfile
+import unittest
+
+import httpretty
+
+from monitor import Monitor
+from monitor.entities import RepoMeta
+from monitor.metrics import Metrics, endpoint_of
+from monitor.report import FullReport
+from .test_report import generate_issues
+from .test_utils import MockUrlsHelper
+
+
+class TestMetrics(unittest.TestCase):
+    """Tests instrumentation of monitor and reports."""
+
+    def setUp(self) -> None:
+        self.urls = MockUrlsHelper()
+        self.folder = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        resources_dir = "{}/resources".format(os.path.dirname(os.path.abspath(__file__)))
+        with open("{}/issues.json".format(resources_dir), "r") as file:
+            self.issues_response_data = file.read()
+
+    def tearDown(self) -> None:
+        self.folder.cleanup()
+
+    @httpretty.activate(verbose=True, allow_net_connect=False)
+    def test_monitor_metrics(self):
+        """Tests requests, retries, failures and rate limit are recorded."""
+        httpretty.register_uri(httpretty.GET,
+                               self.urls.get_issues_url("MockQiskit", "mock-qiskit-terra"),
+                               responses=[
+                                   httpretty.Response(body="", status=502),
+                                   httpretty.Response(body=self.issues_response_data,
+                                                      status=200,
+                                                      adding_headers={
+                                                          "X-RateLimit-Remaining": "4999"})
+                               ])
+        httpretty.register_uri(httpretty.GET,
+                               self.urls.get_comments_url("MockQiskit", "mock-qiskit-terra", 42),
+                               body='{"message": "Not Found"}',
+                               status=404)
+
+        events = []
+        metrics = Metrics(hook=lambda event, fields: events.append(event), n_slowest=3)
+        monitor = Monitor(urls=self.urls, backoff_factor=0, metrics=metrics)
+        with self.assertLogs("monitor.metrics", level="WARNING"):
+            issues = monitor.get_open_issues("MockQiskit", "mock-qiskit-terra", max_pages=1)
+
+        summary = metrics.summary()
+        self.assertEqual(summary["requests"], 2 + len(issues))
+        self.assertEqual(summary["retries"], 1)
+        self.assertEqual(summary["failures"], len(issues))
+        self.assertEqual(summary["endpoints"]["/issues"]["requests"], 2)
+        self.assertEqual(summary["rate_limit_remaining"], 4999)
+        self.assertEqual(len(summary["slowest_issues"]), 3)
+        self.assertIn("crawl", summary["phases"])
+        self.assertIn("entities", summary["phases"])
+        self.assertIn("retry", events)
+
+        prometheus = metrics.to_prometheus()
+        self.assertIn('monitor_endpoint_retries_total{endpoint="/issues"} 1', prometheus)
+        self.assertIn("monitor_rate_limit_remaining 4999", prometheus)
+        self.assertEqual(prometheus.count('monitor_slowest_issue_seconds{issue="MockQiskit/'), 3)
+
+        metrics.write(self.folder.name, "Report")
+        with open(os.path.join(self.folder.name, "Report.metrics.json"), "r") as file:
+            self.assertEqual(json.load(file)["retries"], 1)
+        self.assertTrue(os.path.exists(os.path.join(self.folder.name, "Report.prom")))
+
+    def test_report_metrics(self):
+        """Tests sections evaluation and rendering are timed separately."""
+        metrics = Metrics()
+        repo = RepoMeta("MockQiskit", "mock-qiskit-terra", issues=generate_issues(10, 2))
+        FullReport([repo, repo], metrics=metrics).render_report()
+
+        self.assertEqual(metrics.phases["report_sections"]["calls"], 2)
+        self.assertEqual(metrics.phases["render"]["calls"], 2)
+
+    def test_endpoint_of(self):
+        """Tests numbers in url path are replaced by placeholder."""
+        self.assertEqual(endpoint_of("https://api.github.com/repos/Qiskit/qiskit-terra/"
+                                     "issues/1234/comments?per_page=100&page=2"),
+                         "/repos/Qiskit/qiskit-terra/issues/{number}/comments")
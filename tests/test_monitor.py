@@ -1,10 +1,18 @@
 """Tests for monitor class."""
+import json
 import os
+import tempfile
+import tracemalloc
 import unittest
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
 import httpretty
+import requests
 
+from benchmarks.server import FakeGitHubServer, LocalUrlsHelper
 from monitor import Monitor
 from monitor.entities import IssueMeta, IssueCommentMeta
+from monitor.storage import IssueStore
 from .test_utils import MockUrlsHelper
 
 
@@ -41,3 +49,356 @@ class TestMonitor(unittest.TestCase):
         for issue in open_issues:
             self.assertEqual(len(issue.comments), 6)
             self.assertTrue(all(isinstance(c, IssueCommentMeta) for c in issue.comments))
+        self.assertEqual(open_issues[0].labels, ["type: feature request", "mod: algorithms"])
+
+    @httpretty.activate(verbose=True, allow_net_connect=False)
+    def test_get_open_issues_concurrently(self):
+        """Tests concurrent comments fetching preserves issues order."""
+        httpretty.register_uri(httpretty.GET,
+                               self.urls.get_issues_url(self.account, self.repo),
+                               body=self.issues_response_data,
+                               status=200)
+        httpretty.register_uri(httpretty.GET,
+                               self.urls.get_comments_url(self.account, self.repo, 42),
+                               body=self.comments_response_data,
+                               status=200)
+
+        monitor = Monitor(urls=self.urls, max_workers=4)
+        open_issues = monitor.get_open_issues(self.account, self.repo, max_pages=2)
+        expected_numbers = [issue["number"] for issue in json.loads(self.issues_response_data)]
+        self.assertEqual([i.number for i in open_issues], expected_numbers * 2)
+        for issue in open_issues:
+            self.assertEqual(len(issue.comments), 6)
+
+    @httpretty.activate(verbose=True, allow_net_connect=False)
+    def test_retries_on_rate_limit_and_server_errors(self):
+        """Tests monitor resumes after rate limit and server error responses."""
+        httpretty.register_uri(httpretty.GET,
+                               self.urls.get_issues_url(self.account, self.repo),
+                               responses=[
+                                   httpretty.Response(body="", status=503),
+                                   httpretty.Response(body="", status=403,
+                                                      adding_headers={
+                                                          "X-RateLimit-Remaining": "0",
+                                                          "Retry-After": "0"}),
+                                   httpretty.Response(body=self.issues_response_data,
+                                                      status=200)
+                               ])
+        httpretty.register_uri(httpretty.GET,
+                               self.urls.get_comments_url(self.account, self.repo, 42),
+                               body=self.comments_response_data,
+                               status=200)
+
+        monitor = Monitor(urls=self.urls, max_retries=3, backoff_factor=0)
+        open_issues = monitor.get_open_issues(self.account, self.repo, max_pages=1)
+        self.assertEqual(len(open_issues), 100)
+
+    @httpretty.activate(verbose=True, allow_net_connect=False)
+    def test_retries_on_connection_errors(self):
+        """Tests monitor retries requests failed by connection errors and timeouts."""
+        httpretty.register_uri(httpretty.GET,
+                               self.urls.get_issues_url(self.account, self.repo),
+                               body=self.issues_response_data,
+                               status=200)
+        httpretty.register_uri(httpretty.GET,
+                               self.urls.get_comments_url(self.account, self.repo, 42),
+                               body=self.comments_response_data,
+                               status=200)
+
+        monitor = Monitor(urls=self.urls, max_retries=2, backoff_factor=0)
+        send = monitor.transport.send
+        errors = [requests.ConnectionError("reset"), requests.ReadTimeout("stalled")]
+
+        def flaky_send(method: str, url: str, **kwargs) -> requests.Response:
+            if errors:
+                raise errors.pop(0)
+            return send(method, url, **kwargs)
+
+        with mock.patch.object(monitor.transport, "send", side_effect=flaky_send):
+            open_issues = monitor.get_open_issues(self.account, self.repo, max_pages=1)
+        self.assertEqual(len(open_issues), 100)
+        self.assertEqual(monitor.metrics.summary()["retries"], 2)
+
+    def test_raises_on_timeout_after_retries(self):
+        """Tests stalled request times out and is raised after retries."""
+        with FakeGitHubServer(n_issues=1, n_comments=0, latency=0.5) as server:
+            monitor = Monitor(urls=LocalUrlsHelper(server.url), max_retries=1,
+                              backoff_factor=0, timeout=0.1)
+            with self.assertRaises(requests.Timeout):
+                monitor.get_open_issues(self.account, self.repo, max_pages=1)
+            self.assertEqual(server.n_requests, 2)
+
+    @httpretty.activate(verbose=True, allow_net_connect=False)
+    def test_raises_on_failed_issues_page(self):
+        """Tests failed page of issues is not silently dropped."""
+        httpretty.register_uri(httpretty.GET,
+                               self.urls.get_issues_url(self.account, self.repo),
+                               body="",
+                               status=502)
+
+        monitor = Monitor(urls=self.urls, max_retries=1, backoff_factor=0)
+        with self.assertRaises(requests.HTTPError):
+            monitor.get_open_issues(self.account, self.repo, max_pages=1)
+
+    @httpretty.activate(verbose=True, allow_net_connect=False)
+    def test_sync_open_issues(self):
+        """Tests incremental sync fetches only updated issues and drops closed ones."""
+        issues = json.loads(self.issues_response_data)
+        closed_issue = dict(issues[0], state="closed")
+        updated_issue = dict(issues[1], title="Updated title")
+
+        httpretty.register_uri(httpretty.GET,
+                               self.urls.get_issues_url(self.account, self.repo),
+                               responses=[
+                                   httpretty.Response(body=self.issues_response_data, status=200),
+                                   httpretty.Response(body="[]", status=200)
+                               ])
+        httpretty.register_uri(httpretty.GET,
+                               self.urls.get_updated_issues_url(self.account, self.repo, ""),
+                               responses=[
+                                   httpretty.Response(body=json.dumps([closed_issue,
+                                                                       updated_issue]),
+                                                      status=200),
+                                   httpretty.Response(body="[]", status=200)
+                               ])
+        httpretty.register_uri(httpretty.GET,
+                               self.urls.get_comments_url(self.account, self.repo, 42),
+                               body=self.comments_response_data,
+                               status=200)
+
+        with tempfile.TemporaryDirectory() as folder:
+            open_issues = self.monitor.sync_open_issues(self.account, self.repo, folder=folder)
+            self.assertEqual(len(open_issues), 100)
+
+            requests_before_sync = len(httpretty.latest_requests())
+            open_issues = self.monitor.sync_open_issues(self.account, self.repo, folder=folder)
+            # two pages of updated issues and comments of single updated open issue
+            self.assertEqual(len(httpretty.latest_requests()) - requests_before_sync, 3)
+
+        self.assertEqual(len(open_issues), 99)
+        self.assertNotIn(closed_issue["number"], [i.number for i in open_issues])
+        self.assertIn("Updated title", [i.title for i in open_issues])
+        for issue in open_issues:
+            self.assertEqual(len(issue.comments), 6)
+
+    @httpretty.activate(verbose=True, allow_net_connect=False)
+    def test_pages_fan_out_by_link_header(self):
+        """Tests pages of issues and comments are fetched up to last page from Link header."""
+        httpretty.register_uri(httpretty.GET,
+                               self.urls.get_issues_url(self.account, self.repo),
+                               body=self.issues_response_data,
+                               adding_headers={
+                                   "Link": '<http://localhost/issues?page=2>; rel="next", '
+                                           '<http://localhost/issues?page=3>; rel="last"'},
+                               status=200)
+        httpretty.register_uri(httpretty.GET,
+                               self.urls.get_comments_url(self.account, self.repo, 42),
+                               body=self.comments_response_data,
+                               adding_headers={
+                                   "Link": '<http://localhost/comments?page=2>; rel="next", '
+                                           '<http://localhost/comments?page=2>; rel="last"'},
+                               status=200)
+
+        monitor = Monitor(urls=self.urls, max_workers=4)
+        open_issues = monitor.get_open_issues(self.account, self.repo)
+
+        issues_requests = [r for r in httpretty.latest_requests() if r.path.startswith("/issues")]
+        self.assertEqual(len(issues_requests), 3)
+        self.assertEqual(len(open_issues), 300)
+        for issue in open_issues:
+            self.assertEqual(len(issue.comments), 12)
+
+    @httpretty.activate(verbose=True, allow_net_connect=False)
+    def test_pipeline(self):
+        """Tests issues are streamed page by page into snapshot and report."""
+        httpretty.register_uri(httpretty.GET,
+                               self.urls.get_issues_url(self.account, self.repo),
+                               body=self.issues_response_data,
+                               adding_headers={
+                                   "Link": '<http://localhost/issues?page=2>; rel="next", '
+                                           '<http://localhost/issues?page=3>; rel="last"'},
+                               status=200)
+        httpretty.register_uri(httpretty.GET,
+                               self.urls.get_comments_url(self.account, self.repo, 42),
+                               body=self.comments_response_data,
+                               status=200)
+
+        monitor = Monitor(urls=self.urls, max_workers=2)
+        streamed = monitor.iter_open_issues(self.account, self.repo)
+        first = next(streamed)
+        self.assertEqual(len(first.comments), 6)
+        issues_requests = [r for r in httpretty.latest_requests() if r.path.startswith("/issues")]
+        self.assertLessEqual(len(issues_requests), 3)
+        self.assertEqual(len([first] + list(streamed)), 300)
+
+        with tempfile.TemporaryDirectory() as folder:
+            monitor = Monitor(urls=self.urls, max_workers=2, pipeline=True, snapshots_dir=folder)
+            repos_urls = ["https://github.com/{}/{}".format(self.account, self.repo)]
+            monitor.render_report(repos_urls)
+            report = monitor._build_report(repos_urls)  # pylint: disable=protected-access
+
+            self.assertEqual(report.repos[0].issues, [])
+            self.assertEqual(report.store.n_open_issues(self.repo), 300)
+            issues = [issue for _, issue in report.store.open_issues_sorted_by_update_date(
+                self.repo, limit=300)]
+            self.assertEqual(len(issues), 300)
+            self.assertTrue(all(len(i.comments) == 6 and i.last_commented_by for i in issues))
+            self.assertIn(self.repo, monitor.render_report(repos_urls))
+            self.assertFalse(report.diffs[self.repo].has_changes)
+            records = monitor.snapshots.load(self.repo)
+            self.assertEqual(len(records), 300)
+            self.assertTrue(all(len(r["comments"]) == 6 for r in records))
+
+    def test_pipeline_memory(self):
+        """Tests peak memory of streamed report does not grow with number of issues."""
+        peaks = []
+        for n_issues in [300, 300, 900]:
+            with FakeGitHubServer(n_issues=n_issues, n_comments=3) as server, \
+                    tempfile.TemporaryDirectory() as folder, \
+                    mock.patch.object(IssueStore, "BATCH_SIZE", 50):
+                monitor = Monitor(urls=LocalUrlsHelper(server.url), max_workers=8,
+                                  pipeline=True, database=os.path.join(folder, "monitor.db"))
+                run_peaks = []
+                for _ in range(2):
+                    tracemalloc.start()
+                    report = monitor._build_report(  # pylint: disable=protected-access
+                        ["https://github.com/{}/{}".format(self.account, self.repo)])
+                    with open(os.devnull, "w") as file:
+                        report.write_report(file)
+                    run_peaks.append(tracemalloc.get_traced_memory()[1])
+                    tracemalloc.stop()
+                self.assertIsNotNone(report.diffs.get(self.repo))
+                peaks.append(run_peaks)
+                monitor.snapshots.close()
+        for run in range(2):
+            self.assertLess(peaks[2][run], peaks[1][run] * 1.5)
+
+    @httpretty.activate(verbose=True, allow_net_connect=False)
+    def test_account_open_issues_by_search(self):
+        """Tests search results are split by creation date and grouped by repository."""
+        items = json.loads(self.issues_response_data)
+        for i, item in enumerate(items):
+            name = "mock-qiskit-terra" if i % 3 else "mock-qiskit-aer"
+            item["repository_url"] = "https://api.github.com/repos/MockQiskit/{}".format(name)
+
+        def search(_request, uri, response_headers):
+            query = parse_qs(urlparse(uri).query)
+            created = [part[len("created:"):].split("..")
+                       for part in query["q"][0].split() if part.startswith("created:")]
+            repos = ["https://api.github.com/repos/" + part[len("repo:"):]
+                     for part in query["q"][0].split() if part.startswith("repo:")]
+            found = [item for item in items
+                     if (not created or created[0][0] <= item["created_at"] <= created[0][1])
+                     and (not repos or item["repository_url"] in repos)]
+            page = int(query["page"][0])
+            payload = {"total_count": len(found), "items": found[(page - 1) * 10:page * 10]}
+            return [200, response_headers, json.dumps(payload)]
+
+        httpretty.register_uri(httpretty.GET, "http://localhost/search", body=search)
+        httpretty.register_uri(httpretty.GET,
+                               self.urls.get_comments_url(self.account, self.repo, 42),
+                               body=self.comments_response_data,
+                               status=200)
+
+        monitor = Monitor(urls=self.urls, max_workers=4)
+        with mock.patch.object(Monitor, "SEARCH_LIMIT", 30), \
+                mock.patch.object(Monitor, "SEARCH_INTERVAL", 0):
+            repos = monitor.get_account_open_issues("MockQiskit")
+
+        self.assertEqual([repo.name for repo in repos], ["mock-qiskit-aer", "mock-qiskit-terra"])
+        self.assertEqual(sum(len(repo.issues) for repo in repos), 100)
+        for repo in repos:
+            created = [issue.created_at for issue in repo.issues]
+            self.assertEqual(created, sorted(created, reverse=True))
+            self.assertTrue(all(len(issue.comments) == 6 for issue in repo.issues))
+
+        httpretty.reset()
+        httpretty.register_uri(httpretty.GET, "http://localhost/search", body=search)
+        httpretty.register_uri(httpretty.GET,
+                               self.urls.get_comments_url(self.account, self.repo, 42),
+                               body=self.comments_response_data,
+                               status=200)
+        with mock.patch.object(Monitor, "SEARCH_INTERVAL", 0):
+            repos = monitor.get_account_open_issues("MockQiskit", repos=["mock-qiskit-aer"])
+        self.assertEqual([repo.name for repo in repos], ["mock-qiskit-aer"])
+        self.assertEqual(len(repos[0].issues), 34)
+        queries = [r.querystring["q"][0] for r in httpretty.latest_requests()
+                   if r.path.startswith("/search")]
+        self.assertEqual(queries, ["is:open repo:MockQiskit/mock-qiskit-aer"] * 4)
+
+    @httpretty.activate(verbose=True, allow_net_connect=False)
+    def test_latest_comments_are_fetched_backwards(self):
+        """Tests comments are fetched from last page until needed comments are found."""
+        bot = {"user": {"login": "bot[bot]", "type": "Bot"}, "author_association": "NONE",
+               "created_at": "2021-07-20T12:35:04Z", "updated_at": "2021-07-20T12:35:04Z"}
+        member = dict(bot, user={"login": "member", "type": "User"},
+                      author_association="MEMBER")
+        pages = {1: [bot] * 100, 2: [bot] * 99 + [member], 3: [bot] * 50}
+
+        def comments(_request, uri, response_headers):
+            page = int(parse_qs(urlparse(uri).query)["page"][0])
+            return [200, response_headers, json.dumps(pages[page])]
+
+        issues = json.loads(self.issues_response_data)[:2]
+        issues[0]["comments"] = 250
+        issues[1]["comments"] = 0
+        httpretty.register_uri(httpretty.GET,
+                               self.urls.get_issues_url(self.account, self.repo),
+                               body=json.dumps(issues),
+                               status=200)
+        httpretty.register_uri(httpretty.GET, "http://localhost/comments", body=comments)
+
+        urls = mock.Mock(wraps=self.urls)
+        urls.get_comments_url.return_value = "http://localhost/comments?per_page=100"
+        monitor = Monitor(urls=urls, tail_comments=True)
+        open_issues = monitor.get_open_issues(self.account, self.repo, max_pages=1)
+
+        comments_pages = [parse_qs(urlparse(r.path).query)["page"][0]
+                          for r in httpretty.latest_requests() if r.path.startswith("/comments")]
+        self.assertEqual(comments_pages, ["3", "2"])
+        self.assertEqual(len(open_issues[0].comments), 150)
+        self.assertEqual(open_issues[0].n_comments, 250)
+        self.assertEqual(open_issues[0].last_commented_by, "bot[bot]")
+        self.assertIsNotNone(open_issues[0].days_since_last_member_comment)
+        self.assertEqual(open_issues[1].comments, [])
+        self.assertEqual(open_issues[1].n_comments, 0)
+
+    @httpretty.activate(verbose=True, allow_net_connect=False)
+    def test_latest_comments_with_stale_count(self):
+        """Tests last page is corrected by ``Link`` header if number of comments is stale."""
+        bot = {"user": {"login": "bot[bot]", "type": "Bot"}, "author_association": "NONE",
+               "created_at": "2021-07-20T12:35:04Z", "updated_at": "2021-07-20T12:35:04Z"}
+        member = dict(bot, user={"login": "member", "type": "User"},
+                      author_association="MEMBER", created_at="2021-07-21T12:35:04Z")
+        pages = {1: [bot] * 100, 2: [bot] * 99 + [member], 3: [bot] * 49 + [member]}
+
+        def comments(_request, uri, response_headers):
+            page = int(parse_qs(urlparse(uri).query)["page"][0])
+            if page not in pages:
+                return [502, response_headers, ""]
+            links = ['<http://localhost/comments?per_page=100&page=3>; rel="last"']
+            if page < 3:
+                links.insert(0, '<http://localhost/comments?per_page=100&page={}>; rel="next"'
+                             .format(page + 1))
+            response_headers["Link"] = ", ".join(links)
+            return [200, response_headers, json.dumps(pages[page])]
+
+        issues = json.loads(self.issues_response_data)[:2]
+        issues[0]["comments"] = 150
+        issues[1]["comments"] = 350
+        httpretty.register_uri(httpretty.GET,
+                               self.urls.get_issues_url(self.account, self.repo),
+                               body=json.dumps(issues),
+                               status=200)
+        httpretty.register_uri(httpretty.GET, "http://localhost/comments", body=comments)
+
+        urls = mock.Mock(wraps=self.urls)
+        urls.get_comments_url.return_value = "http://localhost/comments?per_page=100"
+        monitor = Monitor(urls=urls, tail_comments=True, max_retries=0)
+        with self.assertLogs("monitor.metrics", level="WARNING") as logs:
+            open_issues = monitor.get_open_issues(self.account, self.repo, max_pages=1)
+
+        self.assertEqual(len(open_issues[0].comments), 50)
+        self.assertEqual(open_issues[0].n_comments, 250)
+        self.assertEqual(open_issues[0].last_commented_by, "member")
+        self.assertIn("http://localhost/comments?per_page=100&page=4", logs.output[0])
@@ -1,10 +1,12 @@
 """Tests for report."""
+import io
 import unittest
 from datetime import datetime, timedelta
-from typing import List
+from typing import List, Optional
 
 from monitor.entities import (IssueMeta, IssueCommentMeta,
                               RepoMeta, GitHubAuthorAssociations)
+from monitor.metrics import Metrics
 from monitor.report import RepoReport, FullReport
 
 
@@ -25,9 +27,11 @@ def generate_issue_with_associations(author_association: str,
 
 
 def generate_issues(n_issues: int,
-                    n_comments_per_issue: int) -> List[IssueMeta]:
-    """Generates mock data for tests."""
-    now = datetime.now()
+                    n_comments_per_issue: int,
+                    as_of: Optional[datetime] = None) -> List[IssueMeta]:
+    """Generates mock data for tests, updated daily before ``as_of``, now by default."""
+    as_of = as_of if as_of is not None else datetime.now()
+    now = as_of
 
     issues = []
     for i in range(n_issues):
@@ -51,7 +55,8 @@ def generate_issues(n_issues: int,
                           comments=comments,
                           created_at=now,
                           updated_at=now,
-                          user="AwesomeAuthor {}".format(i))
+                          user="AwesomeAuthor {}".format(i),
+                          as_of=as_of)
         issues.append(issue)
 
     return issues
@@ -107,6 +112,26 @@ class TestReport(unittest.TestCase):
         self.assertEqual(len(report.issues_with_community_association), 0)
 
 
+    def test_label_and_assignee_breakdowns(self):
+        """Tests breakdowns by label and assignee."""
+        issues = generate_issues(30, 2)
+        for i, issue in enumerate(issues):
+            issue.labels = ["bug"] if i % 2 == 0 else ["feature"]
+            issue.assignee = None if i % 3 == 0 else issue.assignee
+            issue.author_association = GitHubAuthorAssociations.NONE if i % 5 == 0 \
+                else issue.author_association
+        report = RepoReport(RepoMeta("MockQiskit", "mock-qiskit-terra", issues=issues))
+
+        self.assertEqual(report.issues_by_label, {"bug": 15, "feature": 15})
+        self.assertEqual(report.issues_by_assignee, {"AwesomeAssignee": 20, None: 10})
+        self.assertEqual([i.number for i in report.unassigned_community_issues],
+                         ["15"])
+        self.assertEqual([i.number for i in report.stale_issues(label="bug", assignee=None)],
+                         ["24", "18"])
+        self.assertIn("Unassigned community issues", report.render_report())
+        self.assertEqual(report.to_dict()["issues_by_label"], {"bug": 15, "feature": 15})
+
+
 class TestFullReport(unittest.TestCase):
     """Tests full report."""
 
@@ -120,3 +145,20 @@ class TestFullReport(unittest.TestCase):
         """Tests full report."""
         report_md = self.full_report.render_report()
         self.assertTrue(report_md)
+
+    def test_streaming_full_report(self):
+        """Tests streamed full report is same as rendered one."""
+        file = io.StringIO()
+        self.full_report.write_report(file)
+        self.assertEqual(file.getvalue(), self.full_report.render_report())
+        self.assertIs(RepoReport(self.full_report.repos[0]).template,
+                      RepoReport(self.full_report.repos[1]).template)
+
+    def test_parallel_full_report(self):
+        """Tests full report rendered in process pool is same as rendered in one process."""
+        metrics = Metrics()
+        parallel_report = FullReport(self.full_report.repos, as_of=self.full_report.as_of,
+                                     metrics=metrics, processes=2)
+        self.assertEqual(parallel_report.render_report(), self.full_report.render_report())
+        self.assertEqual(metrics.phases["render"]["calls"], 2)
+        self.assertEqual(metrics.phases["report_sections"]["calls"], 2)
@@ -0,0 +1,78 @@
+"""Tests for snapshots schema."""
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+from monitor.entities import RepoMeta
+from monitor.monitor import Monitor
+from monitor.report import FullReport
+from monitor.schema import (SCHEMA_VERSION, SnapshotWriter, read_snapshot,
+                            records_to_issues, write_snapshot)
+from .test_report import generate_issues
+from .test_utils import MockUrlsHelper
+
+
+class TestSchema(unittest.TestCase):
+    """Tests versioned json snapshots."""
+
+    def setUp(self) -> None:
+        self.folder = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.taken_at = datetime(2022, 9, 13, 10, 0)
+        self.issues = generate_issues(10, 3)
+        for issue in self.issues:
+            issue.as_of = self.taken_at
+        self.path = os.path.join(self.folder.name, "mock-qiskit-terra_{}.json".format(
+            self.taken_at.strftime("%m-%d-%Y-%H-%M")))
+
+    def tearDown(self) -> None:
+        self.folder.cleanup()
+
+    def test_read_snapshot_versions(self):
+        """Tests snapshots of both schema versions are read."""
+        write_snapshot(self.path, self.issues)
+        with open(self.path, "r") as file:
+            self.assertEqual(json.load(file)["schema_version"], SCHEMA_VERSION)
+        records = read_snapshot(self.path)
+        self.assertEqual(records, [issue.to_dict() for issue in self.issues])
+
+        restored = records_to_issues(records, as_of=self.taken_at)
+        self.assertEqual([issue.to_dict() for issue in restored], records)
+
+        legacy_records = [{key: value for key, value in record.items()
+                           if key not in ["comments", "created_at", "updated_at"]}
+                          for record in records]
+        with open(self.path, "w") as file:
+            json.dump(legacy_records, file)
+        self.assertEqual(read_snapshot(self.path), legacy_records)
+
+        with open(self.path, "w") as file:
+            json.dump({"schema_version": SCHEMA_VERSION + 1, "issues": []}, file)
+        with self.assertRaises(ValueError):
+            read_snapshot(self.path)
+
+    def test_snapshot_writer(self):
+        """Tests snapshot written record by record is same as written at once."""
+        records = [issue.to_dict() for issue in self.issues]
+        with SnapshotWriter(self.path) as writer:
+            for record in records:
+                writer.write(record)
+        self.assertEqual(read_snapshot(self.path), records)
+
+        with self.assertRaises(RuntimeError):
+            with SnapshotWriter(self.path) as writer:
+                writer.write(records[0])
+                raise RuntimeError("Interrupted")
+        self.assertEqual(read_snapshot(self.path), records)
+        self.assertEqual(os.listdir(self.folder.name), [os.path.basename(self.path)])
+
+    def test_render_report_from_snapshots(self):
+        """Tests report rendered from snapshot is same as report of fetched issues."""
+        write_snapshot(self.path, self.issues)
+        monitor = Monitor(urls=MockUrlsHelper())
+        report = monitor.render_report_from_snapshots(
+            ["https://github.com/MockQiskit/mock-qiskit-terra"], resources=self.folder.name)
+
+        repo = RepoMeta("MockQiskit", "mock-qiskit-terra", issues=self.issues)
+        self.assertEqual(report, FullReport([repo], as_of=self.taken_at).render_report())
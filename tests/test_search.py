@@ -0,0 +1,55 @@
+"""Tests for search api crawl."""
+import json
+import time
+import unittest
+from typing import List
+from unittest import mock
+
+import requests
+
+from monitor.search import MAX_QUERY_LENGTH, AccountSearch, account_queries
+
+
+class TestSearch(unittest.TestCase):
+    """Search tests."""
+
+    def test_account_queries(self):
+        """Tests repositories are searched in batches of qualifiers fitting query length."""
+        self.assertEqual(account_queries("Qiskit"), ["is:open user:Qiskit"])
+        self.assertEqual(account_queries("Qiskit", ["qiskit-terra", "qiskit-aer"]),
+                         ["is:open repo:Qiskit/qiskit-terra repo:Qiskit/qiskit-aer"])
+        self.assertEqual(account_queries("Qiskit", []), [])
+
+        repos = ["qiskit-repository-{}".format(i) for i in range(30)]
+        queries = account_queries("Qiskit", repos)
+        self.assertGreater(len(queries), 1)
+        self.assertTrue(all(len(query) + len(" created:2008-01-01T00:00:00Z..2022-09-01T00:00:00Z")
+                            <= MAX_QUERY_LENGTH for query in queries))
+        self.assertEqual([part[len("repo:Qiskit/"):] for query in queries
+                          for part in query.split() if part.startswith("repo:")], repos)
+
+    def test_pages_are_fetched_apart(self):
+        """Tests pages of search results are fetched one after another, interval apart."""
+        requested: List[float] = []
+
+        def get(url: str) -> requests.Response:
+            requested.append(time.monotonic())
+            page = int(url.split("page=")[1])
+            response = requests.Response()
+            response.status_code = 200
+            response._content = json.dumps({  # pylint: disable=protected-access
+                "total_count": 25,
+                "items": [{"number": number, "created_at": "2022-09-01T00:00:00Z"}
+                          for number in range((page - 1) * 10, min(page * 10, 25))]
+            }).encode("utf-8")
+            return response
+
+        search = AccountSearch(get, "{}?page={}".format, interval=0.05)
+        with mock.patch("monitor.search.time.sleep", wraps=time.sleep) as sleep:
+            total, items = search.pages("is:open user:Qiskit")
+        self.assertEqual(total, 25)
+        self.assertEqual([item["number"] for item in items], list(range(25)))
+        self.assertEqual(len(requested), 3)
+        self.assertEqual(sleep.call_count, 2)
+        self.assertTrue(all(later - earlier >= 0.05
+                            for earlier, later in zip(requested, requested[1:])))
@@ -0,0 +1,89 @@
+"""Tests for snapshot store."""
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from monitor.entities import IssueMeta
+from monitor.snapshots import SnapshotStore, import_json_snapshots
+from .test_report import generate_issues
+
+
+class TestSnapshotStore(unittest.TestCase):
+    """Tests delta-encoded snapshot store."""
+
+    def setUp(self) -> None:
+        self.folder = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.snapshots = []
+        issues = [issue.to_dict() for issue in generate_issues(10, 2, as_of=datetime(2022, 9, 1))]
+        for i in range(5):
+            # one issue closed, one opened and one updated per snapshot
+            taken_at = datetime(2022, 9, 1) + timedelta(days=7 * i)
+            issues = issues[1:] + [dict(issues[0], number="new {}".format(i))]
+            issues[3] = dict(issues[3], title="Updated {}".format(i))
+            issues = [IssueMeta.from_dict(issue, as_of=taken_at).to_dict() for issue in issues]
+            self.snapshots.append((taken_at, issues))
+
+    def tearDown(self) -> None:
+        self.folder.cleanup()
+
+    def test_save_and_load(self):
+        """Tests any snapshot is restored from base and deltas."""
+        store = SnapshotStore(os.path.join(self.folder.name, "store"), base_interval=3)
+        for taken_at, issues in self.snapshots:
+            store.save("mock-qiskit-terra", issues, taken_at=taken_at)
+
+        self.assertEqual(store.names(), ["mock-qiskit-terra"])
+        self.assertEqual(store.dates("mock-qiskit-terra"), [d for d, _ in self.snapshots])
+        for taken_at, issues in self.snapshots:
+            self.assertEqual(store.load("mock-qiskit-terra", taken_at + timedelta(hours=1)),
+                             issues)
+        self.assertEqual(store.load("mock-qiskit-terra"), self.snapshots[-1][1])
+        self.assertEqual(store.load("mock-qiskit-terra", datetime(2021, 1, 1)), [])
+        self.assertEqual([issues for _, issues in store.iter_snapshots("mock-qiskit-terra")],
+                         [issues for _, issues in self.snapshots])
+
+    def test_import_json_snapshots(self):
+        """Tests import of json snapshots."""
+        for taken_at, issues in self.snapshots:
+            file_name = "mock-qiskit-terra_{}.json".format(taken_at.strftime("%m-%d-%Y-%H-%M"))
+            with open(os.path.join(self.folder.name, file_name), "w") as file:
+                json.dump(issues, file)
+
+        store = SnapshotStore(os.path.join(self.folder.name, "store"))
+        self.assertEqual(import_json_snapshots(store, self.folder.name),
+                         {"mock-qiskit-terra": 5})
+        self.assertEqual(import_json_snapshots(store, self.folder.name),
+                         {"mock-qiskit-terra": 0})
+        self.assertEqual(store.load("mock-qiskit-terra"), self.snapshots[-1][1])
+
+    def test_delta_of_unchanged_issues(self):
+        """Tests delta has no unchanged issues as date of snapshots advances."""
+        store = SnapshotStore(os.path.join(self.folder.name, "store"))
+        taken_at, issues = self.snapshots[0]
+        store.save("mock-qiskit-terra", issues, taken_at=taken_at)
+        later = taken_at + timedelta(days=30)
+        records = [IssueMeta.from_dict(issue, as_of=later).to_dict() for issue in issues]
+        records[2] = dict(records[2], title="Updated")
+        store.save("mock-qiskit-terra", records, taken_at=later)
+
+        index = store._index("mock-qiskit-terra")  # pylint: disable=protected-access
+        _, delta = list(store._iter_records("mock-qiskit-terra",  # pylint: disable=protected-access
+                                            index))[-1]
+        self.assertEqual([record["number"] for record in delta["upsert"]],
+                         [records[2]["number"]])
+        self.assertNotIn("days_since_last_update", delta["upsert"][0])
+        self.assertEqual(store.load("mock-qiskit-terra"), records)
+        self.assertEqual(store.load("mock-qiskit-terra", taken_at), issues)
+
+        # records of schema version 1 have only days counted as of date of snapshot
+        legacy = [{"number": 1, "title": "Legacy", "days_since_last_update": 3,
+                   "days_since_last_member_comment": None}]
+        store.save("qiskit-legacy", legacy, taken_at=taken_at)
+        store.save("qiskit-legacy", [dict(legacy[0], days_since_last_update=10)],
+                   taken_at=taken_at + timedelta(days=7))
+        _, delta = list(store._iter_records(  # pylint: disable=protected-access
+            "qiskit-legacy", store._index("qiskit-legacy")))[-1]  # pylint: disable=protected-access
+        self.assertEqual(delta["upsert"], [])
+        self.assertEqual(store.load("qiskit-legacy")[0]["days_since_last_update"], 10)
@@ -0,0 +1,134 @@
+"""Tests for SQLite issue store."""
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from monitor import Monitor
+from monitor.diff import SnapshotDiff
+from monitor.entities import GitHubAuthorAssociations, RepoMeta
+from monitor.report import FullReport, RepoReport
+from monitor.snapshots import load_latest_snapshot
+from monitor.storage import IssueStore
+from .test_report import generate_issues
+
+
+class TestIssueStore(unittest.TestCase):
+    """Tests store of issues and report sections queries."""
+
+    def setUp(self) -> None:
+        self.folder = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.store = IssueStore(os.path.join(self.folder.name, "monitor.db"))
+        self.taken_at = datetime(2022, 9, 13, 10, 0)
+        self.issues = generate_issues(30, 3)
+        for i, issue in enumerate(self.issues):
+            issue.updated_at = self.taken_at - timedelta(days=100 * i + 1, hours=i)
+            for comment in issue.comments:
+                comment.created_at = comment.updated_at = issue.updated_at
+            if i % 3 == 0:
+                issue.author_association = GitHubAuthorAssociations.NONE
+            if i % 4 == 0:
+                issue.comments = []
+            if i % 5 == 0:
+                issue.assignee = None
+            issue.labels = ["bug"] if i % 2 == 0 else ["bug", "feature"]
+            issue.as_of = self.taken_at
+
+    def tearDown(self) -> None:
+        self.store.close()
+        self.folder.cleanup()
+
+    def test_snapshots_history(self):
+        """Tests store keeps snapshots history as snapshot store does."""
+        records = [issue.to_dict() for issue in self.issues]
+        self.store.save("mock-qiskit-terra", records[1:], taken_at=self.taken_at)
+        self.store.save("mock-qiskit-terra", records, taken_at=self.taken_at + timedelta(days=7))
+
+        self.assertEqual(self.store.names(), ["mock-qiskit-terra"])
+        self.assertEqual(self.store.dates("mock-qiskit-terra"),
+                         [self.taken_at, self.taken_at + timedelta(days=7)])
+        self.assertEqual(self.store.load("mock-qiskit-terra", self.taken_at), records[1:])
+        self.assertEqual([len(r) for _, r in self.store.iter_snapshots("mock-qiskit-terra")],
+                         [29, 30])
+        self.assertEqual(self.store.n_open_issues("mock-qiskit-terra"), 30)
+
+        self.store.save("mock-qiskit-terra", records[:5], taken_at=self.taken_at)
+        self.assertEqual(self.store.n_open_issues("mock-qiskit-terra"), 30)
+
+    def test_summaries(self):
+        """Tests summaries of indexed issues are same as of snapshot records."""
+        records = [issue.to_dict() for issue in self.issues]
+        self.store.save("qiskit-terra", records, taken_at=self.taken_at)
+        summaries = list(self.store.summaries("qiskit-terra", as_of=self.taken_at))
+        self.assertEqual(summaries, [SnapshotDiff.summarize(record) for record in records])
+        self.assertEqual(SnapshotDiff(summaries, records[1:]).to_dict(),
+                         SnapshotDiff(records, records[1:]).to_dict())
+
+    def test_report_sections(self):
+        """Tests queries return same sections as report of issues."""
+        self.store.save("mock-qiskit-terra", [issue.to_dict() for issue in self.issues],
+                        taken_at=self.taken_at)
+        report = RepoReport(RepoMeta("MockQiskit", "mock-qiskit-terra", issues=self.issues),
+                            as_of=self.taken_at)
+        name = "mock-qiskit-terra"
+
+        self.assertEqual(self.store.n_open_issues(name), report.n_open_issues)
+        self.assertEqual(self.store.n_issues_by_members(name), report.n_issues_by_members)
+        self.assertEqual(self.store.n_issues_by_users(name), report.n_issues_by_users)
+        self.assertEqual(self.store.top_author_associations(name),
+                         report.top_author_associations)
+        self.assertEqual(len(self.store.top_authors(name)), 5)
+        self.assertEqual(self.store.issues_by_label(name), report.issues_by_label)
+        self.assertEqual(self.store.issues_by_assignee(name), report.issues_by_assignee)
+        for section in ["old_updated_issues", "issues_with_community_association",
+                        "days_since_last_comment_by_member",
+                        "open_issues_sorted_by_update_date", "unassigned_community_issues"]:
+            stored = list(getattr(self.store, section)(name, as_of=self.taken_at))
+            self.assertEqual([issue.number for _, issue in stored],
+                             [issue.number for issue in getattr(report, section)], section)
+            self.assertEqual([issue.to_dict() for _, issue in stored],
+                             [issue.to_dict() for issue in getattr(report, section)], section)
+
+    def test_report_from_store(self):
+        """Tests report sections are answered by store if it is specified."""
+        self.store.save("mock-qiskit-terra", [issue.to_dict() for issue in self.issues],
+                        taken_at=self.taken_at)
+        repo = RepoMeta("MockQiskit", "mock-qiskit-terra", issues=self.issues)
+        expected = RepoReport(repo, as_of=self.taken_at)
+        report = RepoReport(RepoMeta("MockQiskit", "mock-qiskit-terra", issues=[]),
+                            as_of=self.taken_at, store=self.store)
+
+        self.assertEqual(report.to_dict(), expected.to_dict())
+        self.assertEqual(report.render_report(), expected.render_report())
+        full_report = FullReport([RepoMeta("MockQiskit", "mock-qiskit-terra", issues=[])],
+                                 as_of=self.taken_at, store=self.store, processes=1)
+        self.assertIn(expected.render_report(), full_report.render_report())
+
+    def test_sections_across_repositories(self):
+        """Tests sections are sliced across all repositories with limit."""
+        records = [issue.to_dict() for issue in self.issues]
+        self.store.save("mock-qiskit-terra", records, taken_at=self.taken_at)
+        self.store.save("mock-qiskit-aer", records[:10], taken_at=self.taken_at)
+
+        self.assertEqual(self.store.n_open_issues(), 40)
+        stale = self.store.old_updated_issues(as_of=self.taken_at, limit=3)
+        self.assertEqual([(name, issue.number) for name, issue in list(stale)],
+                         [("mock-qiskit-terra", "29"), ("mock-qiskit-terra", "28"),
+                          ("mock-qiskit-terra", "27")])
+        community = self.store.issues_with_community_association("mock-qiskit-aer",
+                                                                 as_of=self.taken_at)
+        self.assertTrue(all(issue.is_authored_by_or_last_commented_by_community
+                            for _, issue in community))
+
+    def test_monitor_database(self):
+        """Tests database is used by monitor in place of snapshots."""
+        path = os.path.join(self.folder.name, "monitor.db")
+        monitor = Monitor(database=path)
+        repo = RepoMeta("MockQiskit", "mock-qiskit-terra", issues=self.issues)
+        monitor._save_snapshot(repo)  # pylint: disable=protected-access
+
+        taken_at, records = load_latest_snapshot("mock-qiskit-terra", store=monitor.snapshots)
+        self.assertIsNotNone(taken_at)
+        self.assertEqual(records, [issue.to_dict() for issue in self.issues])
+        self.assertEqual(IssueStore(path).n_open_issues("mock-qiskit-terra"), 30)
+        self.assertIs(monitor._report_store(), monitor.snapshots)  # pylint: disable=protected-access
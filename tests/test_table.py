@@ -0,0 +1,48 @@
+"""Tests for columnar issues table."""
+import unittest
+from datetime import datetime, timedelta
+
+from monitor.entities import RepoMeta, GitHubAuthorAssociations
+from monitor.report import RepoReport
+from .test_report import generate_issues, generate_issue_with_associations
+
+try:
+    import numpy  # pylint: disable=unused-import
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+
+@unittest.skipUnless(HAS_NUMPY, "numpy is not installed")
+class TestIssueTable(unittest.TestCase):
+    """Tests columnar report computations match default ones."""
+
+    def setUp(self) -> None:
+        as_of = datetime.now()
+        issues = generate_issues(20, 3)
+        for i, issue in enumerate(issues):
+            issue.updated_at = as_of - timedelta(days=(i * 97) % 1500)
+            issue.user = "AwesomeAuthor {}".format(i % 4)
+            issue.author_association = GitHubAuthorAssociations.all()[i % 5]
+        issues.append(generate_issue_with_associations(
+            author_association=GitHubAuthorAssociations.MEMBER,
+            comment_association=GitHubAuthorAssociations.NONE))
+        self.repo = RepoMeta("MockQiskit", "mock-qiskit-terra", issues=issues)
+        self.as_of = as_of
+
+    def test_columnar_report(self):
+        """Tests columnar report sections are same as default ones."""
+        report = RepoReport(self.repo, as_of=self.as_of)
+        columnar_report = RepoReport(self.repo, as_of=self.as_of, columnar=True)
+
+        for section in ["n_open_issues", "n_issues_by_members", "n_issues_by_users",
+                        "top_authors", "top_author_associations"]:
+            self.assertEqual(getattr(report, section), getattr(columnar_report, section))
+
+        for section in ["old_updated_issues", "issues_with_community_association",
+                        "days_since_last_comment_by_member",
+                        "open_issues_sorted_by_update_date"]:
+            self.assertEqual([id(i) for i in getattr(report, section)],
+                             [id(i) for i in getattr(columnar_report, section)])
+
+        self.assertEqual(report.render_report(), columnar_report.render_report())
@@ -0,0 +1,96 @@
+"""Tests for token pool."""
+import os
+import time
+import unittest
+
+import httpretty
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from monitor import Monitor
+from monitor.tokens import TokenPool
+from .test_utils import MockUrlsHelper
+
+
+def rate_limited_response(remaining: int, reset: int) -> requests.Response:
+    """Response with rate limit headers."""
+    response = requests.Response()
+    response.status_code = 200
+    response.headers = CaseInsensitiveDict({"X-RateLimit-Remaining": str(remaining),
+                                            "X-RateLimit-Reset": str(reset)})
+    return response
+
+
+class TestTokenPool(unittest.TestCase):
+    """Tests scheduling of requests over tokens."""
+
+    def test_token_with_most_headroom(self):
+        """Tests requests are routed to token with most remaining quota."""
+        pool = TokenPool(["a", "b"], clock=lambda: 1000.0)
+        pool.update(pool.acquire(), rate_limited_response(10, 4600))
+        pool.update(pool.acquire(), rate_limited_response(20, 4600))
+
+        self.assertEqual(pool.remaining, {"a": 10, "b": 20})
+        self.assertEqual([pool.acquire() for _ in range(12)], ["b"] * 10 + ["a", "b"])
+
+    def test_waits_only_when_all_tokens_are_exhausted(self):
+        """Tests pool sleeps until earliest reset when every token is exhausted."""
+        now = [1000.0]
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            now[0] += seconds
+
+        pool = TokenPool(["a", "b"], clock=lambda: now[0], sleep=sleep)
+        pool.update("a", rate_limited_response(0, 1100))
+        self.assertEqual(pool.acquire(), "b")
+        self.assertEqual(sleeps, [])
+
+        pool.update("b", rate_limited_response(0, 1050))
+        self.assertFalse(pool.has_headroom())
+        self.assertEqual(pool.acquire(), "b")
+        self.assertEqual(sleeps, [51.0])
+
+
+class TestMonitorTokens(unittest.TestCase):
+    """Tests monitor with several tokens."""
+
+    def setUp(self) -> None:
+        self.urls = MockUrlsHelper()
+        resources_dir = "{}/resources".format(os.path.dirname(os.path.abspath(__file__)))
+        with open("{}/issues.json".format(resources_dir), "r") as file:
+            self.issues_response_data = file.read()
+
+    @httpretty.activate(verbose=True, allow_net_connect=False)
+    def test_exhausted_token_is_retried_with_another_one(self):
+        """Tests request rate limited on one token is retried with another without waiting."""
+        reset = str(int(time.time()) + 3600)
+        httpretty.register_uri(httpretty.GET,
+                               self.urls.get_issues_url("MockQiskit", "mock-qiskit-terra"),
+                               responses=[
+                                   httpretty.Response(body="", status=403,
+                                                      adding_headers={
+                                                          "X-RateLimit-Remaining": "0",
+                                                          "X-RateLimit-Reset": reset}),
+                                   httpretty.Response(body=self.issues_response_data,
+                                                      status=200,
+                                                      adding_headers={
+                                                          "X-RateLimit-Remaining": "4999",
+                                                          "X-RateLimit-Reset": reset})
+                               ])
+        httpretty.register_uri(httpretty.GET,
+                               self.urls.get_comments_url("MockQiskit", "mock-qiskit-terra", 42),
+                               body="[]",
+                               status=200)
+
+        monitor = Monitor(token="first,second", urls=self.urls)
+        start = time.time()
+        issues = monitor.get_open_issues("MockQiskit", "mock-qiskit-terra", max_pages=1)
+
+        self.assertEqual(len(issues), 100)
+        self.assertLess(time.time() - start, 5)
+        authorizations = [request.headers["Authorization"]
+                          for request in httpretty.latest_requests()]
+        self.assertEqual(authorizations[:2], ["token first", "token second"])
+        self.assertNotIn("token first", authorizations[2:])
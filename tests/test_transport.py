@@ -0,0 +1,75 @@
+"""Tests for transports."""
+import os
+import tempfile
+import unittest
+
+import httpretty
+
+from monitor import Monitor
+from monitor.transport import ReplayTransport, request_key
+from .test_utils import MockUrlsHelper
+
+
+class TestTransport(unittest.TestCase):
+    """Tests recording and replaying of crawls."""
+
+    def setUp(self) -> None:
+        self.urls = MockUrlsHelper()
+        self.account = "MockQiskit"
+        self.repo = "mock-qiskit-terra"
+        self.folder = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.archive = os.path.join(self.folder.name, "crawl.jsonl.gz")
+        resources_dir = "{}/resources".format(os.path.dirname(os.path.abspath(__file__)))
+        with open("{}/issues.json".format(resources_dir), "r") as file:
+            self.issues_response_data = file.read()
+        with open("{}/comments.json".format(resources_dir), "r") as file:
+            self.comments_response_data = file.read()
+
+    def tearDown(self) -> None:
+        self.folder.cleanup()
+
+    @httpretty.activate(verbose=True, allow_net_connect=False)
+    def _record(self):
+        """Records crawl with one server error retried."""
+        httpretty.register_uri(httpretty.GET,
+                               self.urls.get_issues_url(self.account, self.repo),
+                               responses=[
+                                   httpretty.Response(body="", status=503),
+                                   httpretty.Response(body=self.issues_response_data,
+                                                      status=200,
+                                                      adding_headers={"ETag": '"abc"'})
+                               ])
+        httpretty.register_uri(httpretty.GET,
+                               self.urls.get_comments_url(self.account, self.repo, 42),
+                               body=self.comments_response_data,
+                               status=200)
+        monitor = Monitor(urls=self.urls, backoff_factor=0, record=self.archive)
+        issues = monitor.get_open_issues(self.account, self.repo, max_pages=1)
+        return issues, len(httpretty.latest_requests())
+
+    @httpretty.activate(verbose=True, allow_net_connect=False)
+    def test_record_and_replay(self):
+        """Tests replayed crawl is same as recorded one without network."""
+        recorded_issues, n_requests = self._record()
+
+        replay = ReplayTransport(self.archive)
+        self.assertEqual(len(replay), n_requests)
+
+        monitor = Monitor(urls=self.urls, backoff_factor=0, replay=self.archive)
+        replayed_issues = monitor.get_open_issues(self.account, self.repo, max_pages=1)
+        self.assertEqual([issue.to_dict() for issue in replayed_issues],
+                         [issue.to_dict() for issue in recorded_issues])
+        self.assertEqual(len(httpretty.latest_requests()), 0)
+
+        response = replay.send("GET", self.urls.get_issues_url(self.account, self.repo))
+        self.assertEqual(response.status_code, 503)
+        response = replay.send("GET", self.urls.get_issues_url(self.account, self.repo))
+        self.assertEqual(response.headers["etag"], '"abc"')
+        self.assertEqual(replay.send("GET", "https://example.com/missing").status_code, 404)
+
+    def test_request_key(self):
+        """Tests request key ignores order of query parameters and payload keys."""
+        self.assertEqual(request_key("get", "https://example.com/a?page=1&state=open"),
+                         request_key("GET", "https://example.com/a?state=open&page=1"))
+        self.assertEqual(request_key("POST", "https://example.com/graphql", {"a": 1, "b": 2}),
+                         request_key("POST", "https://example.com/graphql", {"b": 2, "a": 1}))
@@ -0,0 +1,48 @@
+"""Tests for trends analytics."""
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from monitor.report import TrendsReport
+from monitor.snapshots import SnapshotStore
+from monitor.trends import collect_trends
+from .test_report import generate_issues
+
+
+class TestTrends(unittest.TestCase):
+    """Tests trends of snapshots history."""
+
+    def setUp(self) -> None:
+        self.folder = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.dates = [datetime(2022, 9, 1) + timedelta(days=7 * i) for i in range(3)]
+        for i, taken_at in enumerate(self.dates):
+            issues = [issue.to_dict() for issue in generate_issues(10 + i, 2, as_of=taken_at)]
+            file_name = "mock-qiskit-terra_{}.json".format(taken_at.strftime("%m-%d-%Y-%H-%M"))
+            with open(os.path.join(self.folder.name, file_name), "w") as file:
+                json.dump(issues, file)
+
+    def tearDown(self) -> None:
+        self.folder.cleanup()
+
+    def test_collect_trends(self):
+        """Tests summaries of json snapshots and snapshot store are same."""
+        trends = collect_trends("mock-qiskit-terra", folder=self.folder.name, max_workers=2)
+
+        self.assertEqual([summary["date"] for summary in trends],
+                         [taken_at.strftime("%Y-%m-%d") for taken_at in self.dates])
+        self.assertEqual([summary["n_open"] for summary in trends], [10, 11, 12])
+        self.assertEqual(trends[0]["n_by_members"], 10)
+        self.assertEqual(trends[0]["ages"]["< 1 month"], 10)
+        self.assertEqual(trends[0]["median_days_since_member_comment"], 5.5)
+
+        store = SnapshotStore(os.path.join(self.folder.name, "store"))
+        for taken_at in self.dates:
+            file_name = "mock-qiskit-terra_{}.json".format(taken_at.strftime("%m-%d-%Y-%H-%M"))
+            with open(os.path.join(self.folder.name, file_name), "r") as file:
+                store.save("mock-qiskit-terra", json.load(file), taken_at=taken_at)
+        self.assertEqual(collect_trends("mock-qiskit-terra", store=store), trends)
+
+        report_md = TrendsReport({"mock-qiskit-terra": trends}).render_report()
+        self.assertIn("| 2022-09-15 | 12 |", report_md)
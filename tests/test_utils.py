@@ -1,8 +1,9 @@
 """Tests for utils."""
 import unittest
 from typing import Optional, Union
+from urllib.parse import urlencode
 
-from monitor.utils import UrlsHelper, GitHubUrlsHelper
+from monitor.utils import UrlsHelper, GitHubUrlsHelper, get_page, get_per_page, set_page
 
 
 class MockUrlsHelper(UrlsHelper):
@@ -18,6 +19,20 @@ class MockUrlsHelper(UrlsHelper):
         """Returns mock issues url."""
         return "http://localhost/issues"
 
+    def get_updated_issues_url(self, account: str, repo: str, since: str,
+                               page: Optional[Union[str, int]] = None) -> str:
+        """Returns mock updated issues url."""
+        return "http://localhost/updated_issues"
+
+    def get_search_issues_url(self, query: str,
+                              page: Optional[Union[str, int]] = None) -> str:
+        """Returns mock search url."""
+        return "http://localhost/search?{}".format(urlencode({"q": query, "page": page or 1}))
+
+    def get_graphql_url(self) -> str:
+        """Returns mock GraphQL api url."""
+        return "http://localhost/graphql"
+
 
 class TestUrlHelper(unittest.TestCase):
     """Tests url helpers."""
@@ -32,3 +47,39 @@ class TestUrlHelper(unittest.TestCase):
 
         self.assertEqual(helper.get_issues_url("Qiskit", "qiskit-terra", 10), issues_api_url)
         self.assertEqual(helper.get_comments_url("Qiskit", "qiskit-terra", 1234), comments_api_url)
+
+        updated_issues_api_url = "https://api.github.com/repos/Qiskit/qiskit-terra/" \
+                                 "issues?page=2&state=all&since=2022-09-13T08:40:00Z&per_page=100"
+        self.assertEqual(helper.get_updated_issues_url("Qiskit", "qiskit-terra",
+                                                       "2022-09-13T08:40:00Z", 2),
+                         updated_issues_api_url)
+
+        search_api_url = "https://api.github.com/search/issues?q=is%3Aopen%20user%3AQiskit" \
+                         "&sort=created&order=desc&page=3&per_page=100"
+        self.assertEqual(helper.get_search_issues_url("is:open user:Qiskit", 3), search_api_url)
+
+    def test_urls_helper_is_abstract(self):
+        """Tests helpers must implement urls of every api monitor uses."""
+        class IssuesUrlsHelper(UrlsHelper):  # pylint: disable=abstract-method
+            """Helper of issues and comments urls only."""
+
+            def get_comments_url(self, account: str, repo: str,
+                                 number: Union[str, int]) -> str:
+                return "http://localhost/comments"
+
+            def get_issues_url(self, account: str, repo: str,
+                               page: Optional[Union[str, int]] = None) -> str:
+                return "http://localhost/issues"
+
+        with self.assertRaises(TypeError):
+            IssuesUrlsHelper()  # pylint: disable=abstract-class-instantiated
+
+    def test_page_query_helpers(self):
+        """Tests page query parameter helpers."""
+        url = "https://api.github.com/repos/Qiskit/qiskit-terra/" \
+              "issues?page=10&state=open&per_page=100"
+
+        self.assertEqual(get_page(url), 10)
+        self.assertEqual(get_per_page(url), 100)
+        self.assertEqual(get_page(set_page(url, 3)), 3)
+        self.assertIsNone(get_page("http://localhost/issues"))
@@ -0,0 +1,154 @@
+"""Tests for webhook events."""
+import copy
+import json
+import os
+import tempfile
+import unittest
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from benchmarks.server import FakeGitHubServer, LocalUrlsHelper
+from monitor import Monitor
+from monitor.daemon import MonitorDaemon
+from monitor.state import RepoState
+from monitor.webhooks import apply_event, sign, verify_signature
+
+
+class TestWebhooks(unittest.TestCase):
+    """Tests webhook events are applied to state of repository."""
+
+    def setUp(self) -> None:
+        resources_dir = "{}/resources".format(os.path.dirname(os.path.abspath(__file__)))
+        with open("{}/webhook_issues_opened.json".format(resources_dir), "r") as file:
+            self.opened = json.load(file)
+        with open("{}/webhook_issue_comment_created.json".format(resources_dir), "r") as file:
+            self.commented = json.load(file)
+        self.folder = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+
+    def tearDown(self) -> None:
+        self.folder.cleanup()
+
+    def test_verify_signature(self):
+        """Tests deliveries are verified by HMAC of body."""
+        body = json.dumps(self.opened).encode("utf-8")
+        self.assertTrue(verify_signature("secret", body, sign("secret", body)))
+        self.assertFalse(verify_signature("other", body, sign("secret", body)))
+        self.assertFalse(verify_signature("secret", body + b" ", sign("secret", body)))
+        self.assertFalse(verify_signature("secret", body, None))
+
+    def test_apply_events(self):
+        """Tests issues are opened, commented and closed by events."""
+        state = RepoState("MockQiskit", "mock-qiskit-terra")
+        number = str(self.opened["issue"]["number"])
+
+        self.assertTrue(apply_event(state, "issues", self.opened))
+        self.assertEqual(state.issues[number]["comments"], [])
+        self.assertTrue(apply_event(state, "issue_comment", self.commented))
+        self.assertTrue(apply_event(state, "issue_comment", self.commented))
+        self.assertEqual(len(state.issues[number]["comments"]), 1)
+
+        edited = copy.deepcopy(self.commented)
+        edited.update(action="edited")
+        edited["comment"]["author_association"] = "NONE"
+        apply_event(state, "issue_comment", edited)
+        self.assertEqual(state.issues[number]["comments"][0]["author_association"], "NONE")
+
+        assigned = copy.deepcopy(self.opened)
+        assigned.update(action="assigned")
+        assigned["issue"]["assignee"] = {"login": "AwesomeAssignee"}
+        assigned["issue"]["updated_at"] = "2021-08-07T09:00:00Z"
+        apply_event(state, "issues", assigned)
+        self.assertEqual(state.issues[number]["issue"]["assignee"]["login"], "AwesomeAssignee")
+        self.assertEqual(len(state.issues[number]["comments"]), 1)
+
+        deleted = copy.deepcopy(self.commented)
+        deleted.update(action="deleted")
+        apply_event(state, "issue_comment", deleted)
+        self.assertEqual(state.issues[number]["comments"], [])
+
+        closed = copy.deepcopy(self.opened)
+        closed.update(action="closed")
+        closed["issue"]["state"] = "closed"
+        closed["issue"]["updated_at"] = "2021-08-08T09:00:00Z"
+        self.assertTrue(apply_event(state, "issues", closed))
+        self.assertNotIn(number, state.issues)
+        self.assertFalse(apply_event(state, "issues", closed))
+        self.assertFalse(apply_event(state, "push", {"ref": "refs/heads/main"}))
+
+    def test_older_events_are_skipped(self):
+        """Tests late or redelivered events do not revert newer state."""
+        state = RepoState("MockQiskit", "mock-qiskit-terra")
+        number = str(self.opened["issue"]["number"])
+        apply_event(state, "issues", self.opened)
+
+        assigned = copy.deepcopy(self.opened)
+        assigned.update(action="assigned")
+        assigned["issue"].update(assignee={"login": "AwesomeAssignee"},
+                                 updated_at="2021-08-07T09:00:00Z")
+        unassigned = copy.deepcopy(assigned)
+        unassigned.update(action="unassigned")
+        unassigned["issue"].update(assignee=None, updated_at="2021-08-06T09:00:00Z")
+        self.assertTrue(apply_event(state, "issues", assigned))
+        self.assertFalse(apply_event(state, "issues", unassigned))
+        self.assertFalse(apply_event(state, "issues", self.opened))
+        self.assertEqual(state.issues[number]["issue"]["assignee"]["login"], "AwesomeAssignee")
+
+        closed = copy.deepcopy(unassigned)
+        closed.update(action="closed")
+        closed["issue"]["state"] = "closed"
+        self.assertFalse(apply_event(state, "issues", closed))
+        self.assertIn(number, state.issues)
+
+        edited = copy.deepcopy(self.commented)
+        edited.update(action="edited")
+        edited["comment"].update(author_association="NONE", updated_at="2021-08-07T10:00:00Z")
+        self.assertTrue(apply_event(state, "issue_comment", edited))
+        self.assertFalse(apply_event(state, "issue_comment", self.commented))
+        self.assertEqual(state.issues[number]["comments"][0]["author_association"], "NONE")
+        self.assertEqual(state.issues[number]["issue"]["assignee"]["login"], "AwesomeAssignee")
+
+    def test_daemon_receives_events(self):
+        """Tests posted events are applied to served reports without crawling."""
+        with FakeGitHubServer(n_issues=10, n_comments=1) as server:
+            daemon = MonitorDaemon(Monitor(urls=LocalUrlsHelper(server.url)),
+                                   ["https://github.com/MockQiskit/mock-qiskit-terra"],
+                                   port=0, state_dir=self.folder.name, secret="secret")
+            daemon.refresh_due()
+            daemon.start()
+            n_requests = server.n_requests
+            repo = daemon.repos["mock-qiskit-terra"]
+            issues = list(repo.issues)
+
+            def post(event: str, payload: dict, secret: str = "secret") -> int:
+                body = json.dumps(payload).encode("utf-8")
+                request = Request(daemon.url + "/webhook", data=body, method="POST",
+                                  headers={"X-GitHub-Event": event,
+                                           "X-Hub-Signature-256": sign(secret, body),
+                                           "Content-Type": "application/json"})
+                try:
+                    with urlopen(request) as response:
+                        return response.status
+                except HTTPError as error:
+                    return error.code
+
+            try:
+                self.assertEqual(post("issues", self.opened, secret="wrong"), 401)
+                self.assertEqual(post("issues", self.opened), 202)
+                self.assertEqual(post("issue_comment", self.commented), 202)
+                self.assertEqual(post("ping", {"zen": "Keep it simple."}), 200)
+                self.assertEqual(daemon.apply_events(), ["mock-qiskit-terra"])
+                self.assertIs(daemon.repos["mock-qiskit-terra"], repo)
+                self.assertEqual(repo.issues[:10], issues)
+                self.assertEqual(repo.issues[10].number, self.opened["issue"]["number"])
+
+                report = daemon.handle("/repos/mock-qiskit-terra.json")[2]
+                issues = json.loads(report)["open_issues_sorted_by_update_date"]
+                self.assertEqual(len(issues), 11)
+                issue = next(i for i in issues if i["number"] == self.opened["issue"]["number"])
+                self.assertEqual(issue["n_comments"], 1)
+                self.assertEqual(server.n_requests, n_requests)
+
+                stored = RepoState.load("MockQiskit", "mock-qiskit-terra", self.folder.name)
+                self.assertIn(str(self.opened["issue"]["number"]), stored.issues)
+            finally:
+                daemon.stop()